@@ -27,17 +27,22 @@ import json
 import os
 import collections
 import argparse
+import multiprocessing
 import cv2
 import yaml
 
 parser = argparse.ArgumentParser(description='EECS 545 SoccerNet Jersey Number Recognition')
 parser.add_argument('--data_root', default='./soccernet-annotated', type=str, help='path to dataset, the dir with (test, train, valid) directories')
 parser.add_argument('--output_dir', default='./soccernet-crops', type=str)
+parser.add_argument('--num_workers', default=os.cpu_count(), type=int, help='processes extracting crops, each source image is decoded once by one of them')
+parser.add_argument('--overwrite', action='store_true', help='redo every image instead of resuming from the progress file of a previous run')
 args = parser.parse_args()
 
 splits = ['train', 'test']
 ann_file = '_annotations.coco.json'
 out_file = '_mmocr_annotations_textrecog.json'
+# one json line per finished source image, so an interrupted run picks up where it stopped
+progress_file = '_mmocr_annotations_textrecog.progress.jsonl'
 
 # create the output directories
 for split in splits:
@@ -58,45 +63,100 @@ def coco_to_recog_ann(category_id_to_name, ann):
         ignore=False
     )
 
-for split in splits:
+def extract_crops(task):
+    """decode one source image and write the crops of all its annotations
+
+    task is (image_id, img_path, out_dir, [(ann_id, bbox, text), ...]), returns
+    (image_id, [(ann_id, out_img_name, text), ...]) for the crops that were written
+    """
+    image_id, img_path, out_dir, anns = task
+    img = cv2.imread(img_path)
+    if img is None:
+        print(f"Skipping unreadable image {img_path}")
+        return image_id, []
+    entries = []
+    for ann_id, bbox, text in anns:
+        crop = img[bbox[1]:round(bbox[1]+bbox[3]), bbox[0]:round(bbox[0]+bbox[2])]
+        if crop.size == 0:
+            print(f"Skipping empty crop {ann_id} of {img_path}")
+            continue
+        out_img_name = f"{os.path.basename(img_path)}_{ann_id}.jpg"
+        cv2.imwrite(os.path.join(out_dir, out_img_name), crop)
+        entries.append((ann_id, out_img_name, text))
+    return image_id, entries
+
+def load_progress(path):
+    """finished images of a previous run, dropping a line cut short by an interruption"""
+    done = {}
+    if not os.path.exists(path):
+        return done
+    valid_bytes = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if not line.endswith(b'\n'):
+                break
+            done[record['image_id']] = [tuple(entry) for entry in record['entries']]
+            valid_bytes += len(line)
+    # new records are appended right after the last complete one
+    os.truncate(path, valid_bytes)
+    return done
+
+def process_split(split):
     ann_path = os.path.join(args.data_root, split, ann_file)
     with open(ann_path) as f:
         ann_dict = json.load(f)
-        annotations = ann_dict['annotations']   # list of {'id': 0, 'image_id': 0, 'category_id': 6, 'bbox': [18, 24, 17.11, 19.17], 'area': 327.999, 'segmentation': [], 'iscrowd': 0}
-        categories = ann_dict['categories']     # list of {'id': 1, 'name': '1'}
-        images = ann_dict['images']             # list of {'id': 0, 'license': 1, 'file_name': '1248_346_jpg.rf.4722277492e8e027f34145920e840e4d.jpg', 'height': 114, 'width': 37, 'date_captured': '2024-03-08T19:38:00+00:00'}
-        print(split, "images:", len(images), "annotations:", len(annotations), "categories:", len(categories))
-
-        categories = ['1', '1', '10', '11', '13', '14', '15', '16', '17', '2', '20', '22', '23', '24', '25', '26', '27', '28', '29', '3', '30', '31', '33', '34', '36', '4', '40', '44', '5', '50', '55', '6', '62', '7', '8', '9']
-        # categories = sorted(categories)
-        category_id_to_text = {i+1 : name for i, name in enumerate(categories)}
-        image_id_to_filename = {x['id'] : x['file_name'] for x in images}
-
-        data_list = []
-        print(len(categories), categories)
-        for ann in annotations:
-            img_name = image_id_to_filename[ann['image_id']]
-            img_path = os.path.join(args.data_root, split, img_name)
-            img = cv2.imread(img_path)
-            bbox = ann['bbox']
-            crop = img[bbox[1]:round(bbox[1]+bbox[3]), bbox[0]:round(bbox[0]+bbox[2])]
-
-            out_img_name = f"{img_name}_{ann['id']}.jpg"
-            out_path = os.path.join(args.output_dir, split, out_img_name)
-            cv2.imwrite(out_path, crop)
-
-            text = category_id_to_text[ann['category_id']]
-            data_list.append({
-                "img_path": out_img_name, 
-                "instances": [{ "text": text }]
-            })
-            print(out_img_name, text)
-        out_dict = dict(
-            metainfo=METAINFO,
-            data_list=data_list
-        )
-        # print(json.dumps(out_dict, indent=4))
-        out_path = os.path.join(args.output_dir, split, out_file)
-        with open(out_path, 'w') as f:
-            json.dump(out_dict, f)
-        print(f"Writing {split} mmocr recog annotations to {out_path}")
\ No newline at end of file
+    annotations = ann_dict['annotations']   # list of {'id': 0, 'image_id': 0, 'category_id': 6, 'bbox': [18, 24, 17.11, 19.17], 'area': 327.999, 'segmentation': [], 'iscrowd': 0}
+    categories = ann_dict['categories']     # list of {'id': 1, 'name': '1'}
+    images = ann_dict['images']             # list of {'id': 0, 'license': 1, 'file_name': '1248_346_jpg.rf.4722277492e8e027f34145920e840e4d.jpg', 'height': 114, 'width': 37, 'date_captured': '2024-03-08T19:38:00+00:00'}
+    print(split, "images:", len(images), "annotations:", len(annotations), "categories:", len(categories))
+
+    categories = ['1', '1', '10', '11', '13', '14', '15', '16', '17', '2', '20', '22', '23', '24', '25', '26', '27', '28', '29', '3', '30', '31', '33', '34', '36', '4', '40', '44', '5', '50', '55', '6', '62', '7', '8', '9']
+    # categories = sorted(categories)
+    category_id_to_text = {i+1 : name for i, name in enumerate(categories)}
+    image_id_to_filename = {x['id'] : x['file_name'] for x in images}
+
+    # group the annotations by source image so that every image is decoded once
+    anns_by_image = collections.defaultdict(list)
+    for ann in annotations:
+        anns_by_image[ann['image_id']].append((ann['id'], ann['bbox'], category_id_to_text[ann['category_id']]))
+
+    out_dir = os.path.join(args.output_dir, split)
+    progress_path = os.path.join(out_dir, progress_file)
+    if args.overwrite and os.path.exists(progress_path):
+        os.remove(progress_path)
+    done = load_progress(progress_path)
+    tasks = [(image_id, os.path.join(args.data_root, split, image_id_to_filename[image_id]), out_dir, anns)
+             for image_id, anns in anns_by_image.items() if image_id not in done]
+    print(f"{split}: {len(done)} images done by a previous run, {len(tasks)} to go")
+
+    with open(progress_path, 'a') as progress, multiprocessing.Pool(args.num_workers) as pool:
+        for n, (image_id, entries) in enumerate(pool.imap_unordered(extract_crops, tasks, chunksize=16), 1):
+            progress.write(json.dumps(dict(image_id=image_id, entries=entries)) + '\n')
+            progress.flush()
+            done[image_id] = entries
+            if n % 1000 == 0 or n == len(tasks):
+                print(f"{split}: {n} / {len(tasks)} images")
+
+    # keep the annotation order of the coco file, whatever order the workers finished in
+    crop_by_ann = {ann_id: (out_img_name, text) for entries in done.values() for ann_id, out_img_name, text in entries}
+    data_list = [{
+        "img_path": crop_by_ann[ann['id']][0],
+        "instances": [{ "text": crop_by_ann[ann['id']][1] }]
+    } for ann in annotations if ann['id'] in crop_by_ann]
+    out_dict = dict(
+        metainfo=METAINFO,
+        data_list=data_list
+    )
+    out_path = os.path.join(out_dir, out_file)
+    with open(out_path, 'w') as f:
+        json.dump(out_dict, f)
+    os.remove(progress_path)
+    print(f"Writing {split} mmocr recog annotations ({len(data_list)} crops) to {out_path}")
+
+if __name__ == '__main__':
+    for split in splits:
+        process_split(split)
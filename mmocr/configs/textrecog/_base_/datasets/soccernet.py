@@ -10,4 +10,19 @@ soccernet_textrecog_test = dict(
     type='OCRDataset',
     data_root='data/soccernet-crops/test',
     ann_file='_mmocr_annotations_textrecog.json',
-    pipeline=None)
\ No newline at end of file
+    pipeline=None)
+
+# packed shards of the crops above, written by
+# tools/dataset_converters/textrecog/shard_converter.py. the images are
+# loaded as arrays, so the pipeline should use LoadImageFromNDArray
+soccernet_textrecog_train_shards = dict(
+    type='RecogShardDataset',
+    data_root='data/soccernet-crops/train',
+    ann_file='textrecog_train.shards',
+    pipeline=None)
+
+soccernet_textrecog_test_shards = dict(
+    type='RecogShardDataset',
+    data_root='data/soccernet-crops/test',
+    ann_file='textrecog_test.shards',
+    pipeline=None)
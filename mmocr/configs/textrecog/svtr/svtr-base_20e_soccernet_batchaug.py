@@ -0,0 +1,31 @@
+_base_ = ['svtr-base_20e_soccernet.py']
+
+# The random augmentations of the train pipeline run as batched tensor ops in
+# the data preprocessor, so the data loader workers only decode and resize
+model = dict(
+    data_preprocessor=dict(pixel_batch_augments=[
+        dict(type='BatchTextRecogGeneralAug', prob=0.4),
+        dict(type='BatchCropHeight', prob=0.4),
+        dict(type='BatchGaussianBlur', prob=0.4, kernel_size=5, sigma=1),
+        dict(
+            type='BatchColorJitter',
+            prob=0.4,
+            brightness=0.5,
+            saturation=0.5,
+            contrast=0.5,
+            hue=0.1),
+        dict(type='BatchImageContentJitter', prob=0.4),
+        dict(type='BatchGaussianNoise', prob=0.4, scale=0.1**0.5),
+        dict(type='BatchReversePixels', prob=0.4),
+    ]))
+
+train_pipeline = [
+    dict(type='LoadImageFromFile', ignore_empty=True, min_size=5),
+    dict(type='LoadOCRAnnotations', with_text=True),
+    dict(type='Resize', scale=(256, 64)),
+    dict(
+        type='PackTextRecogInputs',
+        meta_keys=('img_path', 'ori_shape', 'img_shape', 'valid_ratio'))
+]
+
+train_dataloader = dict(dataset=dict(pipeline=train_pipeline))
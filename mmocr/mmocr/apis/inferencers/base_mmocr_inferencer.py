@@ -1,6 +1,8 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import os.path as osp
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from collections.abc import Iterator
+from typing import (Dict, Generator, Iterable, List, Optional, Sequence,
+                    Tuple, Union)
 
 import mmcv
 import mmengine
@@ -160,6 +162,85 @@ class BaseMMOCRInferencer(BaseInferencer):
             dict: Inference and visualization results, mapped from
                 "predictions" and "visualization".
         """
+        results = {'predictions': [], 'visualization': []}
+        for batch_res in track(
+                self.stream(
+                    inputs,
+                    return_datasamples=return_datasamples,
+                    batch_size=batch_size,
+                    return_vis=return_vis,
+                    show=show,
+                    wait_time=wait_time,
+                    draw_pred=draw_pred,
+                    pred_score_thr=pred_score_thr,
+                    out_dir=out_dir,
+                    save_vis=save_vis,
+                    save_pred=save_pred,
+                    print_result=print_result,
+                    **kwargs),
+                description='Inference',
+                disable=not progress_bar):
+            results['predictions'].extend(batch_res['predictions'])
+            if return_vis and batch_res['visualization'] is not None:
+                results['visualization'].extend(batch_res['visualization'])
+        return results
+
+    def stream(self,
+               inputs: Union[InputsType, Iterator],
+               return_datasamples: bool = False,
+               batch_size: int = 1,
+               return_vis: bool = False,
+               show: bool = False,
+               wait_time: int = 0,
+               draw_pred: bool = True,
+               pred_score_thr: float = 0.3,
+               out_dir: str = 'results/',
+               save_vis: bool = False,
+               save_pred: bool = False,
+               print_result: bool = False,
+               **kwargs) -> Generator[dict, None, None]:
+        """Run the inferencer lazily, one batch at a time.
+
+        Unlike :meth:`__call__`, which gathers the results of all the inputs
+        before returning them, the results of each batch are yielded as soon
+        as they are ready. The inputs are also consumed one batch at a time
+        when given as an iterator, so the memory use does not grow with the
+        number of inputs as long as the caller drops the yielded results.
+
+        Args:
+            inputs (InputsType or Iterator): Inputs for the inferencer. Besides
+                what :meth:`__call__` accepts, it can be an iterator (e.g. a
+                generator) over single inputs, which is consumed lazily.
+            return_datasamples (bool): Whether to return results as
+                :obj:`BaseDataElement`. Defaults to False.
+            batch_size (int): Inference batch size. Defaults to 1.
+            return_vis (bool): Whether to return the visualization result.
+                Defaults to False.
+            show (bool): Whether to display the visualization results in a
+                popup window. Defaults to False.
+            wait_time (float): The interval of show (s). Defaults to 0.
+            draw_pred (bool): Whether to draw predicted bounding boxes.
+                Defaults to True.
+            pred_score_thr (float): Minimum score of bboxes to draw.
+                Defaults to 0.3.
+            out_dir (str): Output directory of results. Defaults to 'results/'.
+            save_vis (bool): Whether to save the visualization results to
+                "out_dir". Defaults to False.
+            save_pred (bool): Whether to save the inference results to
+                "out_dir". Defaults to False.
+            print_result (bool): Whether to print the inference result w/o
+                visualization to the console. Defaults to False.
+
+            **kwargs: Other keyword arguments passed to :meth:`preprocess`,
+                :meth:`forward`, :meth:`visualize` and :meth:`postprocess`.
+                Each key in kwargs should be in the corresponding set of
+                ``preprocess_kwargs``, ``forward_kwargs``, ``visualize_kwargs``
+                and ``postprocess_kwargs``.
+
+        Yields:
+            dict: Inference and visualization results of a batch, mapped from
+            "predictions" and "visualization".
+        """
         if (save_vis or save_pred) and not out_dir:
             raise ValueError('out_dir must be specified when save_vis or '
                              'save_pred is True!')
@@ -184,25 +265,38 @@ class BaseMMOCRInferencer(BaseInferencer):
             print_result=print_result,
             **kwargs)
 
-        ori_inputs = self._inputs_to_list(inputs)
-        inputs = self.preprocess(
-            ori_inputs, batch_size=batch_size, **preprocess_kwargs)
-        results = {'predictions': [], 'visualization': []}
-        for ori_inputs, data in track(
-                inputs, description='Inference', disable=not progress_bar):
-            preds = self.forward(data, **forward_kwargs)
+        if not isinstance(inputs, Iterator):
+            inputs = self._inputs_to_list(inputs)
+        for ori_inputs, preds in self._predict_batches(
+                inputs, batch_size, preprocess_kwargs, forward_kwargs):
             visualization = self.visualize(
                 ori_inputs, preds, img_out_dir=img_out_dir, **visualize_kwargs)
-            batch_res = self.postprocess(
+            yield self.postprocess(
                 preds,
                 visualization,
                 return_datasamples,
                 pred_out_dir=pred_out_dir,
                 **postprocess_kwargs)
-            results['predictions'].extend(batch_res['predictions'])
-            if return_vis and batch_res['visualization'] is not None:
-                results['visualization'].extend(batch_res['visualization'])
-        return results
+
+    def _predict_batches(self, inputs: Iterable, batch_size: int,
+                         preprocess_kwargs: Dict,
+                         forward_kwargs: Dict) -> Iterator:
+        """Preprocess and forward the inputs batch by batch.
+
+        Args:
+            inputs (Iterable): Inputs for the inferencer.
+            batch_size (int): Inference batch size.
+            preprocess_kwargs (dict): Keyword arguments for
+                :meth:`preprocess`.
+            forward_kwargs (dict): Keyword arguments for :meth:`forward`.
+
+        Yields:
+            tuple(list, PredType): The original inputs of a batch and their
+            predictions.
+        """
+        for ori_inputs, data in self.preprocess(
+                inputs, batch_size=batch_size, **preprocess_kwargs):
+            yield ori_inputs, self.forward(data, **forward_kwargs)
 
     def _init_pipeline(self, cfg: ConfigType) -> Compose:
         """Initialize the test pipeline."""
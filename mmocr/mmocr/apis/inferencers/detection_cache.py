@@ -0,0 +1,108 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import sqlite3
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+CacheEntry = Tuple[List[np.ndarray], np.ndarray]
+
+
+class DetectionCache:
+    """An on-disk cache of text detection results backed by SQLite.
+
+    Each entry maps a key to the polygons and scores predicted for an image.
+    The polygons are stored as a flat float32 array along with the length of
+    each polygon. The database can be shared by several processes, which
+    wait for each other's writes.
+
+    Args:
+        path (str): Path to the SQLite database. It is created if it does not
+            exist.
+        timeout (float): Seconds to wait for the lock held by another process
+            before giving up. Defaults to 60.
+    """
+
+    def __init__(self, path: str, timeout: float = 60.) -> None:
+        self.path = path
+        # The inferencer may be built in one thread and run in another
+        self._conn = sqlite3.connect(
+            path, timeout=timeout, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS detections ('
+                               'key TEXT PRIMARY KEY, lengths BLOB, '
+                               'polygons BLOB, scores BLOB)')
+
+    def get(self, keys: Sequence[str]) -> List[Optional[CacheEntry]]:
+        """Look up the entries of several keys at once.
+
+        Args:
+            keys (Sequence[str]): Keys to look up.
+
+        Returns:
+            list[tuple(list[np.ndarray], np.ndarray), optional]: The polygons
+            and scores of each key, or None if the key is not cached.
+        """
+        rows = {}
+        # Stay below SQLite's limit on the number of query parameters
+        for start in range(0, len(keys), 500):
+            chunk = list(keys[start:start + 500])
+            with self._lock:
+                rows.update((row[0], row[1:]) for row in self._conn.execute(
+                    'SELECT key, lengths, polygons, scores FROM detections '
+                    f'WHERE key IN ({",".join("?" * len(chunk))})', chunk))
+        return [
+            self._decode(*rows[key]) if key in rows else None for key in keys
+        ]
+
+    def put(self, keys: Sequence[str],
+            entries: Sequence[Tuple[Sequence[np.ndarray],
+                                    np.ndarray]]) -> None:
+        """Store the entries of several keys in a single transaction.
+
+        Args:
+            keys (Sequence[str]): Keys of the entries.
+            entries (Sequence[tuple(Sequence[np.ndarray], np.ndarray)]): The
+                polygons and scores of each key.
+        """
+        rows = [(key, ) + self._encode(*entry)
+                for key, entry in zip(keys, entries)]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO detections VALUES (?, ?, ?, ?)', rows)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COUNT(*) FROM detections').fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _encode(polygons: Sequence[np.ndarray],
+                scores: np.ndarray) -> Tuple[bytes, bytes, bytes]:
+        """Pack the polygons and scores into bytes."""
+        polygons = [
+            np.asarray(polygon, dtype=np.float32).reshape(-1)
+            for polygon in polygons
+        ]
+        lengths = np.array([len(p) for p in polygons], dtype=np.int32)
+        flat = np.concatenate(polygons) if polygons else np.zeros(
+            0, dtype=np.float32)
+        return (lengths.tobytes(), flat.tobytes(),
+                np.asarray(scores, dtype=np.float32).tobytes())
+
+    @staticmethod
+    def _decode(lengths: bytes, polygons: bytes,
+                scores: bytes) -> CacheEntry:
+        """Unpack the polygons and scores from bytes."""
+        lengths = np.frombuffer(lengths, dtype=np.int32)
+        flat = np.frombuffer(polygons, dtype=np.float32)
+        polygons = np.split(flat.copy(), np.cumsum(lengths)[:-1]) if len(
+            lengths) else []
+        return polygons, np.frombuffer(scores, dtype=np.float32).copy()
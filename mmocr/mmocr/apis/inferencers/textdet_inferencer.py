@@ -1,8 +1,17 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from typing import Dict
+import hashlib
+from itertools import islice
+from typing import Dict, Iterable, Iterator, Optional, Union
+
+import mmengine
+import numpy as np
+import torch
+from mmengine.infer.infer import ModelType
+from mmengine.structures import InstanceData
 
 from mmocr.structures import TextDetDataSample
-from .base_mmocr_inferencer import BaseMMOCRInferencer
+from .base_mmocr_inferencer import BaseMMOCRInferencer, InputType
+from .detection_cache import DetectionCache
 
 
 class TextDetInferencer(BaseMMOCRInferencer):
@@ -22,8 +31,124 @@ class TextDetInferencer(BaseMMOCRInferencer):
         device (str, optional): Device to run inference. If None, the available
             device will be automatically used. Defaults to None.
         scope (str, optional): The scope of the model. Defaults to "mmocr".
+        cache_path (str, optional): Path to a SQLite database that caches the
+            predicted polygons and scores across runs. An image is looked up
+            by the hash of its content together with a fingerprint of the
+            model config, weights and postprocessor settings, so that a
+            changed model never reuses stale results. Defaults to None, which
+            disables the cache.
     """
 
+    def __init__(self,
+                 model: Union[ModelType, str, None] = None,
+                 weights: Optional[str] = None,
+                 device: Optional[str] = None,
+                 scope: str = 'mmocr',
+                 cache_path: Optional[str] = None) -> None:
+        super().__init__(
+            model=model, weights=weights, device=device, scope=scope)
+        self.cache = DetectionCache(cache_path) if cache_path else None
+        self._fingerprint: Optional[str] = None
+
+    def _model_fingerprint(self) -> str:
+        """Hash the config, weights and postprocessor settings of the model.
+
+        It is computed on first use rather than at build time, so that the
+        postprocessor settings changed after the inferencer is built are
+        taken into account.
+        """
+        if self._fingerprint is None:
+            sha1 = hashlib.sha1(self.cfg.pretty_text.encode())
+            for name, tensor in self.model.state_dict().items():
+                sha1.update(name.encode())
+                sha1.update(tensor.detach().cpu().numpy().tobytes())
+            postprocessor = self.model.det_head.postprocessor
+            settings = {
+                k: v
+                for k, v in vars(postprocessor).items()
+                if isinstance(v, (int, float, str, bool, type(None)))
+            }
+            sha1.update(repr(sorted(settings.items())).encode())
+            self._fingerprint = sha1.hexdigest()
+        return self._fingerprint
+
+    def _cache_key(self, single_input: InputType) -> str:
+        """Hash an input image together with the model fingerprint."""
+        sha1 = hashlib.sha1(self._model_fingerprint().encode())
+        if isinstance(single_input, str):
+            sha1.update(mmengine.fileio.get(single_input))
+        elif isinstance(single_input, np.ndarray):
+            sha1.update(f'{single_input.shape}{single_input.dtype}'.encode())
+            sha1.update(np.ascontiguousarray(single_input).tobytes())
+        else:
+            raise ValueError(f'Unsupported input type: {type(single_input)}')
+        return sha1.hexdigest()
+
+    def _predict_batches(self, inputs: Iterable, batch_size: int,
+                         preprocess_kwargs: Dict,
+                         forward_kwargs: Dict) -> Iterator:
+        """Preprocess and forward the inputs batch by batch, skipping the
+        images found in the cache and storing the results of the others."""
+        if self.cache is None:
+            yield from super()._predict_batches(inputs, batch_size,
+                                                preprocess_kwargs,
+                                                forward_kwargs)
+            return
+        inputs_iter = iter(inputs)
+        while True:
+            chunk = list(islice(inputs_iter, batch_size))
+            if not chunk:
+                break
+            keys = [self._cache_key(single_input) for single_input in chunk]
+            preds = [
+                None if entry is None else self._cached2pred(
+                    single_input, entry)
+                for single_input, entry in zip(chunk, self.cache.get(keys))
+            ]
+            misses = [i for i, pred in enumerate(preds) if pred is None]
+            if misses:
+                for _, data in self.preprocess([chunk[i] for i in misses],
+                                               batch_size=len(misses),
+                                               **preprocess_kwargs):
+                    for i, pred in zip(misses,
+                                       self.forward(data, **forward_kwargs)):
+                        preds[i] = pred
+                self.cache.put([keys[i] for i in misses], [
+                    self._pred2cached(preds[i].pred_instances) for i in misses
+                ])
+            yield chunk, preds
+
+    def _cached2pred(self, single_input: InputType,
+                     entry: tuple) -> TextDetDataSample:
+        """Rebuild the data sample of a cached prediction."""
+        polygons, scores = entry
+        if isinstance(single_input, str):
+            img_path = single_input
+            ori_shape = None
+        else:
+            img_path = f'{self.num_unnamed_imgs}.jpg'
+            self.num_unnamed_imgs += 1
+            ori_shape = single_input.shape[:2]
+        pred = TextDetDataSample(metainfo=dict(img_path=img_path))
+        if ori_shape is not None:
+            pred.set_metainfo(dict(ori_shape=ori_shape))
+        pred.pred_instances = InstanceData(
+            polygons=polygons, scores=torch.from_numpy(scores))
+        return pred
+
+    @staticmethod
+    def _pred2cached(pred_instances: InstanceData) -> tuple:
+        """Convert the predicted instances into a cache entry."""
+        polygons = [
+            polygon.detach().cpu().numpy()
+            if isinstance(polygon, torch.Tensor) else np.asarray(polygon)
+            for polygon in pred_instances.polygons
+        ]
+        scores = pred_instances.scores
+        if isinstance(scores, torch.Tensor):
+            scores = scores.detach().cpu().numpy()
+        return polygons, np.asarray(scores)
+
     def pred2dict(self, data_sample: TextDetDataSample) -> Dict:
         """Extract elements necessary to represent a prediction into a
         dictionary. It's better to contain only basic data elements such as
@@ -0,0 +1,159 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Dict, List, Optional, Sequence, Union
+
+import torch
+
+from mmocr.utils import ConfigType
+from .base_mmocr_inferencer import InputsType
+from .textrec_inferencer import TextRecInferencer
+
+
+class TextRecEnsembleInferencer:
+    """Run several text recognizers over the same inputs.
+
+    Recognizers whose test pipelines are identical share a single
+    preprocessing pass, so each input image is loaded, resized and collated
+    once per distinct pipeline rather than once per model. The models are
+    then run concurrently in a thread pool, each on its own CUDA stream when
+    the device is a GPU.
+
+    Args:
+        models (Sequence[Union[ConfigType, str]]): Recognizers to ensemble.
+            Each one is a path to the config file or a model name defined in
+            metafile, as accepted by :class:`TextRecInferencer`.
+        weights (Sequence[str, optional], optional): Checkpoints for each
+            model. If None, the weights are loaded from metafile.
+            Defaults to None.
+        device (str, optional): Device to run inference. If None, the
+            available device will be automatically used. Defaults to None.
+        num_workers (int, optional): Number of threads used to run the models.
+            Defaults to None, which means one thread per model.
+    """
+
+    def __init__(self,
+                 models: Sequence[Union[ConfigType, str]],
+                 weights: Optional[Sequence[Optional[str]]] = None,
+                 device: Optional[str] = None,
+                 num_workers: Optional[int] = None) -> None:
+        if len(models) == 0:
+            raise ValueError('At least one recognizer should be provided.')
+        if weights is None:
+            weights = [None] * len(models)
+        if len(weights) != len(models):
+            raise ValueError('The number of weights should match the number '
+                             f'of models, but got {len(weights)} and '
+                             f'{len(models)}.')
+
+        # Name each model after its alias or config, suffixed with its index
+        # when the same model appears more than once
+        self.names = []
+        for i, model in enumerate(models):
+            name = model if isinstance(model, str) else f'model_{i}'
+            if name in self.names:
+                name = f'{name}_{i}'
+            self.names.append(name)
+        self.inferencers = [
+            TextRecInferencer(model, weight, device)
+            for model, weight in zip(models, weights)
+        ]
+        self.num_workers = num_workers or len(self.inferencers)
+
+        # Group the models by their test pipeline so that the inputs are
+        # preprocessed once per group
+        self.groups: Dict[str, List[int]] = {}
+        for i, inferencer in enumerate(self.inferencers):
+            spec = repr(inferencer.cfg.test_dataloader.dataset.pipeline)
+            self.groups.setdefault(spec, []).append(i)
+
+    def _forward_model(self, idx: int, batches: List,
+                       num_inputs: int) -> List[Dict]:
+        """Run a single model over the first ``num_inputs`` inputs of
+        preprocessed batches."""
+        inferencer = self.inferencers[idx]
+        device = next(inferencer.model.parameters()).device
+        if device.type == 'cuda':
+            stream = torch.cuda.Stream(device)
+            stream_ctx = torch.cuda.stream(stream)
+        else:
+            stream = None
+            stream_ctx = nullcontext()
+        predictions = []
+        with stream_ctx:
+            for data in batches:
+                remaining = num_inputs - len(predictions)
+                if remaining <= 0:
+                    break
+                # The postprocessor writes predictions into the data samples,
+                # so each model needs its own copy of them
+                data = dict(
+                    inputs=data['inputs'][:remaining],
+                    data_samples=copy.deepcopy(
+                        data['data_samples'][:remaining]))
+                preds = inferencer.forward(data)
+                predictions.extend(
+                    inferencer.pred2dict(pred) for pred in preds)
+        if stream is not None:
+            # wait for the work queued on the model's own stream
+            stream.synchronize()
+        return predictions
+
+    def __call__(
+        self,
+        inputs: InputsType,
+        batch_size: int = 1,
+        num_inputs: Optional[Sequence[Optional[int]]] = None
+    ) -> Dict[str, Dict[str, List[Dict]]]:
+        """Call the ensemble.
+
+        Args:
+            inputs (InputsType): Inputs for the inferencer. It can be a path
+                to image / image directory, or an array, or a list of these.
+                Note: If it's an numpy array, it should be in BGR order.
+            batch_size (int): Inference batch size. Defaults to 1.
+            num_inputs (Sequence[int, optional], optional): For each model,
+                the number of leading inputs to run it on, which is useful
+                when the inputs are sorted by priority. None means all the
+                inputs. Defaults to None.
+
+        Returns:
+            dict: Inference results with key ``predictions``, which maps each
+            model name to its list of predictions. All lists are aligned with
+            the inputs, and are cut short for the models given fewer inputs
+            by ``num_inputs``.
+        """
+        ori_inputs = self.inferencers[0]._inputs_to_list(inputs)
+        if num_inputs is None:
+            num_inputs = [None] * len(self.inferencers)
+        if len(num_inputs) != len(self.inferencers):
+            raise ValueError('The length of num_inputs should match the '
+                             f'number of models, but got {len(num_inputs)} '
+                             f'and {len(self.inferencers)}.')
+        num_inputs = [
+            len(ori_inputs) if num is None else min(num, len(ori_inputs))
+            for num in num_inputs
+        ]
+
+        batches = {}
+        for spec, indices in self.groups.items():
+            # Only preprocess the inputs that some model of the group needs
+            group_num_inputs = max(num_inputs[idx] for idx in indices)
+            inferencer = self.inferencers[indices[0]]
+            batches[spec] = [
+                data for _, data in inferencer.preprocess(
+                    ori_inputs[:group_num_inputs], batch_size=batch_size)
+            ]
+
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            futures = {
+                idx: executor.submit(self._forward_model, idx, batches[spec],
+                                     num_inputs[idx])
+                for spec, indices in self.groups.items() for idx in indices
+            }
+            predictions = {
+                self.names[idx]: futures[idx].result()
+                for idx in range(len(self.inferencers))
+            }
+        return dict(predictions=predictions)
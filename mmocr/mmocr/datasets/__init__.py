@@ -3,6 +3,7 @@ from .dataset_wrapper import ConcatDataset
 from .icdar_dataset import IcdarDataset
 from .ocr_dataset import OCRDataset
 from .recog_lmdb_dataset import RecogLMDBDataset
+from .recog_shard_dataset import RecogShardDataset
 from .recog_text_dataset import RecogTextDataset
 from .samplers import *  # NOQA
 from .transforms import *  # NOQA
@@ -10,5 +11,5 @@ from .wildreceipt_dataset import WildReceiptDataset
 
 __all__ = [
     'IcdarDataset', 'OCRDataset', 'RecogLMDBDataset', 'RecogTextDataset',
-    'WildReceiptDataset', 'ConcatDataset'
+    'WildReceiptDataset', 'ConcatDataset', 'RecogShardDataset'
 ]
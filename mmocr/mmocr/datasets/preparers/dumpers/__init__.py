@@ -2,9 +2,10 @@
 from .base import BaseDumper
 from .json_dumper import JsonDumper
 from .lmdb_dumper import TextRecogLMDBDumper
+from .shard_dumper import TextRecogShardDumper
 from .wild_receipt_openset_dumper import WildreceiptOpensetDumper
 
 __all__ = [
     'BaseDumper', 'JsonDumper', 'WildreceiptOpensetDumper',
-    'TextRecogLMDBDumper'
+    'TextRecogLMDBDumper', 'TextRecogShardDumper'
 ]
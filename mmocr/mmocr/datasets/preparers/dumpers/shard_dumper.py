@@ -0,0 +1,134 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os.path as osp
+import warnings
+from typing import Dict, Optional, Tuple
+
+import mmcv
+import mmengine
+import numpy as np
+
+from mmocr.registry import DATA_DUMPERS
+from .lmdb_dumper import TextRecogLMDBDumper
+
+
+@DATA_DUMPERS.register_module()
+class TextRecogShardDumper(TextRecogLMDBDumper):
+    """Text recognition packed shard format dataset dumper.
+
+    The images are packed back to back into a few large binary shards, so
+    that :class:`RecogShardDataset` can memory-map them instead of opening
+    one file per sample. The output is a directory named
+    ``{task}_{split}.shards`` under ``data_root``, which contains:
+
+        - ``shard-xxxxx.bin``: The concatenated bytes of the images.
+        - ``index.npy``: An int64 array of shape (N, 6), holding the shard
+          index, byte offset, byte length, height, width and channels of
+          each image. The last three columns are 0 for encoded images.
+        - ``meta.json``: The storage mode, the shard files and the texts.
+
+    Args:
+        task (str): Task type. Options are 'textdet', 'textrecog',
+            'textspotter', and 'kie'. It is usually set automatically and users
+             do not need to set it manually in config file in most cases.
+        split (str): It' s the partition of the datasets. Options are 'train',
+            'val' or 'test'. It is usually set automatically and users do not
+            need to set it manually in config file in most cases. Defaults to
+            None.
+        data_root (str): The root directory of the image and
+            annotation. It is usually set automatically and users do not need
+            to set it manually in config file in most cases. Defaults to None.
+        storage (str): How the images are stored. 'encoded' keeps the
+            original file bytes, which is compact but still needs decoding.
+            'raw' stores the decoded BGR uint8 pixels, which skips decoding
+            entirely at the cost of disk space. Defaults to 'encoded'.
+        img_scale (tuple(int, int), optional): The (width, height) to resize
+            the images to before storing them. Only supported with 'raw'
+            storage. Setting it to the scale of the ``Resize`` in the test
+            pipeline makes that transform a no-op. Defaults to None.
+        shard_size (int): Maximum number of bytes in a shard. Defaults to
+            1073741824 (1 GB).
+        encoding (str): Label encoding method. Defaults to 'utf-8'.
+        verify (bool): Whether to check the validity of every image. Defaults
+            to True.
+    """
+
+    def __init__(self,
+                 task: str,
+                 split: str,
+                 data_root: str,
+                 storage: str = 'encoded',
+                 img_scale: Optional[Tuple[int, int]] = None,
+                 shard_size: int = 1073741824,
+                 encoding: str = 'utf-8',
+                 verify: bool = True) -> None:
+        assert task == 'textrecog', \
+            f'TextRecogShardDumper only works with textrecog, but got {task}'
+        assert storage in ['encoded', 'raw'], \
+            f'storage should be "encoded" or "raw", but got {storage}'
+        assert img_scale is None or storage == 'raw', \
+            'img_scale is only supported with raw storage'
+        super().__init__(
+            task=task,
+            split=split,
+            data_root=data_root,
+            encoding=encoding,
+            verify=verify)
+        self.storage = storage
+        self.img_scale = tuple(img_scale) if img_scale else None
+        self.shard_size = shard_size
+
+    def dump(self, data: Dict) -> None:
+        """Dump data to packed shards."""
+        if 'data_list' not in data:
+            raise ValueError('Dump data must have data_list key')
+        output = osp.join(self.data_root, f'{self.task}_{self.split}.shards')
+        mmengine.mkdir_or_exist(output)
+
+        shards, index, texts = [], [], []
+        shard_file, offset = None, 0
+        for d in data['data_list']:
+            img_name, text = self.parser_pack_instance(d)
+            img_path = osp.join(self.data_root, img_name)
+            if not osp.exists(img_path):
+                warnings.warn('%s does not exist' % img_path)
+                continue
+            with open(img_path, 'rb') as f:
+                image_bin = f.read()
+            if self.verify and not self.check_image_is_valid(image_bin):
+                warnings.warn('%s is not a valid image' % img_path)
+                continue
+            shape = (0, 0, 0)
+            if self.storage == 'raw':
+                img = mmcv.imfrombytes(image_bin, flag='color')
+                if self.img_scale is not None:
+                    img = mmcv.imresize(img, self.img_scale)
+                image_bin = np.ascontiguousarray(img).tobytes()
+                shape = img.shape
+
+            if shard_file is None or (offset > 0 and offset + len(image_bin) >
+                                      self.shard_size):
+                if shard_file is not None:
+                    shard_file.close()
+                shards.append(f'shard-{len(shards):05d}.bin')
+                shard_file = open(osp.join(output, shards[-1]), 'wb')
+                offset = 0
+            shard_file.write(image_bin)
+            index.append((len(shards) - 1, offset, len(image_bin), *shape))
+            texts.append(text)
+            offset += len(image_bin)
+        if shard_file is not None:
+            shard_file.close()
+
+        np.save(
+            osp.join(output, 'index.npy'),
+            np.array(index, dtype=np.int64).reshape(-1, 6))
+        mmengine.dump(
+            dict(
+                storage=self.storage,
+                img_scale=self.img_scale,
+                shards=shards,
+                texts=texts),
+            osp.join(output, 'meta.json'),
+            ensure_ascii=False)
+        print('Created shard dataset with %d samples in %d shards' %
+              (len(texts), len(shards)))
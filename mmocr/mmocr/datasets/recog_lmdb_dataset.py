@@ -1,8 +1,11 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import os
 from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
 
 import mmcv
+import numpy as np
 from mmengine.dataset import BaseDataset
+from mmengine.dataset.base_dataset import force_full_init
 
 from mmocr.registry import DATASETS
 
@@ -56,6 +59,12 @@ class RecogLMDBDataset(BaseDataset):
         max_refetch (int, optional): If ``RecogLMDBdataset.prepare_data`` get a
             None img. The maximum extra number of cycles to get a valid
             image. Defaults to 1000.
+        index_only (bool): Whether to skip building ``data_list``. If True,
+            only an array of the lmdb sample indices is kept in memory, and
+            the labels are read from lmdb along with the images. Start-up
+            then no longer scans the whole database, and the forked data
+            loader workers share the index without copying it. Note that
+            ``filter_cfg`` is ignored in this mode. Defaults to False.
     """
 
     def __init__(
@@ -72,8 +81,10 @@ class RecogLMDBDataset(BaseDataset):
         test_mode: bool = False,
         lazy_init: bool = False,
         max_refetch: int = 1000,
+        index_only: bool = False,
     ) -> None:
 
+        self.index_only = index_only
         super().__init__(
             ann_file=ann_file,
             metainfo=metainfo,
@@ -104,14 +115,72 @@ class RecogLMDBDataset(BaseDataset):
         data_list = []
         with self.env.begin(write=False) as txn:
             for i in range(self.total_number):
-                idx = i + 1
-                label_key = f'label-{idx:09d}'
-                img_key = f'image-{idx:09d}'
-                text = txn.get(label_key.encode('utf-8')).decode('utf-8')
-                line = [img_key, text]
-                data_list.append(self.parse_data_info(line))
+                data_list.append(self._load_data_info(txn, i + 1))
         return data_list
 
+    def _load_data_info(self, txn, sample_id: int) -> dict:
+        """Read the label of a sample from lmdb and parse it.
+
+        Args:
+            txn (lmdb.Transaction): An open lmdb transaction.
+            sample_id (int): The 1-based index of the sample in lmdb.
+
+        Returns:
+            dict: Parsed annotation.
+        """
+        label_key = f'label-{sample_id:09d}'
+        img_key = f'image-{sample_id:09d}'
+        text = txn.get(label_key.encode('utf-8')).decode('utf-8')
+        return self.parse_data_info([img_key, text])
+
+    def full_init(self):
+        """Load the annotations, or only the sample index if
+        ``index_only=True``."""
+        if not self.index_only:
+            super().full_init()
+            return
+        if self._fully_initialized:
+            return
+        self._make_env()
+        with self.env.begin(write=False) as txn:
+            self.total_number = int(txn.get(b'num-samples').decode('utf-8'))
+        # A single array is shared by forked workers, unlike a list of dicts
+        # whose reference counts are touched on every access
+        sample_ids = np.arange(1, self.total_number + 1, dtype=np.int64)
+        if isinstance(self._indices, int) and self._indices >= 0:
+            sample_ids = sample_ids[:self._indices]
+        elif isinstance(self._indices, int):
+            sample_ids = sample_ids[self._indices:]
+        elif self._indices is not None:
+            sample_ids = sample_ids[np.asarray(self._indices, dtype=np.int64)]
+        self.sample_ids = sample_ids
+        self._fully_initialized = True
+
+    @force_full_init
+    def get_data_info(self, idx: int) -> dict:
+        """Get annotation by index.
+
+        Args:
+            idx (int): The index of data.
+
+        Returns:
+            dict: The idx-th annotation of the dataset.
+        """
+        if not self.index_only:
+            return super().get_data_info(idx)
+        self._make_env()
+        with self.env.begin(write=False) as txn:
+            data_info = self._load_data_info(txn, int(self.sample_ids[idx]))
+        data_info['sample_idx'] = idx if idx >= 0 else len(self) + idx
+        return data_info
+
+    @force_full_init
+    def __len__(self) -> int:
+        """Get the length of the dataset."""
+        if not self.index_only:
+            return super().__len__()
+        return len(self.sample_ids)
+
     def parse_data_info(self,
                         raw_anno_info: Tuple[Optional[str],
                                              str]) -> Union[dict, List[dict]]:
@@ -140,6 +209,7 @@ class RecogLMDBDataset(BaseDataset):
             Any: Depends on ``self.pipeline``.
         """
         data_info = self.get_data_info(idx)
+        self._make_env()
         with self.env.begin(write=False) as txn:
             img_bytes = txn.get(data_info['img_key'].encode('utf-8'))
             if img_bytes is None:
@@ -152,6 +222,9 @@ class RecogLMDBDataset(BaseDataset):
         """Create lmdb environment from self.ann_file and save it to
         ``self.env``.
 
+        An environment must not be used across ``fork``, so each data loader
+        worker opens its own.
+
         Returns:
             Lmdb environment.
         """
@@ -160,9 +233,10 @@ class RecogLMDBDataset(BaseDataset):
         except ImportError:
             raise ImportError(
                 'Please install lmdb to enable RecogLMDBDataset.')
-        if hasattr(self, 'env'):
+        if hasattr(self, 'env') and self._env_pid == os.getpid():
             return
 
+        self._env_pid = os.getpid()
         self.env = lmdb.open(
             self.ann_file,
             max_readers=1,
@@ -172,6 +246,13 @@ class RecogLMDBDataset(BaseDataset):
             meminit=False,
         )
 
+    def __getstate__(self) -> dict:
+        # The lmdb environment cannot be pickled, workers started by spawn
+        # open their own
+        state = self.__dict__.copy()
+        state.pop('env', None)
+        return state
+
     def close(self):
         """Close lmdb environment."""
         if hasattr(self, 'env'):
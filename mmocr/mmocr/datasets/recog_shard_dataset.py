@@ -0,0 +1,159 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os.path as osp
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import mmcv
+import mmengine
+import numpy as np
+from mmengine.dataset import BaseDataset
+
+from mmocr.registry import DATASETS
+
+
+@DATASETS.register_module()
+class RecogShardDataset(BaseDataset):
+    r"""RecogShardDataset for text recognition.
+
+    The annotation file should be a shard directory written by
+    :class:`TextRecogShardDumper`. The shards are memory-mapped on first
+    access in each process, so the images are read straight from the page
+    cache without opening a file per sample. Images stored in 'raw' mode are
+    also not decoded.
+
+    Each item fetched from this dataset will be a dict containing the
+    following keys:
+
+        - img (ndarray): The loaded image.
+        - img_path (str): The image key.
+        - instances (list[dict]): The list of annotations for the image.
+
+    As with :class:`RecogLMDBDataset`, the images are loaded as numpy arrays,
+    so the pipeline should start with ``LoadImageFromNDArray`` instead of
+    ``LoadImageFromFile``.
+
+    Args:
+        ann_file (str): Path to the shard directory. Defaults to ''.
+        img_color_type (str): The flag argument for :func:``mmcv.imfrombytes``,
+            which determines how the image bytes will be parsed. Defaults to
+            'color'.
+        metainfo (dict, optional): Meta information for dataset, such as class
+            information. Defaults to None.
+        data_root (str): The root directory for ``data_prefix`` and
+            ``ann_file``. Defaults to ''.
+        data_prefix (dict): Prefix for training data. Defaults to
+            ``dict(img_path='')``.
+        filter_cfg (dict, optional): Config for filter data. Defaults to None.
+        indices (int or Sequence[int], optional): Support using first few
+            data in annotation file to facilitate training/testing on a smaller
+            dataset. Defaults to None which means using all ``data_infos``.
+        serialize_data (bool, optional): Whether to hold memory using
+            serialized objects, when enabled, data loader workers can use
+            shared RAM from master process instead of making a copy. Defaults
+            to True.
+        pipeline (list, optional): Processing pipeline. Defaults to [].
+        test_mode (bool, optional): ``test_mode=True`` means in test phase.
+            Defaults to False.
+        lazy_init (bool, optional): Whether to load annotation during
+            instantiation. Defaults to False.
+        max_refetch (int, optional): If ``RecogShardDataset.prepare_data`` get
+            a None img. The maximum extra number of cycles to get a valid
+            image. Defaults to 1000.
+    """
+
+    def __init__(
+        self,
+        ann_file: str = '',
+        img_color_type: str = 'color',
+        metainfo: Optional[dict] = None,
+        data_root: Optional[str] = '',
+        data_prefix: dict = dict(img_path=''),
+        filter_cfg: Optional[dict] = None,
+        indices: Optional[Union[int, Sequence[int]]] = None,
+        serialize_data: bool = True,
+        pipeline: List[Union[dict, Callable]] = [],
+        test_mode: bool = False,
+        lazy_init: bool = False,
+        max_refetch: int = 1000,
+    ) -> None:
+        self.color_type = img_color_type
+        self._shards: Dict[int, np.memmap] = {}
+        super().__init__(
+            ann_file=ann_file,
+            metainfo=metainfo,
+            data_root=data_root,
+            data_prefix=data_prefix,
+            filter_cfg=filter_cfg,
+            indices=indices,
+            serialize_data=serialize_data,
+            pipeline=pipeline,
+            test_mode=test_mode,
+            lazy_init=lazy_init,
+            max_refetch=max_refetch)
+
+    def load_data_list(self) -> List[dict]:
+        """Load annotations from the shard directory ``self.ann_file``.
+
+        Returns:
+            List[dict]: A list of annotation.
+        """
+        meta = mmengine.load(osp.join(self.ann_file, 'meta.json'))
+        self.shard_files = [
+            osp.join(self.ann_file, shard) for shard in meta['shards']
+        ]
+        index = np.load(osp.join(self.ann_file, 'index.npy'))
+        data_list = []
+        for i, (text, row) in enumerate(zip(meta['texts'], index.tolist())):
+            shard, offset, nbytes, height, width, channels = row
+            data_list.append(
+                dict(
+                    img_key=f'image-{i + 1:09d}',
+                    shard=shard,
+                    offset=offset,
+                    nbytes=nbytes,
+                    shape=(height, width, channels) if channels else None,
+                    instances=[dict(text=text)]))
+        return data_list
+
+    def prepare_data(self, idx) -> Any:
+        """Get data processed by ``self.pipeline``.
+
+        Args:
+            idx (int): The index of ``data_info``.
+
+        Returns:
+            Any: Depends on ``self.pipeline``.
+        """
+        data_info = self.get_data_info(idx)
+        offset = data_info.pop('offset')
+        buf = self._get_shard(data_info.pop('shard'))[offset:offset +
+                                                      data_info.pop('nbytes')]
+        shape = data_info.pop('shape')
+        if shape is None:
+            img = mmcv.imfrombytes(buf.tobytes(), flag=self.color_type)
+        else:
+            # Copy out of the read-only map, the transforms may work in place
+            img = np.array(buf).reshape(shape)
+            if self.color_type == 'grayscale':
+                img = mmcv.bgr2gray(img)
+        if img is None:
+            return None
+        data_info['img'] = img
+        return self.pipeline(data_info)
+
+    def _get_shard(self, shard: int) -> np.memmap:
+        """Memory-map a shard, once per process."""
+        if shard not in self._shards:
+            self._shards[shard] = np.memmap(
+                self.shard_files[shard], dtype=np.uint8, mode='r')
+        return self._shards[shard]
+
+    def __getstate__(self) -> dict:
+        # Let the data loader workers map the shards themselves rather than
+        # pickling the mapped contents
+        state = self.__dict__.copy()
+        state['_shards'] = {}
+        return state
+
+    def close(self):
+        """Release the memory-mapped shards."""
+        self._shards = {}
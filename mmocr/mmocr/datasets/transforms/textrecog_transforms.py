@@ -434,137 +434,141 @@ class TextRecogGeneralAug(BaseTransform):
     def _calc_delta(self, dst_w: int, dst_h: int, src_pts: List[int],
                     dst_pts: List[int],
                     grid_size: int) -> Tuple[np.ndarray, np.ndarray]:
-        """Compute delta."""
+        """Compute delta.
+
+        The moving least squares deformation is evaluated at all the grid
+        points at once. The float32 and float64 roundings are those of a
+        point by point evaluation of the same formulas, so the result does
+        not depend on the number of grid points.
+        """
 
         pt_count = len(dst_pts)
         rdx = np.zeros((dst_h, dst_w))
         rdy = np.zeros((dst_h, dst_w))
-        w = np.zeros(pt_count, dtype=np.float32)
 
         if pt_count < 2:
             return
 
-        i = 0
-        while True:
-            if dst_w <= i < dst_w + grid_size - 1:
-                i = dst_w - 1
-            elif i >= dst_w:
-                break
-
-            j = 0
-            while True:
-                if dst_h <= j < dst_h + grid_size - 1:
-                    j = dst_h - 1
-                elif j >= dst_h:
-                    break
-
-                sw = 0
-                swp = np.zeros(2, dtype=np.float32)
-                swq = np.zeros(2, dtype=np.float32)
-                new_pt = np.zeros(2, dtype=np.float32)
-                cur_pt = np.array([i, j], dtype=np.float32)
-
-                k = 0
-                for k in range(pt_count):
-                    if i == dst_pts[k][0] and j == dst_pts[k][1]:
-                        break
-
-                    w[k] = 1. / ((i - dst_pts[k][0]) * (i - dst_pts[k][0]) +
-                                 (j - dst_pts[k][1]) * (j - dst_pts[k][1]))
-
-                    sw += w[k]
-                    swp = swp + w[k] * np.array(dst_pts[k])
-                    swq = swq + w[k] * np.array(src_pts[k])
-
-                if k == pt_count - 1:
-                    pstar = 1 / sw * swp
-                    qstar = 1 / sw * swq
-
-                    miu_s = 0
-                    for k in range(pt_count):
-                        if i == dst_pts[k][0] and j == dst_pts[k][1]:
-                            continue
-                        pt_i = dst_pts[k] - pstar
-                        miu_s += w[k] * np.sum(pt_i * pt_i)
-
-                    cur_pt -= pstar
-                    cur_pt_j = np.array([-cur_pt[1], cur_pt[0]])
-
-                    for k in range(pt_count):
-                        if i == dst_pts[k][0] and j == dst_pts[k][1]:
-                            continue
-
-                        pt_i = dst_pts[k] - pstar
-                        pt_j = np.array([-pt_i[1], pt_i[0]])
-
-                        tmp_pt = np.zeros(2, dtype=np.float32)
-                        tmp_pt[0] = (
-                            np.sum(pt_i * cur_pt) * src_pts[k][0] -
-                            np.sum(pt_j * cur_pt) * src_pts[k][1])
-                        tmp_pt[1] = (-np.sum(pt_i * cur_pt_j) * src_pts[k][0] +
-                                     np.sum(pt_j * cur_pt_j) * src_pts[k][1])
-                        tmp_pt *= (w[k] / miu_s)
-                        new_pt += tmp_pt
-
-                    new_pt += qstar
-                else:
-                    new_pt = src_pts[k]
-
-                rdx[j, i] = new_pt[0] - i
-                rdy[j, i] = new_pt[1] - j
-
-                j += grid_size
-            i += grid_size
+        # Grid points every grid_size pixels, plus the last row and column
+        xs = np.unique(np.append(np.arange(0, dst_w, grid_size), dst_w - 1))
+        ys = np.unique(np.append(np.arange(0, dst_h, grid_size), dst_h - 1))
+        grid_y, grid_x = [
+            g.ravel() for g in np.meshgrid(ys, xs, indexing='ij')
+        ]
+        src = np.array(src_pts, dtype=np.float64)
+        dst = np.array(dst_pts, dtype=np.float64)
+
+        diff_x = grid_x[None] - dst[:, :1]
+        diff_y = grid_y[None] - dst[:, 1:]
+        coincide = (diff_x == 0) & (diff_y == 0)
+        # A grid point on a control point is mapped to its source point,
+        # unless that is the last control point, which is only left out
+        first = np.where(coincide.any(0), coincide.argmax(0), pt_count)
+        use_mls = first >= pt_count - 1
+        active = np.arange(pt_count)[:, None] < first[None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            w = (1. / (diff_x * diff_x + diff_y * diff_y)).astype(np.float32)
+            w = np.where(active, w, np.float32(0))
+            w64 = w.astype(np.float64)
+
+            # The sums over the control points are cumulative sums along the
+            # first axis, which add the terms in the same order as a loop
+            sw = np.cumsum(w64, axis=0)[-1][:, None]
+            pstar = (1 / sw) * np.cumsum(
+                w64[..., None] * dst[:, None], axis=0)[-1]
+            qstar = (1 / sw) * np.cumsum(
+                w64[..., None] * src[:, None], axis=0)[-1]
+
+            pt_i = dst[:, None] - pstar
+            pt_j = np.stack([-pt_i[..., 1], pt_i[..., 0]], axis=-1)
+            miu_s = np.cumsum(
+                w64 * (pt_i[..., 0] * pt_i[..., 0] +
+                       pt_i[..., 1] * pt_i[..., 1]),
+                axis=0)[-1]
+
+            cur_pt = (np.stack([grid_x, grid_y], axis=1) - pstar).astype(
+                np.float32)
+            cur_pt_j = np.stack([-cur_pt[:, 1], cur_pt[:, 0]], axis=1)
+            dot_i = pt_i[..., 0] * cur_pt[:, 0] + pt_i[..., 1] * cur_pt[:, 1]
+            dot_j = pt_j[..., 0] * cur_pt[:, 0] + pt_j[..., 1] * cur_pt[:, 1]
+            dot_i_j = pt_i[..., 0] * cur_pt_j[:, 0] + \
+                pt_i[..., 1] * cur_pt_j[:, 1]
+            dot_j_j = pt_j[..., 0] * cur_pt_j[:, 0] + \
+                pt_j[..., 1] * cur_pt_j[:, 1]
+            src_x, src_y = src[:, :1], src[:, 1:]
+            tmp_pt = np.stack(
+                [dot_i * src_x - dot_j * src_y, -dot_i_j * src_x +
+                 dot_j_j * src_y],
+                axis=-1).astype(np.float32)
+            tmp_pt *= (w64 / miu_s).astype(np.float32)[..., None]
+            new_pt = (np.cumsum(tmp_pt, axis=0)[-1] + qstar).astype(
+                np.float32)
+
+        rdx[grid_y, grid_x] = np.where(
+            use_mls, new_pt[:, 0] - grid_x,
+            src[np.minimum(first, pt_count - 1), 0] - grid_x)
+        rdy[grid_y, grid_x] = np.where(
+            use_mls, new_pt[:, 1] - grid_y,
+            src[np.minimum(first, pt_count - 1), 1] - grid_y)
         return rdx, rdy
 
     def _gen_img(self, src: np.ndarray, rdx: np.ndarray, rdy: np.ndarray,
                  dst_w: int, dst_h: int, grid_size: int,
                  trans_ratio: float) -> np.ndarray:
-        """Generate the image based on delta."""
+        """Generate the image based on delta.
+
+        The delta of each pixel is interpolated from the corners of its grid
+        cell, and the source image is sampled bilinearly, for all the pixels
+        at once.
+        """
 
         src_h, src_w = src.shape[:2]
-        dst = np.zeros_like(src, dtype=np.float32)
-
-        for i in np.arange(0, dst_h, grid_size):
-            for j in np.arange(0, dst_w, grid_size):
-                ni = i + grid_size
-                nj = j + grid_size
-                w = h = grid_size
-                if ni >= dst_h:
-                    ni = dst_h - 1
-                    h = ni - i + 1
-                if nj >= dst_w:
-                    nj = dst_w - 1
-                    w = nj - j + 1
-
-                di = np.reshape(np.arange(h), (-1, 1))
-                dj = np.reshape(np.arange(w), (1, -1))
-                delta_x = self._bilinear_interp(di / h, dj / w, rdx[i, j],
-                                                rdx[i, nj], rdx[ni, j],
-                                                rdx[ni, nj])
-                delta_y = self._bilinear_interp(di / h, dj / w, rdy[i, j],
-                                                rdy[i, nj], rdy[ni, j],
-                                                rdy[ni, nj])
-                nx = j + dj + delta_x * trans_ratio
-                ny = i + di + delta_y * trans_ratio
-                nx = np.clip(nx, 0, src_w - 1)
-                ny = np.clip(ny, 0, src_h - 1)
-                nxi = np.array(np.floor(nx), dtype=np.int32)
-                nyi = np.array(np.floor(ny), dtype=np.int32)
-                nxi1 = np.array(np.ceil(nx), dtype=np.int32)
-                nyi1 = np.array(np.ceil(ny), dtype=np.int32)
-
-                if len(src.shape) == 3:
-                    x = np.tile(np.expand_dims(ny - nyi, axis=-1), (1, 1, 3))
-                    y = np.tile(np.expand_dims(nx - nxi, axis=-1), (1, 1, 3))
-                else:
-                    x = ny - nyi
-                    y = nx - nxi
-                dst[i:i + h,
-                    j:j + w] = self._bilinear_interp(x, y, src[nyi, nxi],
-                                                     src[nyi, nxi1],
-                                                     src[nyi1, nxi], src[nyi1,
-                                                                         nxi1])
+
+        # The corners of the cells of each row and column. The size of the
+        # last cell is one more than the distance between its corners
+        rows, cols = np.arange(dst_h), np.arange(dst_w)
+        i = rows // grid_size * grid_size
+        j = cols // grid_size * grid_size
+        y_ratio = ((rows - i) / np.minimum(grid_size, dst_h - i))[:, None]
+        x_ratio = (cols - j) / np.minimum(grid_size, dst_w - j)
+        nj = np.minimum(j + grid_size, dst_w - 1)
+        tops = np.arange(0, dst_h, grid_size)
+        bottoms = np.minimum(tops + grid_size, dst_h - 1)
+        cell = rows // grid_size
+
+        def interp_delta(delta):
+            # Interpolate along the rows of the cell corners first, then
+            # between the top and bottom corners of each cell
+            top = delta[tops][:, j] * (1 - x_ratio) + \
+                delta[tops][:, nj] * x_ratio
+            bottom = delta[bottoms][:, j] * (1 - x_ratio) + \
+                delta[bottoms][:, nj] * x_ratio
+            return top[cell] * (1 - y_ratio) + bottom[cell] * y_ratio
+
+        nx = cols + interp_delta(rdx) * trans_ratio
+        ny = rows[:, None] + interp_delta(rdy) * trans_ratio
+        nx = np.clip(nx, 0, src_w - 1)
+        ny = np.clip(ny, 0, src_h - 1)
+        nxi = np.array(np.floor(nx), dtype=np.int32)
+        nyi = np.array(np.floor(ny), dtype=np.int32)
+        nxi1 = np.array(np.ceil(nx), dtype=np.int32)
+        nyi1 = np.array(np.ceil(ny), dtype=np.int32)
+
+        x = ny - nyi
+        y = nx - nxi
+        if src.ndim == 3:
+            # Full size weights are much faster than broadcasting over the
+            # short channel axis
+            x = np.repeat(x[..., None], src.shape[2], axis=-1)
+            y = np.repeat(y[..., None], src.shape[2], axis=-1)
+        # Gather from the flattened image, which is faster than indexing
+        # both axes
+        flat = src.reshape(src_h * src_w, *src.shape[2:])
+        dst = self._bilinear_interp(x, y, flat.take(nyi * src_w + nxi, 0),
+                                    flat.take(nyi * src_w + nxi1, 0),
+                                    flat.take(nyi1 * src_w + nxi, 0),
+                                    flat.take(nyi1 * src_w + nxi1, 0))
+        dst = dst.astype(np.float32)
 
         dst = np.clip(dst, 0, 255)
         dst = np.array(dst, dtype=np.uint8)
@@ -1,9 +1,10 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 from .f_metric import F1Metric
 from .hmean_iou_metric import HmeanIOUMetric
-from .recog_metric import CharMetric, OneMinusNEDMetric, WordMetric
+from .recog_metric import (CharMetric, JerseyNumberMetric, OneMinusNEDMetric,
+                           WordMetric)
 
 __all__ = [
     'WordMetric', 'CharMetric', 'OneMinusNEDMetric', 'HmeanIOUMetric',
-    'F1Metric'
+    'F1Metric', 'JerseyNumberMetric'
 ]
@@ -7,11 +7,10 @@ from mmengine.evaluator import BaseMetric
 from mmengine.logging import MMLogger
 from scipy.sparse import csr_matrix
 from scipy.sparse.csgraph import maximum_bipartite_matching
-from shapely.geometry import Polygon
 
 from mmocr.evaluation.functional import compute_hmean
 from mmocr.registry import METRICS
-from mmocr.utils import poly_intersection, poly_iou, polys2shapely
+from mmocr.utils import boundary_overlap_areas
 
 
 @METRICS.register_module()
@@ -99,24 +98,23 @@ class HmeanIOUMetric(BaseMetric):
             gt_ignore_flags = gt_instances.get('ignored')
             if isinstance(gt_ignore_flags, torch.Tensor):
                 gt_ignore_flags = gt_ignore_flags.cpu().numpy()
-            gt_polys = polys2shapely(gt_polys)
-            pred_polys = polys2shapely(pred_polygons)
+            gt_ignore_flags = np.asarray(gt_ignore_flags, dtype=bool)
 
-            pred_ignore_flags = self._filter_preds(pred_polys, gt_polys,
+            # The overlaps between all gt and pred polygons are computed at
+            # once, with a closed form for axis-aligned rectangles
+            inters, gt_areas, pred_areas = boundary_overlap_areas(
+                gt_polys, pred_polygons)
+
+            pred_ignore_flags = self._filter_preds(inters, pred_areas,
                                                    pred_scores,
                                                    gt_ignore_flags)
 
-            gt_num = np.sum(~gt_ignore_flags)
-            pred_num = np.sum(~pred_ignore_flags)
-            iou_metric = np.zeros([gt_num, pred_num])
-
             # Compute IoU scores amongst kept pred and gt polygons
-            for pred_mat_id, pred_poly_id in enumerate(
-                    self._true_indexes(~pred_ignore_flags)):
-                for gt_mat_id, gt_poly_id in enumerate(
-                        self._true_indexes(~gt_ignore_flags)):
-                    iou_metric[gt_mat_id, pred_mat_id] = poly_iou(
-                        gt_polys[gt_poly_id], pred_polys[pred_poly_id])
+            inters = inters[~gt_ignore_flags][:, ~pred_ignore_flags]
+            unions = gt_areas[~gt_ignore_flags, None] + \
+                pred_areas[None, ~pred_ignore_flags] - inters
+            iou_metric = np.zeros(inters.shape)
+            np.divide(inters, unions, out=iou_metric, where=unions != 0)
 
             result = dict(
                 iou_metric=iou_metric,
@@ -147,30 +145,28 @@ class HmeanIOUMetric(BaseMetric):
             pred_scores = result['pred_scores']  # (pred_num)
             dataset_gt_num += iou_metric.shape[0]
 
-            # Filter out predictions by IoU threshold
-            for i, pred_score_thr in enumerate(self.pred_score_thrs):
-                pred_ignore_flags = pred_scores < pred_score_thr
-                # get the number of matched boxes
-                matched_metric = iou_metric[:, ~pred_ignore_flags] \
-                    > self.match_iou_thr
-                if self.strategy == 'max_matching':
-                    csr_matched_metric = csr_matrix(matched_metric)
-                    matched_preds = maximum_bipartite_matching(
-                        csr_matched_metric, perm_type='row')
-                    # -1 denotes unmatched pred polygons
-                    dataset_hit_num[i] += np.sum(matched_preds != -1)
-                else:
-                    # first come first matched
-                    matched_gt_indexes = set()
-                    matched_pred_indexes = set()
-                    for gt_idx, pred_idx in zip(*np.nonzero(matched_metric)):
-                        if gt_idx in matched_gt_indexes or \
-                          pred_idx in matched_pred_indexes:
-                            continue
-                        matched_gt_indexes.add(gt_idx)
-                        matched_pred_indexes.add(pred_idx)
-                    dataset_hit_num[i] += len(matched_gt_indexes)
-                dataset_pred_num[i] += np.sum(~pred_ignore_flags)
+            # Filter out predictions by score threshold, for all the
+            # thresholds at once. (thr_num, pred_num)
+            pred_kept_flags = pred_scores[None] >= self.pred_score_thrs[:,
+                                                                        None]
+            pred_kept_nums = pred_kept_flags.sum(axis=1)
+            dataset_pred_num += pred_kept_nums
+            matched_metric = iou_metric > self.match_iou_thr
+            if np.all(matched_metric.sum(axis=0) <= 1) and np.all(
+                    matched_metric.sum(axis=1) <= 1):
+                # No pred or gt has two candidates, so every match is a hit
+                # as long as its pred is kept, whatever the strategy
+                dataset_hit_num += pred_kept_flags[:, matched_metric.any(
+                    axis=0)].sum(axis=1)
+                continue
+            # The kept preds only depend on how many of them there are, as
+            # they are nested, so match each distinct set once
+            hit_nums = {}
+            for i, pred_kept_num in enumerate(pred_kept_nums):
+                if pred_kept_num not in hit_nums:
+                    hit_nums[pred_kept_num] = self._count_hits(
+                        matched_metric[:, pred_kept_flags[i]])
+                dataset_hit_num[i] += hit_nums[pred_kept_num]
 
         for i, pred_score_thr in enumerate(self.pred_score_thrs):
             recall, precision, hmean = compute_hmean(
@@ -186,16 +182,45 @@ class HmeanIOUMetric(BaseMetric):
                 best_eval_results = eval_results
         return best_eval_results
 
-    def _filter_preds(self, pred_polys: List[Polygon], gt_polys: List[Polygon],
-                      pred_scores: List[float],
+    def _count_hits(self, matched_metric: np.ndarray) -> int:
+        """Count the matches between gt and pred polygons according to
+        ``strategy``.
+
+        Args:
+            matched_metric (np.ndarray): 2D boolean array indicating whether
+                each pair of gt and pred polygons can be matched.
+
+        Returns:
+            int: The number of matches.
+        """
+        if self.strategy == 'max_matching':
+            csr_matched_metric = csr_matrix(matched_metric)
+            matched_preds = maximum_bipartite_matching(
+                csr_matched_metric, perm_type='row')
+            # -1 denotes unmatched pred polygons
+            return int(np.sum(matched_preds != -1))
+        # first come first matched
+        matched_gt_indexes = set()
+        matched_pred_indexes = set()
+        for gt_idx, pred_idx in zip(*np.nonzero(matched_metric)):
+            if gt_idx in matched_gt_indexes or \
+              pred_idx in matched_pred_indexes:
+                continue
+            matched_gt_indexes.add(gt_idx)
+            matched_pred_indexes.add(pred_idx)
+        return len(matched_gt_indexes)
+
+    def _filter_preds(self, inters: np.ndarray, pred_areas: np.ndarray,
+                      pred_scores: np.ndarray,
                       gt_ignore_flags: np.ndarray) -> np.ndarray:
         """Filter out the predictions by score threshold and whether it
         overlaps ignored gt polygons.
 
         Args:
-            pred_polys (list[Polygon]): Pred polygons.
-            gt_polys (list[Polygon]): GT polygons.
-            pred_scores (list[float]): Pred scores of polygons.
+            inters (np.ndarray): Intersection areas between gt and pred
+                polygons, of shape (gt_num, pred_num).
+            pred_areas (np.ndarray): Areas of pred polygons.
+            pred_scores (np.ndarray): Pred scores of polygons.
             gt_ignore_flags (np.ndarray): 1D boolean array indicating
                 the positions of ignored gt polygons.
 
@@ -208,18 +233,8 @@ class HmeanIOUMetric(BaseMetric):
         pred_ignore_flags = pred_scores < self.pred_score_thrs.min()
 
         # Filter out pred polygons which overlaps any ignored gt polygons
-        for pred_id in self._true_indexes(~pred_ignore_flags):
-            for gt_id in self._true_indexes(gt_ignore_flags):
-                # Match pred with ignored gt
-                precision = poly_intersection(
-                    gt_polys[gt_id], pred_polys[pred_id]) / (
-                        pred_polys[pred_id].area + 1e-5)
-                if precision > self.ignore_precision_thr:
-                    pred_ignore_flags[pred_id] = True
-                    break
+        precisions = inters[gt_ignore_flags] / (pred_areas + 1e-5)
+        pred_ignore_flags |= np.any(
+            precisions > self.ignore_precision_thr, axis=0)
 
         return pred_ignore_flags
-
-    def _true_indexes(self, array: np.ndarray) -> np.ndarray:
-        """Get indexes of True elements from a 1D boolean array."""
-        return np.where(array)[0]
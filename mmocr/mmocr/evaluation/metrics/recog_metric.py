@@ -1,13 +1,64 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import re
 from difflib import SequenceMatcher
-from typing import Dict, Optional, Sequence, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import mmengine
+import numpy as np
 from mmengine.evaluator import BaseMetric
-from rapidfuzz.distance import Levenshtein
 
 from mmocr.registry import METRICS
+from mmocr.utils import batch_edit_distance
+
+
+def _get_texts(
+    data_samples: Sequence[Dict],
+    valid_symbol: Optional[re.Pattern] = None
+) -> Tuple[List[str], List[str]]:
+    """Gather the predicted and ground truth texts of a batch.
+
+    Args:
+        data_samples (Sequence[Dict]): A batch of outputs from the model.
+        valid_symbol (re.Pattern, optional): If given, the texts are
+            lowercased and the characters matching it are removed.
+            Defaults to None.
+
+    Returns:
+        tuple(list[str], list[str]): The predicted and ground truth texts.
+    """
+    pred_texts = [
+        data_sample.get('pred_text').get('item')
+        for data_sample in data_samples
+    ]
+    gt_texts = [
+        data_sample.get('gt_text').get('item') for data_sample in data_samples
+    ]
+    if valid_symbol is not None:
+        pred_texts = [
+            valid_symbol.sub('', text.lower()) for text in pred_texts
+        ]
+        gt_texts = [valid_symbol.sub('', text.lower()) for text in gt_texts]
+    return pred_texts, gt_texts
+
+
+def _sum_counts(results: Sequence[Sequence], num_counts: int) -> np.ndarray:
+    """Sum the per-sample counts of the results.
+
+    Each result is a tuple of ``num_counts`` counts for one sample, so that
+    the results can be truncated and split by dataset like those of any other
+    metric.
+
+    Args:
+        results (Sequence[Sequence]): The per-sample counts.
+        num_counts (int): The number of counts of each sample.
+
+    Returns:
+        np.ndarray: The sums of the counts, of shape (num_counts, ). They are
+        zero if there is no result.
+    """
+    if len(results) == 0:
+        return np.zeros(num_counts)
+    return np.asarray(results, dtype=np.float64).sum(axis=0)
 
 
 @METRICS.register_module()
@@ -54,42 +105,41 @@ class WordMetric(BaseMetric):
                 data_samples: Sequence[Dict]) -> None:
         """Process one batch of data_samples. The processed results should be
         stored in ``self.results``, which will be used to compute the metrics
-        when all batches have been processed.
+        when all batches have been processed. One
+        ``(match, match_ignore_case, match_ignore_case_symbol)``
+        tuple is stored per sample.
 
         Args:
             data_batch (Sequence[Dict]): A batch of gts.
             data_samples (Sequence[Dict]): A batch of outputs from the model.
         """
-        for data_sample in data_samples:
-            match_num = 0
-            match_ignore_case_num = 0
-            match_ignore_case_symbol_num = 0
-            pred_text = data_sample.get('pred_text').get('item')
-            gt_text = data_sample.get('gt_text').get('item')
-            if 'ignore_case' in self.mode or 'ignore_case_symbol' in self.mode:
-                pred_text_lower = pred_text.lower()
-                gt_text_lower = gt_text.lower()
-            if 'ignore_case_symbol' in self.mode:
-                gt_text_lower_ignore = self.valid_symbol.sub('', gt_text_lower)
-                pred_text_lower_ignore = self.valid_symbol.sub(
-                    '', pred_text_lower)
-                match_ignore_case_symbol_num =\
-                    gt_text_lower_ignore == pred_text_lower_ignore
-            if 'ignore_case' in self.mode:
-                match_ignore_case_num = pred_text_lower == gt_text_lower
-            if 'exact' in self.mode:
-                match_num = pred_text == gt_text
-            result = dict(
-                match_num=match_num,
-                match_ignore_case_num=match_ignore_case_num,
-                match_ignore_case_symbol_num=match_ignore_case_symbol_num)
-            self.results.append(result)
-
-    def compute_metrics(self, results: Sequence[Dict]) -> Dict:
+        pred_texts, gt_texts = _get_texts(data_samples)
+        # One (match, match_ignore_case, match_ignore_case_symbol) tuple per
+        # sample
+        matches = np.zeros((len(gt_texts), 3), dtype=np.int64)
+        if 'exact' in self.mode:
+            matches[:, 0] = np.array(pred_texts) == np.array(gt_texts)
+        if 'ignore_case' in self.mode or 'ignore_case_symbol' in self.mode:
+            pred_texts_lower = np.char.lower(np.array(pred_texts, dtype=str))
+            gt_texts_lower = np.char.lower(np.array(gt_texts, dtype=str))
+        if 'ignore_case' in self.mode:
+            matches[:, 1] = pred_texts_lower == gt_texts_lower
+        if 'ignore_case_symbol' in self.mode:
+            pred_texts_ignore = [
+                self.valid_symbol.sub('', text) for text in pred_texts_lower
+            ]
+            gt_texts_ignore = [
+                self.valid_symbol.sub('', text) for text in gt_texts_lower
+            ]
+            matches[:, 2] = np.array(pred_texts_ignore) == np.array(
+                gt_texts_ignore)
+        self.results.extend(map(tuple, matches.tolist()))
+
+    def compute_metrics(self, results: Sequence[Tuple]) -> Dict:
         """Compute the metrics from processed results.
 
         Args:
-            results (list[Dict]): The processed results of each batch.
+            results (list[tuple]): The per-sample match counts.
 
         Returns:
             Dict: The computed metrics. The keys are the names of the metrics,
@@ -99,22 +149,14 @@ class WordMetric(BaseMetric):
         eps = 1e-8
         eval_res = {}
         gt_word_num = len(results)
+        match_num, match_ignore_case_num, match_ignore_case_symbol_num = \
+            _sum_counts(results, 3)
         if 'exact' in self.mode:
-            match_nums = [result['match_num'] for result in results]
-            match_nums = sum(match_nums)
-            eval_res['word_acc'] = 1.0 * match_nums / (eps + gt_word_num)
+            eval_res['word_acc'] = 1.0 * match_num / (eps + gt_word_num)
         if 'ignore_case' in self.mode:
-            match_ignore_case_num = [
-                result['match_ignore_case_num'] for result in results
-            ]
-            match_ignore_case_num = sum(match_ignore_case_num)
             eval_res['word_acc_ignore_case'] = 1.0 *\
                 match_ignore_case_num / (eps + gt_word_num)
         if 'ignore_case_symbol' in self.mode:
-            match_ignore_case_symbol_num = [
-                result['match_ignore_case_symbol_num'] for result in results
-            ]
-            match_ignore_case_symbol_num = sum(match_ignore_case_symbol_num)
             eval_res['word_acc_ignore_case_symbol'] = 1.0 *\
                 match_ignore_case_symbol_num / (eps + gt_word_num)
 
@@ -152,45 +194,38 @@ class CharMetric(BaseMetric):
                 data_samples: Sequence[Dict]) -> None:
         """Process one batch of data_samples. The processed results should be
         stored in ``self.results``, which will be used to compute the metrics
-        when all batches have been processed.
+        when all batches have been processed. One
+        ``(gt_char_num, pred_char_num, true_positive_char_num)``
+        tuple is stored per sample.
 
         Args:
             data_batch (Sequence[Dict]): A batch of gts.
             data_samples (Sequence[Dict]): A batch of outputs from the model.
         """
-        for data_sample in data_samples:
-            pred_text = data_sample.get('pred_text').get('item')
-            gt_text = data_sample.get('gt_text').get('item')
-            gt_text_lower = gt_text.lower()
-            pred_text_lower = pred_text.lower()
-            gt_text_lower_ignore = self.valid_symbol.sub('', gt_text_lower)
-            pred_text_lower_ignore = self.valid_symbol.sub('', pred_text_lower)
-            # number to calculate char level recall & precision
-            result = dict(
-                gt_char_num=len(gt_text_lower_ignore),
-                pred_char_num=len(pred_text_lower_ignore),
-                true_positive_char_num=self._cal_true_positive_char(
-                    pred_text_lower_ignore, gt_text_lower_ignore))
-            self.results.append(result)
-
-    def compute_metrics(self, results: Sequence[Dict]) -> Dict:
+        pred_texts, gt_texts = _get_texts(data_samples, self.valid_symbol)
+        # number to calculate char level recall & precision
+        true_positive_char_num = [
+            # identical texts, the most common case, skip the matcher
+            len(gt) if pred == gt else self._cal_true_positive_char(pred, gt)
+            for pred, gt in zip(pred_texts, gt_texts)
+        ]
+        self.results.extend(
+            zip(map(len, gt_texts), map(len, pred_texts),
+                true_positive_char_num))
+
+    def compute_metrics(self, results: Sequence[Tuple]) -> Dict:
         """Compute the metrics from processed results.
 
         Args:
-            results (list[Dict]): The processed results of each batch.
+            results (list[tuple]): The per-sample ground truth, predicted
+                and true positive character numbers.
 
         Returns:
             Dict: The computed metrics. The keys are the names of the
             metrics, and the values are corresponding results.
         """
-        gt_char_num = [result['gt_char_num'] for result in results]
-        pred_char_num = [result['pred_char_num'] for result in results]
-        true_positive_char_num = [
-            result['true_positive_char_num'] for result in results
-        ]
-        gt_char_num = sum(gt_char_num)
-        pred_char_num = sum(pred_char_num)
-        true_positive_char_num = sum(true_positive_char_num)
+        gt_char_num, pred_char_num, true_positive_char_num = _sum_counts(
+            results, 3)
 
         eps = 1e-8
         char_recall = 1.0 * true_positive_char_num / (eps + gt_char_num)
@@ -252,41 +287,129 @@ class OneMinusNEDMetric(BaseMetric):
                 data_samples: Sequence[Dict]) -> None:
         """Process one batch of data_samples. The processed results should be
         stored in ``self.results``, which will be used to compute the metrics
-        when all batches have been processed.
+        when all batches have been processed. One
+        ``(norm_ed, )`` tuple is stored per sample.
 
         Args:
             data_batch (Sequence[Dict]): A batch of gts.
             data_samples (Sequence[Dict]): A batch of outputs from the model.
         """
-        for data_sample in data_samples:
-            pred_text = data_sample.get('pred_text').get('item')
-            gt_text = data_sample.get('gt_text').get('item')
-            gt_text_lower = gt_text.lower()
-            pred_text_lower = pred_text.lower()
-            gt_text_lower_ignore = self.valid_symbol.sub('', gt_text_lower)
-            pred_text_lower_ignore = self.valid_symbol.sub('', pred_text_lower)
-            norm_ed = Levenshtein.normalized_distance(pred_text_lower_ignore,
-                                                      gt_text_lower_ignore)
-            result = dict(norm_ed=norm_ed)
-            self.results.append(result)
-
-    def compute_metrics(self, results: Sequence[Dict]) -> Dict:
+        pred_texts, gt_texts = _get_texts(data_samples, self.valid_symbol)
+        edit_dists = batch_edit_distance(pred_texts, gt_texts)
+        max_lens = np.array([
+            max(len(pred), len(gt)) for pred, gt in zip(pred_texts, gt_texts)
+        ])
+        norm_eds = edit_dists / np.maximum(max_lens, 1)
+        self.results.extend((norm_ed, ) for norm_ed in norm_eds.tolist())
+
+    def compute_metrics(self, results: Sequence[Tuple]) -> Dict:
         """Compute the metrics from processed results.
 
         Args:
-            results (list[Dict]): The processed results of each batch.
+            results (list[tuple]): The per-sample normalized edit distances.
 
         Returns:
             Dict: The computed metrics. The keys are the names of the
             metrics, and the values are corresponding results.
         """
 
-        gt_word_num = len(results)
-        norm_ed = [result['norm_ed'] for result in results]
-        norm_ed_sum = sum(norm_ed)
-        normalized_edit_distance = norm_ed_sum / max(1, gt_word_num)
+        norm_ed_sum, = _sum_counts(results, 1)
+        normalized_edit_distance = norm_ed_sum / max(1, len(results))
         eval_res = {}
         eval_res['1-N.E.D'] = 1.0 - normalized_edit_distance
         for key, value in eval_res.items():
             eval_res[key] = float(f'{value:.4f}')
         return eval_res
+
+
+@METRICS.register_module()
+class JerseyNumberMetric(BaseMetric):
+    """Jersey number metrics for text recognition task.
+
+    Texts are mapped to jersey number classes: a number from 0 to 99, or -1
+    for any other text (e.g. an illegible or empty prediction). A confusion
+    matrix over the 101 classes is built, from which the accuracy and
+    the accuracy averaged over the ground truth classes are computed.
+
+    Args:
+        collect_device (str): Device name used for collecting results from
+            different ranks during distributed training. Must be 'cpu' or
+            'gpu'. Defaults to 'cpu'.
+        prefix (str, optional): The prefix that will be added in the metric
+            names to disambiguate homonymous metrics of different evaluators.
+            If prefix is not provided in the argument, self.default_prefix
+            will be used instead. Defaults to None.
+
+    Attributes:
+        confusion_matrix (np.ndarray, optional): Confusion matrix of the last
+            evaluation, of shape (101, 101). Rows are indexed by ground truth
+            classes and columns by predicted classes, with class ``c`` at
+            index ``c + 1``.
+    """
+    default_prefix: Optional[str] = 'recog'
+    num_classes = 101
+
+    def __init__(self,
+                 collect_device: str = 'cpu',
+                 prefix: Optional[str] = None) -> None:
+        super().__init__(collect_device, prefix)
+        self.confusion_matrix = None
+
+    @staticmethod
+    def text2label(text: str) -> int:
+        """Map a text to its jersey number class.
+
+        Args:
+            text (str): Text to map.
+
+        Returns:
+            int: The jersey number, or -1 if the text is not a number from 0
+            to 99.
+        """
+        if text.isascii() and text.isdigit() and len(text) <= 2:
+            return int(text)
+        return -1
+
+    def process(self, data_batch: Sequence[Dict],
+                data_samples: Sequence[Dict]) -> None:
+        """Process one batch of data_samples. The processed results should be
+        stored in ``self.results``, which will be used to compute the metrics
+        when all batches have been processed. One
+        ``(gt_label, pred_label)`` tuple is stored per sample.
+
+        Args:
+            data_batch (Sequence[Dict]): A batch of gts.
+            data_samples (Sequence[Dict]): A batch of outputs from the model.
+        """
+        pred_texts, gt_texts = _get_texts(data_samples)
+        self.results.extend(
+            (self.text2label(gt), self.text2label(pred))
+            for pred, gt in zip(pred_texts, gt_texts))
+
+    def compute_metrics(self, results: Sequence[Tuple]) -> Dict:
+        """Compute the metrics from processed results.
+
+        Args:
+            results (list[tuple]): The per-sample ground truth and predicted
+                classes.
+
+        Returns:
+            Dict: The computed metrics. The keys are the names of the
+            metrics, and the values are corresponding results.
+        """
+        labels = np.asarray(results, dtype=np.int64).reshape(-1, 2) + 1
+        confusion_matrix = np.bincount(
+            labels[:, 0] * self.num_classes + labels[:, 1],
+            minlength=self.num_classes**2).reshape(self.num_classes,
+                                                   self.num_classes)
+        self.confusion_matrix = confusion_matrix
+        gt_nums = confusion_matrix.sum(axis=1)
+        true_positives = np.diag(confusion_matrix)
+        eval_res = {}
+        eval_res['jersey_acc'] = true_positives.sum() / max(1, gt_nums.sum())
+        present = gt_nums > 0
+        eval_res['jersey_mean_class_acc'] = np.mean(
+            true_positives[present] / gt_nums[present]) if present.any() else 0
+        for key, value in eval_res.items():
+            eval_res[key] = float(f'{value:.4f}')
+        return eval_res
@@ -1,4 +1,5 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import torch
 import torch.nn as nn
 from mmengine.model import BaseModule
 
@@ -133,11 +134,31 @@ class TFDecoderLayer(nn.Module):
                 dec_input,
                 enc_output,
                 self_attn_mask=None,
-                dec_enc_attn_mask=None):
+                dec_enc_attn_mask=None,
+                history=None):
+        """
+        Args:
+            dec_input (Tensor): Input of shape (N, T, D).
+            enc_output (Tensor): Encoder output of shape (N, S, D).
+            self_attn_mask (Tensor, optional): Self attention mask.
+            dec_enc_attn_mask (Tensor, optional): Encoder-decoder attention
+                mask.
+            history (Tensor, optional): Inputs of this layer at the
+                positions before ``dec_input`` of shape (N, T', D). If given,
+                ``dec_input`` attends to them as well, so that incremental
+                decoding only needs to feed the new positions. Defaults to
+                None.
+
+        Returns:
+            Tensor: Output of shape (N, T, D).
+        """
+        self_attn_input = dec_input
+        if history is not None:
+            self_attn_input = torch.cat((history, dec_input), dim=1)
         if self.operation_order == ('self_attn', 'norm', 'enc_dec_attn',
                                     'norm', 'ffn', 'norm'):
-            dec_attn_out = self.self_attn(dec_input, dec_input, dec_input,
-                                          self_attn_mask)
+            dec_attn_out = self.self_attn(dec_input, self_attn_input,
+                                          self_attn_input, self_attn_mask)
             dec_attn_out += dec_input
             dec_attn_out = self.norm1(dec_attn_out)
 
@@ -152,8 +173,10 @@ class TFDecoderLayer(nn.Module):
         elif self.operation_order == ('norm', 'self_attn', 'norm',
                                       'enc_dec_attn', 'norm', 'ffn'):
             dec_input_norm = self.norm1(dec_input)
-            dec_attn_out = self.self_attn(dec_input_norm, dec_input_norm,
-                                          dec_input_norm, self_attn_mask)
+            self_attn_input = dec_input_norm if history is None else \
+                self.norm1(self_attn_input)
+            dec_attn_out = self.self_attn(dec_input_norm, self_attn_input,
+                                          self_attn_input, self_attn_mask)
             dec_attn_out += dec_input
 
             enc_dec_attn_in = self.norm2(dec_attn_out)
@@ -7,7 +7,8 @@ import numpy as np
 from torch import Tensor
 
 from mmocr.structures import TextDetDataSample
-from mmocr.utils import boundary_iou, rescale_polygons
+from mmocr.utils import (boundary_iou_matrix, poly_iou_matrix, polys2shapely,
+                         rescale_polygons)
 
 
 class BaseTextDetPostProcessor:
@@ -178,27 +179,45 @@ class BaseTextDetPostProcessor:
         assert isinstance(scores, list)
         assert len(polygons) == len(scores)
 
+        if len(polygons) == 0:
+            return [], []
         polygons = [
             np.hstack((polygon, score))
             for polygon, score in zip(polygons, scores)
         ]
-        polygons = np.array(sorted(polygons, key=lambda x: x[-1]))
-        keep_polys = []
-        keep_scores = []
-        index = [i for i in range(len(polygons))]
-
-        while len(index) > 0:
-            keep_polys.append(polygons[index[-1]][:-1].tolist())
-            keep_scores.append(polygons[index[-1]][-1])
-            A = polygons[index[-1]][:-1]
-            index = np.delete(index, -1)
-
-            iou_list = np.zeros((len(index), ))
-            for i in range(len(index)):
-                B = polygons[index[i]][:-1]
-
-                iou_list[i] = boundary_iou(A, B, 1)
-            remove_index = np.where(iou_list > threshold)
-            index = np.delete(index, remove_index)
+        # Visit the polygons from the highest score to the lowest. Equal
+        # scores are visited from the last one to the first one.
+        order = np.argsort([polygon[-1] for polygon in polygons],
+                           kind='stable')[::-1]
+        polygons = np.array(polygons)[order]
+        boundaries = polygons[:, :-1]
+
+        # Axis-aligned rectangles have cheap IoUs, so compute them all at
+        # once. Otherwise only the rows of the kept polygons are computed,
+        # whose number is usually much smaller than the number of candidates
+        points = boundaries.astype(np.float32).reshape(len(boundaries), -1, 2)
+        edges = np.roll(points, -1, axis=1) - points
+        rect_ious = None
+        if points.shape[1] == 4 and np.all((edges[..., 0] == 0)
+                                           | (edges[..., 1] == 0)):
+            rect_ious = boundary_iou_matrix(boundaries, boundaries, 1)
+        else:
+            shapes = np.array(polys2shapely(boundaries), dtype=object)
+
+        keep = []
+        remaining = np.arange(len(polygons))
+        while len(remaining) > 0:
+            i, remaining = remaining[0], remaining[1:]
+            keep.append(i)
+            if len(remaining) == 0:
+                break
+            if rect_ious is not None:
+                ious = rect_ious[i, remaining]
+            else:
+                ious = poly_iou_matrix(shapes[i:i + 1], shapes[remaining],
+                                       1)[0]
+            remaining = remaining[ious <= threshold]
 
+        keep_polys = [polygons[i][:-1].tolist() for i in keep]
+        keep_scores = [polygons[i][-1] for i in keep]
         return keep_polys, keep_scores
@@ -1,5 +1,5 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from typing import Sequence
+from typing import List, Sequence
 
 import cv2
 import numpy as np
@@ -36,6 +36,13 @@ class DBPostprocessor(BaseTextDetPostProcessor):
         epsilon_ratio (float): The epsilon ratio for approximation accuracy.
             Defaults to 0.01.
         max_candidates (int): The maximum candidate number. Defaults to 3000.
+        fast_mode (bool): Whether to process all the candidates of an image
+            in a batch. If True, the score of a candidate is the mean score
+            of its connected component, computed for all candidates from a
+            single labelling, and convex polygons are unclipped in vectorized
+            passes instead of one PyClipper call each. The results
+            are close to but not exactly the same as the default mode.
+            Defaults to False.
     """
 
     def __init__(self,
@@ -47,6 +54,7 @@ class DBPostprocessor(BaseTextDetPostProcessor):
                  unclip_ratio: float = 1.5,
                  epsilon_ratio: float = 0.01,
                  max_candidates: int = 3000,
+                 fast_mode: bool = False,
                  **kwargs) -> None:
         super().__init__(
             text_repr_type=text_repr_type,
@@ -58,6 +66,7 @@ class DBPostprocessor(BaseTextDetPostProcessor):
         self.unclip_ratio = unclip_ratio
         self.epsilon_ratio = epsilon_ratio
         self.max_candidates = max_candidates
+        self.fast_mode = fast_mode
 
     def get_text_instances(self, prob_map: Tensor,
                            data_sample: TextDetDataSample
@@ -81,25 +90,49 @@ class DBPostprocessor(BaseTextDetPostProcessor):
         data_sample.pred_instances.scores = []
 
         text_mask = prob_map > self.mask_thr
-
-        score_map = prob_map.data.cpu().numpy().astype(np.float32)
-        text_mask = text_mask.data.cpu().numpy().astype(np.uint8)  # to numpy
+        if prob_map.is_cuda:
+            # Threshold on the GPU and bring the score map and the mask back
+            # to the host in a single transfer
+            score_map, text_mask = torch.stack(
+                (prob_map, text_mask.to(prob_map.dtype))).data.cpu().numpy()
+        else:
+            score_map = prob_map.data.numpy()
+            text_mask = text_mask.data.numpy()
+        score_map = score_map.astype(np.float32)
+        text_mask = text_mask.astype(np.uint8)  # to numpy
 
         contours, _ = cv2.findContours((text_mask * 255).astype(np.uint8),
                                        cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
 
-        for i, poly in enumerate(contours):
-            if i > self.max_candidates:
-                break
+        candidates = []
+        for poly in contours[:self.max_candidates + 1]:
             epsilon = self.epsilon_ratio * cv2.arcLength(poly, True)
             approx = cv2.approxPolyDP(poly, epsilon, True)
             poly_pts = approx.reshape((-1, 2))
             if poly_pts.shape[0] < 4:
                 continue
-            score = self._get_bbox_score(score_map, poly_pts)
-            if score < self.min_text_score:
-                continue
-            poly = self._unclip(poly_pts)
+            candidates.append(poly_pts)
+
+        if self.fast_mode:
+            scores = self._get_component_scores(score_map, text_mask,
+                                                candidates)
+        else:
+            scores = [
+                self._get_bbox_score(score_map, poly_pts)
+                for poly_pts in candidates
+            ]
+        keep = [
+            i for i, score in enumerate(scores)
+            if score >= self.min_text_score
+        ]
+        candidates = [candidates[i] for i in keep]
+        scores = [float(scores[i]) for i in keep]
+        if self.fast_mode:
+            polys = self._unclip_batch(candidates)
+        else:
+            polys = [self._unclip(poly_pts) for poly_pts in candidates]
+
+        for poly, score in zip(polys, scores):
             # If the result polygon does not exist, or it is split into
             # multiple polygons, skip it.
             if len(poly) == 0:
@@ -167,3 +200,95 @@ class DBPostprocessor(BaseTextDetPostProcessor):
         poly = Polygon(poly_pts)
         distance = poly.area * self.unclip_ratio / poly.length
         return offset_polygon(poly_pts, distance)
+
+    def _get_component_scores(self, score_map: np.ndarray,
+                              text_mask: np.ndarray,
+                              candidates: List[np.ndarray]) -> np.ndarray:
+        """Compute the average score over the connected component of each
+        candidate polygon, for all candidates at once.
+
+        Args:
+            score_map (np.ndarray): The score map.
+            text_mask (np.ndarray): The binary text mask the candidates are
+                extracted from.
+            candidates (list[np.ndarray]): The polygon points of each
+                candidate. Its vertices lie on the contour of its component.
+
+        Returns:
+            np.ndarray: The average score of each candidate.
+        """
+        if len(candidates) == 0:
+            return np.zeros((0, ), dtype=np.float32)
+        num_labels, labels = cv2.connectedComponents(text_mask, connectivity=8)
+        # Only the text pixels belong to the components
+        text_pixels = text_mask.astype(bool)
+        fg_labels = labels[text_pixels]
+        sums = np.bincount(
+            fg_labels, weights=score_map[text_pixels], minlength=num_labels)
+        areas = np.bincount(fg_labels, minlength=num_labels)
+        label_scores = sums / np.maximum(areas, 1)
+        vertices = np.array([poly_pts[0] for poly_pts in candidates])
+        return label_scores[labels[vertices[:, 1], vertices[:, 0]]]
+
+    def _unclip_batch(self, candidates: List[np.ndarray],
+                      arc_steps: int = 4) -> List[np.ndarray]:
+        """Unclip a list of polygons. Convex polygons with the same number of
+        vertices are expanded together, with round corners approximated by
+        ``arc_steps`` segments. The other polygons go through
+        :meth:`_unclip`.
+
+        Args:
+            candidates (list[np.ndarray]): The polygon points of each
+                candidate.
+            arc_steps (int): The number of segments per round corner.
+                Defaults to 4.
+
+        Returns:
+            list[np.ndarray]: The expanded polygon points.
+        """
+        results = [None] * len(candidates)
+        groups = {}
+        for i, poly_pts in enumerate(candidates):
+            groups.setdefault(len(poly_pts), []).append(i)
+        for inds in groups.values():
+            polys = np.array([candidates[i] for i in inds], dtype=np.float64)
+            edges = np.roll(polys, -1, axis=1) - polys
+            lengths = np.linalg.norm(edges, axis=2)
+            # The cross products of consecutive edges share the same sign at
+            # every vertex iff the polygon is convex
+            turns = np.cross(np.roll(edges, 1, axis=1), edges)
+            convex = np.all(turns > 0, axis=1) | np.all(turns < 0, axis=1)
+            convex &= np.all(lengths > 0, axis=1)
+            if not np.any(convex):
+                continue
+            inds = [i for i, is_convex in zip(inds, convex) if is_convex]
+            polys, edges = polys[convex], edges[convex]
+            lengths, turns = lengths[convex], turns[convex]
+
+            area = 0.5 * np.abs(
+                np.cross(polys, np.roll(polys, -1, axis=1)).sum(axis=1))
+            distance = area * self.unclip_ratio / lengths.sum(axis=1)
+            # Outward unit normal of each edge
+            orientation = np.sign(turns[:, :1])[..., None]
+            normals = orientation * np.stack(
+                (edges[..., 1], -edges[..., 0]), axis=2) / lengths[..., None]
+            prev_normals = np.roll(normals, 1, axis=1)
+            # Sweep from the normal of the incoming edge to the normal of the
+            # outgoing edge around each vertex
+            start = np.arctan2(prev_normals[..., 1], prev_normals[..., 0])
+            sweep = np.arctan2(
+                np.cross(prev_normals, normals),
+                (prev_normals * normals).sum(axis=2))
+            angles = start[..., None] + sweep[..., None] * np.linspace(
+                0, 1, arc_steps + 1)
+            offsets = np.stack((np.cos(angles), np.sin(angles)), axis=3)
+            expanded = polys[:, :, None] + distance[:, None, None,
+                                                    None] * offsets
+            expanded = expanded.reshape(len(polys), -1).astype(np.float32)
+            for i, poly in zip(inds, expanded):
+                results[i] = poly
+
+        for i, poly_pts in enumerate(candidates):
+            if results[i] is None:
+                results[i] = self._unclip(poly_pts)
+        return results
@@ -166,36 +166,22 @@ class FCEPostprocessor(BaseTextDetPostProcessor):
         tr_pred_mask = (score_pred) > self.score_thr
         tr_mask = fill_hole(tr_pred_mask)
 
-        tr_contours, _ = cv2.findContours(
-            tr_mask.astype(np.uint8), cv2.RETR_TREE,
-            cv2.CHAIN_APPROX_SIMPLE)  # opencv4
-
-        mask = np.zeros_like(tr_mask)
-
-        result_polys = []
-        result_scores = []
-        for cont in tr_contours:
-            deal_map = mask.copy().astype(np.int8)
-            cv2.drawContours(deal_map, [cont], -1, 1, -1)
-
-            score_map = score_pred * deal_map
-            score_mask = score_map > 0
-            xy_text = np.argwhere(score_mask)
-            dxy = xy_text[:, 1] + xy_text[:, 0] * 1j
-
-            x, y = x_pred[score_mask], y_pred[score_mask]
-            c = x + y * 1j
-            c[:, self.fourier_degree] = c[:, self.fourier_degree] + dxy
-            c *= scale
-
-            polygons = self._fourier2poly(c, self.num_reconstr_points)
-            scores = score_map[score_mask].reshape(-1, 1).tolist()
-            polygons, scores = self.poly_nms(polygons, scores, self.nms_thr)
-            result_polys += polygons
-            result_scores += scores
-
-        result_polys, result_scores = self.poly_nms(result_polys,
-                                                    result_scores,
+        # Every pixel inside a text region votes for a polygon. The regions
+        # are hole-free, so they are exactly the filled outer contours and
+        # all of their pixels can be gathered in a single pass
+        score_mask = tr_mask & (score_pred > 0)
+        ys, xs = np.nonzero(score_mask)
+        if len(ys) == 0:
+            return [], []
+        dxy = xs + ys * 1j
+
+        c = x_pred[ys, xs] + y_pred[ys, xs] * 1j
+        c[:, self.fourier_degree] = c[:, self.fourier_degree] + dxy
+        c *= scale
+
+        polygons = self._fourier2poly(c, self.num_reconstr_points)
+        scores = score_pred[ys, xs].reshape(-1, 1).tolist()
+        result_polys, result_scores = self.poly_nms(polygons, scores,
                                                     self.nms_thr)
 
         if self.text_repr_type == 'quad':
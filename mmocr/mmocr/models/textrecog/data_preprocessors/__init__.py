@@ -1,4 +1,12 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+from .batch_augments import (BaseBatchAug, BatchColorJitter, BatchCropHeight,
+                             BatchGaussianBlur, BatchGaussianNoise,
+                             BatchImageContentJitter, BatchReversePixels,
+                             BatchTextRecogGeneralAug)
 from .data_preprocessor import TextRecogDataPreprocessor
 
-__all__ = ['TextRecogDataPreprocessor']
+__all__ = [
+    'TextRecogDataPreprocessor', 'BaseBatchAug', 'BatchTextRecogGeneralAug',
+    'BatchCropHeight', 'BatchImageContentJitter', 'BatchGaussianBlur',
+    'BatchColorJitter', 'BatchGaussianNoise', 'BatchReversePixels'
+]
@@ -0,0 +1,380 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import math
+from typing import List, Optional, Tuple
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from torch import Tensor
+
+from mmocr.registry import MODELS
+from mmocr.structures import TextRecogDataSample
+
+DataSamples = Optional[List[TextRecogDataSample]]
+
+
+class BaseBatchAug(nn.Module):
+    """Base class of the batched counterparts of the text recognition
+    augmentations.
+
+    The augmentations take a stacked batch of images of shape (N, C, H, W) in
+    pixel space, i.e. BGR values in [0, 255] before normalization, and are
+    applied to each image independently with probability ``prob``. They are
+    meant to be used as ``pixel_batch_augments`` of
+    :class:`TextRecogDataPreprocessor`, where they run on the model device
+    instead of in the data loader workers. As they work on the padded batch,
+    they are best used with fixed size inputs, e.g. after ``Resize``.
+
+    Args:
+        prob (float): The probability to augment each image. Defaults to 0.4.
+    """
+
+    def __init__(self, prob: float = 0.4) -> None:
+        super().__init__()
+        assert 0 <= prob <= 1
+        self.prob = prob
+
+    def forward(self, inputs: Tensor,
+                data_samples: DataSamples) -> Tuple[Tensor, DataSamples]:
+        """Augment a random subset of the batch.
+
+        Args:
+            inputs (Tensor): Images of shape (N, C, H, W).
+            data_samples (list[TextRecogDataSample], optional): The data
+                samples of the batch, which are returned unchanged.
+
+        Returns:
+            tuple(Tensor, list[TextRecogDataSample]): The augmented images
+            and the data samples.
+        """
+        selected = torch.rand(len(inputs), device=inputs.device) < self.prob
+        if selected.any():
+            inputs = inputs.float()
+            augmented = self.augment(inputs[selected])
+            inputs = inputs.clone()
+            inputs[selected] = augmented
+        return inputs, data_samples
+
+    def augment(self, inputs: Tensor) -> Tensor:
+        """Augment every image of a batch."""
+        raise NotImplementedError
+
+    @staticmethod
+    def _uniform(inputs: Tensor, low: float, high: float,
+                 *shape: int) -> Tensor:
+        """Draw a uniform random tensor of shape (N, *shape)."""
+        return torch.empty(
+            len(inputs), *shape, device=inputs.device).uniform_(low, high)
+
+    @staticmethod
+    def _warp(inputs: Tensor, flow: Tensor) -> Tensor:
+        """Sample each output pixel at its position plus ``flow``.
+
+        Args:
+            inputs (Tensor): Images of shape (N, C, H, W).
+            flow (Tensor): Pixel offsets of shape (N, 2, H, W), along the
+                width then the height. The positions outside of the image are
+                clamped to its border.
+
+        Returns:
+            Tensor: The warped images.
+        """
+        h, w = inputs.shape[-2:]
+        ys = torch.arange(h, device=inputs.device, dtype=inputs.dtype)
+        xs = torch.arange(w, device=inputs.device, dtype=inputs.dtype)
+        grid_x = (xs + flow[:, 0]) * (2 / max(w - 1, 1)) - 1
+        grid_y = (ys[:, None] + flow[:, 1]) * (2 / max(h - 1, 1)) - 1
+        grid = torch.stack([grid_x, grid_y], dim=-1)
+        return F.grid_sample(
+            inputs,
+            grid,
+            mode='bilinear',
+            padding_mode='border',
+            align_corners=True)
+
+    @staticmethod
+    def _upsample_flow(flow: Tensor, h: int, w: int) -> Tensor:
+        """Bilinearly interpolate control point offsets of shape
+        (N, 2, rows, cols), spread evenly over the image, to every pixel."""
+        return F.interpolate(
+            flow, size=(h, w), mode='bilinear', align_corners=True)
+
+
+@MODELS.register_module()
+class BatchTextRecogGeneralAug(BaseBatchAug):
+    """Batched counterpart of :class:`TextRecogGeneralAug`.
+
+    The distortion, stretching and perspective transforms move control
+    points along the top and bottom edges of the images with the same
+    random ranges as :class:`TextRecogGeneralAug`. Instead of moving least
+    squares, the offsets of the control points are interpolated bilinearly
+    between them, and the three transforms are applied in a single
+    resampling. The number of segments is drawn once per batch.
+
+    Args:
+        prob (float): The probability to augment each image. Defaults to 0.4.
+    """
+
+    def augment(self, inputs: Tensor) -> Tensor:
+        h, w = inputs.shape[-2:]
+        flow = inputs.new_zeros(len(inputs), 2, h, w)
+        if h >= 20 and w >= 20:
+            flow += self._distort_flow(inputs, int(torch.randint(3, 7, ())))
+            flow += self._stretch_flow(inputs, int(torch.randint(3, 7, ())))
+        if h >= 5 and w >= 5:
+            flow += self._perspective_flow(inputs)
+        return self._warp(inputs, flow)
+
+    def _distort_flow(self, inputs: Tensor, segment: int) -> Tensor:
+        """Move the corners inwards and the inner cut points around."""
+        h, w = inputs.shape[-2:]
+        thresh = w // segment // 3
+        # Offsets of the control points along the top and bottom edges
+        offsets = self._uniform(inputs, 0, thresh, 2, 2,
+                                segment + 1).floor() - thresh * 0.5
+        corners = self._uniform(inputs, 0, thresh, 2, 2, 2).floor()
+        offsets[..., ::segment] = corners
+        # The corners move towards the center of the image
+        sign = torch.tensor([1., -1.], device=inputs.device)
+        offsets[:, 0, :, ::segment] *= sign
+        offsets[:, 1, :, ::segment] *= sign[:, None]
+        # The sampling positions move the opposite way
+        return self._upsample_flow(-offsets, h, w)
+
+    def _stretch_flow(self, inputs: Tensor, segment: int) -> Tensor:
+        """Move the inner cuts horizontally, keeping them vertical."""
+        h, w = inputs.shape[-2:]
+        thresh = w // segment * 4 // 5
+        offsets = inputs.new_zeros(len(inputs), 2, 2, segment + 1)
+        offsets[:, 0, :, 1:-1] = (
+            self._uniform(inputs, 0, thresh, 1, segment - 1).floor() -
+            thresh * 0.5)
+        return self._upsample_flow(-offsets, h, w)
+
+    def _perspective_flow(self, inputs: Tensor) -> Tensor:
+        """Move the corners vertically towards the center."""
+        h, w = inputs.shape[-2:]
+        offsets = inputs.new_zeros(len(inputs), 2, 2, 2)
+        offsets[:, 1] = self._uniform(inputs, 0, h // 2, 2, 2).floor()
+        offsets[:, 1, 1] *= -1
+        return self._upsample_flow(-offsets, h, w)
+
+
+@MODELS.register_module()
+class BatchCropHeight(BaseBatchAug):
+    """Batched counterpart of :class:`CropHeight` followed by a resize back
+    to the original height.
+
+    Args:
+        prob (float): The probability to augment each image. Defaults to 0.4.
+        min_pixels (int): Minimum pixel(s) to crop. Defaults to 1.
+        max_pixels (int): Maximum pixel(s) to crop. Defaults to 8.
+    """
+
+    def __init__(self,
+                 prob: float = 0.4,
+                 min_pixels: int = 1,
+                 max_pixels: int = 8) -> None:
+        super().__init__(prob=prob)
+        assert max_pixels >= min_pixels
+        self.min_pixels = min_pixels
+        self.max_pixels = max_pixels
+
+    def augment(self, inputs: Tensor) -> Tensor:
+        h, w = inputs.shape[-2:]
+        crop = torch.randint(
+            self.min_pixels,
+            self.max_pixels + 1, (len(inputs), 1, 1),
+            device=inputs.device).clamp(max=h - 1).to(inputs.dtype)
+        crop_top = torch.rand(len(inputs), 1, 1, device=inputs.device) < 0.5
+        rel_y = torch.linspace(
+            0, 1, h, device=inputs.device, dtype=inputs.dtype)[:, None]
+        # Squeeze the rows into the kept part of the image
+        flow_y = torch.where(crop_top, crop * (1 - rel_y), -crop * rel_y)
+        flow = torch.stack([torch.zeros_like(flow_y), flow_y], dim=1)
+        return self._warp(inputs, flow.expand(-1, -1, h, w))
+
+
+@MODELS.register_module()
+class BatchImageContentJitter(BaseBatchAug):
+    """Batched counterpart of :class:`ImageContentJitter`, which shifts the
+    image contents diagonally.
+
+    Args:
+        prob (float): The probability to augment each image. Defaults to 0.4.
+        jitter_ratio (float): Controls the strength of jittering. Defaults to
+            0.01.
+    """
+
+    def __init__(self, prob: float = 0.4, jitter_ratio: float = 0.01) -> None:
+        super().__init__(prob=prob)
+        self.jitter_ratio = jitter_ratio
+
+    def augment(self, inputs: Tensor) -> Tensor:
+        h, w = inputs.shape[-2:]
+        if h <= 10 or w <= 10:
+            return inputs
+        jitter_range = (self._uniform(inputs, 0, 1) * min(h, w) *
+                        self.jitter_ratio).floor()
+        # Repeated shifts by 0, 1, ..., jitter_range - 1 pixels add up
+        shift = jitter_range * (jitter_range - 1) / 2
+        flow = -shift[:, None, None, None].expand(-1, 2, h, w)
+        return self._warp(inputs, flow)
+
+
+@MODELS.register_module()
+class BatchGaussianBlur(BaseBatchAug):
+    """Batched Gaussian blur, the counterpart of ``TorchVisionWrapper`` with
+    ``op='GaussianBlur'``.
+
+    Args:
+        prob (float): The probability to augment each image. Defaults to 0.4.
+        kernel_size (int): Size of the Gaussian kernel. Defaults to 5.
+        sigma (float): Standard deviation of the Gaussian kernel. Defaults to
+            1.
+        min_size (int): Images whose height or width is not larger than it
+            are left unchanged. Defaults to 10.
+    """
+
+    def __init__(self,
+                 prob: float = 0.4,
+                 kernel_size: int = 5,
+                 sigma: float = 1.,
+                 min_size: int = 10) -> None:
+        super().__init__(prob=prob)
+        assert kernel_size % 2 == 1
+        self.kernel_size = kernel_size
+        self.min_size = min_size
+        kernel = torch.exp(-(torch.arange(kernel_size) - kernel_size // 2)**2 /
+                           (2 * sigma**2))
+        self.register_buffer('kernel', kernel / kernel.sum(), False)
+
+    def augment(self, inputs: Tensor) -> Tensor:
+        n, c, h, w = inputs.shape
+        if min(h, w) <= self.min_size:
+            return inputs
+        pad = self.kernel_size // 2
+        kernel = self.kernel.to(inputs.dtype)
+        # Separable convolution, the rows then the columns
+        outputs = F.pad(
+            inputs.reshape(n * c, 1, h, w), (pad, pad, pad, pad),
+            mode='reflect')
+        outputs = F.conv2d(outputs, kernel.view(1, 1, 1, -1))
+        outputs = F.conv2d(outputs, kernel.view(1, 1, -1, 1))
+        return outputs.reshape(n, c, h, w)
+
+
+@MODELS.register_module()
+class BatchColorJitter(BaseBatchAug):
+    """Batched color jitter, the counterpart of ``TorchVisionWrapper`` with
+    ``op='ColorJitter'``.
+
+    The brightness, contrast, saturation and hue are changed in this order.
+    The hue is rotated in the YIQ color space rather than in HSV. Saturation
+    and hue are only changed for 3-channel images.
+
+    Args:
+        prob (float): The probability to augment each image. Defaults to 0.4.
+        brightness (float): The brightness factor is drawn uniformly from
+            [1 - brightness, 1 + brightness]. Defaults to 0.5.
+        contrast (float): The contrast factor is drawn uniformly from
+            [1 - contrast, 1 + contrast]. Defaults to 0.5.
+        saturation (float): The saturation factor is drawn uniformly from
+            [1 - saturation, 1 + saturation]. Defaults to 0.5.
+        hue (float): The hue shift, as a fraction of a full turn, is drawn
+            uniformly from [-hue, hue]. Defaults to 0.1.
+    """
+
+    # Luma weights of BGR images
+    LUMA = (0.114, 0.587, 0.299)
+
+    def __init__(self,
+                 prob: float = 0.4,
+                 brightness: float = 0.5,
+                 contrast: float = 0.5,
+                 saturation: float = 0.5,
+                 hue: float = 0.1) -> None:
+        super().__init__(prob=prob)
+        assert 0 <= hue <= 0.5
+        self.brightness = brightness
+        self.contrast = contrast
+        self.saturation = saturation
+        self.hue = hue
+
+    def _gray(self, inputs: Tensor) -> Tensor:
+        """Convert the images to grayscale, keeping the channel axis."""
+        if inputs.shape[1] != 3:
+            return inputs.mean(dim=1, keepdim=True)
+        luma = inputs.new_tensor(self.LUMA).view(1, 3, 1, 1)
+        return (inputs * luma).sum(dim=1, keepdim=True)
+
+    def _factor(self, inputs: Tensor, strength: float) -> Tensor:
+        """Draw a factor around 1 for each image."""
+        return self._uniform(inputs, max(0., 1 - strength), 1 + strength, 1,
+                             1, 1)
+
+    def augment(self, inputs: Tensor) -> Tensor:
+        outputs = (inputs *
+                   self._factor(inputs, self.brightness)).clamp(0, 255)
+        mean = self._gray(outputs).mean(dim=(2, 3), keepdim=True)
+        outputs = (mean + (outputs - mean) *
+                   self._factor(inputs, self.contrast)).clamp(0, 255)
+        if inputs.shape[1] != 3:
+            return outputs
+        gray = self._gray(outputs)
+        outputs = (gray + (outputs - gray) *
+                   self._factor(inputs, self.saturation)).clamp(0, 255)
+        if self.hue > 0:
+            outputs = self._rotate_hue(
+                outputs,
+                self._uniform(inputs, -self.hue, self.hue) * 2 * math.pi)
+        return outputs.clamp(0, 255)
+
+    @staticmethod
+    def _rotate_hue(inputs: Tensor, angle: Tensor) -> Tensor:
+        """Rotate the chroma of BGR images in the YIQ color space."""
+        bgr2yiq = inputs.new_tensor([[0.114, 0.587, 0.299],
+                                     [-0.322, -0.274, 0.596],
+                                     [0.312, -0.523, 0.211]])
+        yiq2bgr = torch.linalg.inv(bgr2yiq)
+        cos, sin = torch.cos(angle), torch.sin(angle)
+        rotation = torch.zeros(
+            len(inputs), 3, 3, device=inputs.device, dtype=inputs.dtype)
+        rotation[:, 0, 0] = 1
+        rotation[:, 1, 1] = cos
+        rotation[:, 1, 2] = -sin
+        rotation[:, 2, 1] = sin
+        rotation[:, 2, 2] = cos
+        transform = yiq2bgr @ rotation @ bgr2yiq
+        return torch.einsum('nij,njhw->nihw', transform, inputs)
+
+
+@MODELS.register_module()
+class BatchGaussianNoise(BaseBatchAug):
+    """Batched additive Gaussian noise, the counterpart of ``ImgAugWrapper``
+    with ``AdditiveGaussianNoise``.
+
+    Args:
+        prob (float): The probability to augment each image. Defaults to 0.4.
+        scale (float): Standard deviation of the noise. Defaults to
+            ``0.1**0.5``.
+    """
+
+    def __init__(self, prob: float = 0.4, scale: float = 0.1**0.5) -> None:
+        super().__init__(prob=prob)
+        self.scale = scale
+
+    def augment(self, inputs: Tensor) -> Tensor:
+        return (inputs + torch.randn_like(inputs) * self.scale).clamp(0, 255)
+
+
+@MODELS.register_module()
+class BatchReversePixels(BaseBatchAug):
+    """Batched counterpart of :class:`ReversePixels`.
+
+    Args:
+        prob (float): The probability to augment each image. Defaults to 0.4.
+    """
+
+    def augment(self, inputs: Tensor) -> Tensor:
+        return 255. - inputs
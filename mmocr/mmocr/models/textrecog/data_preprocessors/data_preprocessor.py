@@ -2,8 +2,10 @@
 from numbers import Number
 from typing import Dict, List, Optional, Sequence, Union
 
+import torch
 import torch.nn as nn
 from mmengine.model import ImgDataPreprocessor
+from mmengine.model.utils import stack_batch
 
 from mmocr.registry import MODELS
 
@@ -26,6 +28,7 @@ class TextRecogDataPreprocessor(ImgDataPreprocessor):
       ``pad_size_divisor``
     - Stack inputs to inputs.
     - Convert inputs from bgr to rgb if the shape of input is (3, H, W).
+    - Do pixel batch augmentations during training.
     - Normalize image with defined std and mean.
     - Do batch augmentations during training.
 
@@ -42,6 +45,12 @@ class TextRecogDataPreprocessor(ImgDataPreprocessor):
         rgb_to_bgr (bool): whether to convert image from RGB to RGB.
             Defaults to False.
         batch_augments (list[dict], optional): Batch-level augmentations
+        pixel_batch_augments (list[dict], optional): Batch-level
+            augmentations applied during training to the stacked images in
+            pixel space, i.e. to the BGR values in [0, 255] before channel
+            conversion and normalization, such as :class:`BatchColorJitter`.
+            They run on the model device and can replace the per-sample
+            augmentations of the data pipeline. Defaults to None.
     """
 
     def __init__(self,
@@ -51,7 +60,8 @@ class TextRecogDataPreprocessor(ImgDataPreprocessor):
                  pad_value: Union[float, int] = 0,
                  bgr_to_rgb: bool = False,
                  rgb_to_bgr: bool = False,
-                 batch_augments: Optional[List[Dict]] = None) -> None:
+                 batch_augments: Optional[List[Dict]] = None,
+                 pixel_batch_augments: Optional[List[Dict]] = None) -> None:
         super().__init__(
             mean=mean,
             std=std,
@@ -64,6 +74,11 @@ class TextRecogDataPreprocessor(ImgDataPreprocessor):
                 [MODELS.build(aug) for aug in batch_augments])
         else:
             self.batch_augments = None
+        if pixel_batch_augments is not None:
+            self.pixel_batch_augments = nn.ModuleList(
+                [MODELS.build(aug) for aug in pixel_batch_augments])
+        else:
+            self.pixel_batch_augments = None
 
     def forward(self, data: Dict, training: bool = False) -> Dict:
         """Perform normalization、padding and bgr2rgb conversion based on
@@ -76,6 +91,15 @@ class TextRecogDataPreprocessor(ImgDataPreprocessor):
         Returns:
             dict: Data in the same format as the model input.
         """
+        if training and self.pixel_batch_augments is not None:
+            data = self.cast_data(data)
+            inputs, data_samples = data['inputs'], data.get('data_samples')
+            if not isinstance(inputs, torch.Tensor):
+                inputs = stack_batch(inputs, pad_value=self.pad_value)
+            inputs = inputs.float()
+            for batch_aug in self.pixel_batch_augments:
+                inputs, data_samples = batch_aug(inputs, data_samples)
+            data = dict(data, inputs=inputs, data_samples=data_samples)
         data = super().forward(data=data, training=training)
         inputs, data_samples = data['inputs'], data['data_samples']
 
@@ -93,5 +117,6 @@ class TextRecogDataPreprocessor(ImgDataPreprocessor):
         if training and self.batch_augments is not None:
             for batch_aug in self.batch_augments:
                 inputs, data_samples = batch_aug(inputs, data_samples)
+            data['inputs'], data['data_samples'] = inputs, data_samples
 
         return data
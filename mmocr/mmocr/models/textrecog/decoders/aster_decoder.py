@@ -167,7 +167,7 @@ class ASTERDecoder(BaseDecoder):
         predicted = []
         state = torch.zeros(1, B, self.hidden_size).to(out_enc.device)
         outputs = []
-        for i in range(self.max_seq_len):
+        for i in range(self.num_decode_steps):
             if i == 0:
                 prev_char = torch.zeros(B).fill_(self.start_idx).to(
                     out_enc.device)
@@ -176,6 +176,6 @@ class ASTERDecoder(BaseDecoder):
 
             output, state = self._attention(out_enc, state, prev_char)
             outputs.append(output)
-            _, predicted = output.max(-1)
+            _, predicted = self.mask_classes(output).max(-1)
         outputs = torch.cat([_.unsqueeze(1) for _ in outputs], 1)
         return self.softmax(outputs)
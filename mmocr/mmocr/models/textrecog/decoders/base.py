@@ -56,6 +56,54 @@ class BaseDecoder(BaseModule):
             postprocessor.update(max_seq_len=max_seq_len)
             self.postprocessor = MODELS.build(postprocessor)
 
+    @property
+    def num_decode_steps(self) -> int:
+        """int: Number of steps of autoregressive decoding at test time. It is
+        ``max_seq_len``, unless the postprocessor limits the text length with
+        ``max_text_len``, in which case decoding stops after
+        ``max_text_len + 1`` steps."""
+        max_text_len = getattr(self.postprocessor, 'max_text_len', None)
+        if max_text_len is None:
+            return self.max_seq_len
+        return min(self.max_seq_len, max_text_len + 1)
+
+    def mask_classes(self, logits: torch.Tensor) -> torch.Tensor:
+        """Mask out the classes the postprocessor does not allow, so that the
+        greedy choice of the next token at test time follows the decoding
+        constraint.
+
+        Args:
+            logits (torch.Tensor): Character logits or probabilities with
+                shape :math:`(..., C)`.
+
+        Returns:
+            torch.Tensor: The masked logits.
+        """
+        if self.postprocessor is None:
+            return logits
+        return self.postprocessor.mask_classes(logits)
+
+    def pad_decoded_steps(self, probs: torch.Tensor) -> torch.Tensor:
+        """Pad the character probabilities of a decoding that stopped early,
+        once every sequence in the batch had emitted the end token, to
+        ``num_decode_steps`` steps. The padded steps predict the end token
+        with probability 1, and are never read by the postprocessor.
+
+        Args:
+            probs (torch.Tensor): Character probabilities with shape
+                :math:`(N, T, C)`.
+
+        Returns:
+            torch.Tensor: Character probabilities with shape
+            :math:`(N, self.num_decode_steps, C)`.
+        """
+        num_pad = self.num_decode_steps - probs.size(1)
+        if num_pad <= 0:
+            return probs
+        pad = probs.new_zeros((probs.size(0), num_pad, probs.size(2)))
+        pad[..., self.dictionary.end_idx] = 1
+        return torch.cat((probs, pad), dim=1)
+
     def forward_train(
         self,
         feat: Optional[torch.Tensor] = None,
@@ -1,7 +1,7 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import copy
 import math
-from typing import Dict, Optional, Sequence, Union
+from typing import Dict, List, Optional, Sequence, Union
 
 import torch
 import torch.nn as nn
@@ -249,7 +249,7 @@ class MasterDecoder(BaseDecoder):
 
         Returns:
             Tensor: Character probabilities. of shape
-            :math:`(N, self.max_seq_len, C)` where :math:`C` is
+            :math:`(N, self.num_decode_steps, C)` where :math:`C` is
             ``num_classes``.
         """
 
@@ -261,15 +261,59 @@ class MasterDecoder(BaseDecoder):
         feat = self.feat_positional_encoding(feat)
 
         N = feat.shape[0]
-        input = torch.full((N, 1),
-                           self.SOS,
-                           device=feat.device,
-                           dtype=torch.long)
-        output = None
-        for _ in range(self.max_seq_len):
-            target_mask = self.make_target_mask(input, device=feat.device)
-            out = self.decode(input, feat, None, target_mask)
-            output = out
-            _, next_word = torch.max(out, dim=-1)
-            input = torch.cat([input, next_word[:, -1].unsqueeze(-1)], dim=1)
-        return self.softmax(output)
+        step_seq = torch.full((N, ),
+                              self.SOS,
+                              device=feat.device,
+                              dtype=torch.long)
+        # Each layer caches its normalized self attention inputs at the
+        # decoded positions, so each step only decodes the newest position
+        histories = [None] * len(self.decoder_layers)
+        finished = feat.new_zeros((N, ), dtype=torch.bool)
+        outputs = []
+        for step in range(self.num_decode_steps):
+            step_result = self._decode_step(step_seq, step, feat, histories)
+            outputs.append(step_result)
+            _, step_seq = torch.max(self.mask_classes(step_result), dim=-1)
+            # Stop once every sequence in the batch has ended
+            finished |= step_seq == self.dictionary.end_idx
+            if finished.all():
+                break
+        outputs = torch.stack(outputs, dim=1)
+        return self.pad_decoded_steps(self.softmax(outputs))
+
+    def _decode_step(self, step_seq: torch.Tensor, step: int,
+                     feature: torch.Tensor,
+                     histories: List[Optional[torch.Tensor]]) -> torch.Tensor:
+        """Run :meth:`decode` incrementally on a single position.
+
+        Args:
+            step_seq (Tensor): Target tokens at the position. Shape
+                :math:`(N, )`.
+            step (int): Index of the position.
+            feature (Tensor): Flattened feature map from encoder of
+                shape: math: `(N, H*W, C)`.
+            histories (list[Tensor, optional]): Normalized self attention
+                inputs of each decoder layer at the previous positions,
+                updated in place.
+
+        Returns:
+            Tensor: The raw logits at the position. Shape :math:`(N, C)`.
+        """
+        x = self.embedding(step_seq.unsqueeze(1))
+        x = self.positional_encoding.dropout(
+            x + self.positional_encoding.position_table[:, step:step +
+                                                        1].detach())
+        # A padding query attends to nothing, as in make_target_mask
+        tgt_mask = x.new_zeros((x.size(0), 1, step + 1))
+        tgt_mask.masked_fill_((step_seq == self.PAD).view(-1, 1, 1), -1e9)
+        tgt_mask = tgt_mask.repeat_interleave(self.n_head, dim=0)
+        for i, layer in enumerate(self.decoder_layers):
+            query = layer.norms[0](x)
+            histories[i] = query if histories[i] is None else torch.cat(
+                (histories[i], query), dim=1)
+            x = layer.attentions[0](
+                query, histories[i], histories[i], x, attn_mask=tgt_mask)
+            x = layer.attentions[1](
+                layer.norms[1](x), feature, feature, x, attn_mask=None)
+            x = layer.ffns[0](layer.norms[2](x), x)
+        return self.cls(self.norm(x))[:, 0]
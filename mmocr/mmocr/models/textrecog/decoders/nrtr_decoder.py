@@ -226,7 +226,7 @@ class NRTRDecoder(BaseDecoder):
 
         Returns:
             Tensor: Character probabilities. of shape
-            :math:`(N, self.max_seq_len, C)` where :math:`C` is
+            :math:`(N, self.num_decode_steps, C)` where :math:`C` is
             ``num_classes``.
         """
         valid_ratios = []
@@ -234,24 +234,73 @@ class NRTRDecoder(BaseDecoder):
             valid_ratios.append(data_sample.get('valid_ratio'))
         src_mask = self._get_source_mask(out_enc, valid_ratios)
         N = out_enc.size(0)
-        init_target_seq = torch.full((N, self.max_seq_len + 1),
-                                     self.padding_idx,
-                                     device=out_enc.device,
-                                     dtype=torch.long)
-        # bsz * seq_len
-        init_target_seq[:, 0] = self.start_idx
+        step_seq = torch.full((N, ),
+                              self.start_idx,
+                              device=out_enc.device,
+                              dtype=torch.long)
+        # The inputs of every layer at the decoded positions are cached, so
+        # each step only runs the decoder on the newest position
+        histories = [None] * len(self.layer_stack)
+        trg_pad_mask = out_enc.new_zeros((N, 0), dtype=torch.bool)
+        finished = out_enc.new_zeros((N, ), dtype=torch.bool)
 
         outputs = []
-        for step in range(0, self.max_seq_len):
-            decoder_output = self._attention(
-                init_target_seq, out_enc, src_mask=src_mask)
-            # bsz * seq_len * C
-            step_result = self.classifier(decoder_output[:, step, :])
+        for step in range(0, self.num_decode_steps):
+            trg_pad_mask = torch.cat(
+                (trg_pad_mask, (step_seq != self.padding_idx).unsqueeze(1)),
+                dim=1)
+            output = self._attention_step(step_seq, step, out_enc, src_mask,
+                                          trg_pad_mask, histories)
+            step_result = self.classifier(output)
             # bsz * num_classes
             outputs.append(step_result)
-            _, step_max_index = torch.max(step_result, dim=-1)
-            init_target_seq[:, step + 1] = step_max_index
+            _, step_seq = torch.max(self.mask_classes(step_result), dim=-1)
+            # Stop once every sequence in the batch has ended
+            finished |= step_seq == self.dictionary.end_idx
+            if finished.all():
+                break
 
         outputs = torch.stack(outputs, dim=1)
 
-        return self.softmax(outputs)
+        return self.pad_decoded_steps(self.softmax(outputs))
+
+    def _attention_step(self, step_seq: torch.Tensor, step: int,
+                        src: torch.Tensor, src_mask: Optional[torch.Tensor],
+                        trg_pad_mask: torch.Tensor,
+                        histories: List[Optional[torch.Tensor]]
+                        ) -> torch.Tensor:
+        """Run :meth:`_attention` incrementally on a single position.
+
+        Args:
+            step_seq (Tensor): Target tokens at the position. Shape
+                :math:`(N, )`.
+            step (int): Index of the position.
+            src (Tensor): Source sequence from encoder in shape
+                Shape :math:`(N, T, D_m)` where :math:`D_m` is ``d_model``.
+            src_mask (Tensor, Optional): Mask for source sequence.
+                Shape :math:`(N, T)`.
+            trg_pad_mask (Tensor): Whether the target tokens up to the
+                position are not padding. Shape :math:`(N, step + 1)`.
+            histories (list[Tensor, optional]): Inputs of each decoder layer
+                at the previous positions, updated in place.
+
+        Returns:
+            Tensor: Output of the transformer decoder at the position.
+            Shape :math:`(N, D_m)`.
+        """
+        trg_embedding = self.trg_word_emb(step_seq.unsqueeze(1))
+        trg_pos_encoded = self.position_enc.dropout(
+            trg_embedding +
+            self.position_enc.position_table[:, step:step + 1].detach())
+        output = self.dropout(trg_pos_encoded)
+        for i, dec_layer in enumerate(self.layer_stack):
+            layer_input = output
+            output = dec_layer(
+                output,
+                src,
+                self_attn_mask=trg_pad_mask.unsqueeze(1),
+                dec_enc_attn_mask=src_mask,
+                history=histories[i])
+            histories[i] = layer_input if histories[i] is None else \
+                torch.cat((histories[i], layer_input), dim=1)
+        return self.layer_norm(output)[:, 0]
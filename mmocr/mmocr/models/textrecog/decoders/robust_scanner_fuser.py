@@ -120,7 +120,7 @@ class RobustScannerFuser(BaseDecoder):
 
         Returns:
             Tensor: Character probabilities. of shape
-            :math:`(N, self.max_seq_len, C)` where :math:`C` is
+            :math:`(N, self.num_decode_steps, C)` where :math:`C` is
             ``num_classes``.
         """
         position_glimpse = self.position_decoder(feat, out_enc, data_samples)
@@ -129,7 +129,7 @@ class RobustScannerFuser(BaseDecoder):
         decode_sequence = (feat.new_ones((batch_size, self.max_seq_len)) *
                            self.dictionary.start_idx).long()
         outputs = []
-        for step in range(self.max_seq_len):
+        for step in range(self.num_decode_steps):
             hybrid_glimpse_step = self.hybrid_decoder.forward_test_step(
                 feat, out_enc, decode_sequence, step, data_samples)
 
@@ -138,7 +138,8 @@ class RobustScannerFuser(BaseDecoder):
             output = self.linear_layer(fusion_input)
             output = self.glu_layer(output)
             output = self.prediction(output)
-            _, max_idx = torch.max(output, dim=1, keepdim=False)
+            _, max_idx = torch.max(
+                self.mask_classes(output), dim=1, keepdim=False)
             if step < self.max_seq_len - 1:
                 decode_sequence[:, step + 1] = max_idx
             outputs.append(output)
@@ -75,6 +75,7 @@ class ParallelSARDecoder(BaseDecoder):
 
         self.num_classes = self.dictionary.num_classes
         self.enc_bi_rnn = enc_bi_rnn
+        self.dec_bi_rnn = dec_bi_rnn
         self.d_k = d_k
         self.start_idx = self.dictionary.start_idx
         self.mask = mask
@@ -241,7 +242,7 @@ class ParallelSARDecoder(BaseDecoder):
 
         Returns:
             Tensor: Character probabilities. of shape
-            :math:`(N, self.max_seq_len, C)` where :math:`C` is
+            :math:`(N, self.num_decode_steps, C)` where :math:`C` is
             ``num_classes``.
         """
         if data_samples is not None:
@@ -254,7 +255,7 @@ class ParallelSARDecoder(BaseDecoder):
                 for data_sample in data_samples
             ] if self.mask else None
 
-        seq_len = self.max_seq_len
+        seq_len = self.num_decode_steps
 
         bsz = feat.size(0)
         start_token = torch.full((bsz, ),
@@ -271,20 +272,30 @@ class ParallelSARDecoder(BaseDecoder):
         decoder_input = torch.cat((out_enc, start_token), dim=1)
         # bsz * (seq_len + 1) * emb_dim
 
+        finished = feat.new_zeros((bsz, ), dtype=torch.bool)
         outputs = []
         for i in range(1, seq_len + 1):
+            # A unidirectional decoder never looks ahead, so the positions
+            # not decoded yet can be left out
+            step_input = decoder_input if self.dec_bi_rnn else \
+                decoder_input[:, :i + 1]
             decoder_output = self._2d_attention(
-                decoder_input, feat, out_enc, valid_ratios=valid_ratios)
+                step_input, feat, out_enc, valid_ratios=valid_ratios)
             char_output = decoder_output[:, i, :]  # bsz * num_classes
             outputs.append(char_output)
-            _, max_idx = torch.max(char_output, dim=1, keepdim=False)
+            _, max_idx = torch.max(
+                self.mask_classes(char_output), dim=1, keepdim=False)
+            # Stop once every sequence in the batch has ended
+            finished |= max_idx == self.dictionary.end_idx
+            if finished.all():
+                break
             char_embedding = self.embedding(max_idx)  # bsz * emb_dim
             if i < seq_len:
                 decoder_input[:, i + 1, :] = char_embedding
 
         outputs = torch.stack(outputs, 1)  # bsz * seq_len * num_classes
 
-        return self.softmax(outputs)
+        return self.pad_decoded_steps(self.softmax(outputs))
 
 
 @MODELS.register_module()
@@ -529,7 +540,7 @@ class SequentialSARDecoder(BaseDecoder):
 
         Returns:
             Tensor: Character probabilities. of shape
-            :math:`(N, self.max_seq_len, C)` where :math:`C` is
+            :math:`(N, self.num_decode_steps, C)` where :math:`C` is
             ``num_classes``.
         """
         valid_ratios = None
@@ -545,7 +556,8 @@ class SequentialSARDecoder(BaseDecoder):
                                  device=feat.device,
                                  dtype=torch.long)
         start_token = self.embedding(start_token)
-        for i in range(-1, self.max_seq_len):
+        finished = feat.new_zeros((feat.size(0), ), dtype=torch.bool)
+        for i in range(-1, self.num_decode_steps):
             if i == -1:
                 if self.dec_gru:
                     hx1 = cx1 = self.rnn_decoder_layer1(out_enc)
@@ -564,11 +576,16 @@ class SequentialSARDecoder(BaseDecoder):
                     hx2,
                     cx2,
                     valid_ratios=valid_ratios)
-                _, max_idx = torch.max(y, dim=1, keepdim=False)
+                _, max_idx = torch.max(
+                    self.mask_classes(y), dim=1, keepdim=False)
                 char_embedding = self.embedding(max_idx)
                 y_prev = char_embedding
                 outputs.append(y)
+                # Stop once every sequence in the batch has ended
+                finished |= max_idx == self.dictionary.end_idx
+                if finished.all():
+                    break
 
         outputs = torch.stack(outputs, 1)
 
-        return self.softmax(outputs)
+        return self.pad_decoded_steps(self.softmax(outputs))
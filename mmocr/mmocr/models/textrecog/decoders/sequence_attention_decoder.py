@@ -177,10 +177,10 @@ class SequenceAttentionDecoder(BaseDecoder):
 
         Returns:
             Tensor: Character probabilities. of shape
-            :math:`(N, self.max_seq_len, C)` where :math:`C` is
+            :math:`(N, self.num_decode_steps, C)` where :math:`C` is
             ``num_classes``.
         """
-        seq_len = self.max_seq_len
+        seq_len = self.num_decode_steps
         batch_size = feat.size(0)
 
         decode_sequence = (feat.new_ones(
@@ -191,7 +191,8 @@ class SequenceAttentionDecoder(BaseDecoder):
             step_out = self.forward_test_step(feat, out_enc, decode_sequence,
                                               i, data_samples)
             outputs.append(step_out)
-            _, max_idx = torch.max(step_out, dim=1, keepdim=False)
+            _, max_idx = torch.max(
+                self.mask_classes(step_out), dim=1, keepdim=False)
             if i < seq_len - 1:
                 decode_sequence[:, i + 1] = max_idx
 
@@ -29,7 +29,7 @@ class AttentionPostprocessor(BaseTextRecogPostprocessor):
         Returns:
             tuple(list[int], list[float]): index and score.
         """
-        max_value, max_idx = torch.max(probs, -1)
+        max_value, max_idx = torch.max(self.mask_classes(probs), -1)
         index, score = [], []
         output_index = max_idx.cpu().detach().numpy().tolist()
         output_score = max_value.cpu().detach().numpy().tolist()
@@ -1,6 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import warnings
-from typing import Dict, Optional, Sequence, Tuple, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import mmengine
 import torch
@@ -25,12 +25,23 @@ class BaseTextRecogPostprocessor:
             each item can be one of the following reversed keywords: 'padding',
             'end' and 'unknown', which refer to their corresponding special
             tokens in the dictionary.
+        allowed_chars (list[str], optional): If given, decoding is
+            constrained to these characters: the scores of all the other
+            classes, except the padding and end tokens, are masked out before
+            taking the argmax. E.g. ``list('0123456789')`` decodes digits
+            only. Defaults to None, which means no constraint.
+        max_text_len (int, optional): If given, the predicted texts are cut
+            to their first ``max_text_len`` characters, and autoregressive
+            decoders stop after ``max_text_len + 1`` steps, the last one
+            being for the end token. Defaults to None.
     """
 
     def __init__(self,
                  dictionary: Union[Dictionary, Dict],
                  max_seq_len: int = 40,
                  ignore_chars: Sequence[str] = ['padding'],
+                 allowed_chars: Optional[Sequence[str]] = None,
+                 max_text_len: Optional[int] = None,
                  **kwargs) -> None:
 
         if isinstance(dictionary, dict):
@@ -64,6 +75,62 @@ class BaseTextRecogPostprocessor:
             ignore_indexes.append(index)
         self.ignore_indexes = ignore_indexes
 
+        self.set_constraint(allowed_chars, max_text_len)
+
+    def set_constraint(self,
+                       allowed_chars: Optional[Sequence[str]] = None,
+                       max_text_len: Optional[int] = None) -> None:
+        """Constrain the decoding to a set of characters and a maximum text
+        length. E.g. ``set_constraint(list('0123456789'), 2)`` only decodes
+        numbers from 0 to 99. Calling it without arguments removes the
+        constraint.
+
+        Args:
+            allowed_chars (list[str], optional): Characters the decoding is
+                constrained to. Defaults to None.
+            max_text_len (int, optional): Maximum number of characters in the
+                predicted texts. Defaults to None.
+        """
+        if max_text_len is not None and max_text_len < 0:
+            raise ValueError('max_text_len should be non-negative, '
+                             f'but got {max_text_len}')
+        self.max_text_len = max_text_len
+        self.class_mask = None
+        if allowed_chars is None:
+            return
+        if not mmengine.is_list_of(allowed_chars, str):
+            raise TypeError('allowed_chars must be list of str')
+        class_mask = torch.zeros(self.dictionary.num_classes, dtype=torch.bool)
+        for allowed_char in allowed_chars:
+            index = self.dictionary.char2idx(allowed_char, strict=False)
+            if index is None or index == self.dictionary.unknown_idx:
+                warnings.warn(
+                    f'{allowed_char} does not exist in the dictionary',
+                    UserWarning)
+                continue
+            class_mask[index] = True
+        for index in (self.dictionary.padding_idx, self.dictionary.end_idx):
+            if index is not None:
+                class_mask[index] = True
+        self.class_mask = class_mask
+
+    def mask_classes(self, probs: torch.Tensor) -> torch.Tensor:
+        """Mask out the classes outside ``allowed_chars``.
+
+        Args:
+            probs (torch.Tensor): Character probabilities with shape
+                :math:`(..., C)`.
+
+        Returns:
+            torch.Tensor: The probabilities where the disallowed classes are
+            set to ``-inf``, or ``probs`` itself if decoding is not
+            constrained.
+        """
+        if self.class_mask is None:
+            return probs
+        return probs.masked_fill(~self.class_mask.to(probs.device),
+                                 float('-inf'))
+
     def get_single_prediction(
         self,
         probs: torch.Tensor,
@@ -82,6 +149,29 @@ class BaseTextRecogPostprocessor:
         """
         raise NotImplementedError
 
+    def get_batch_prediction(
+        self, probs: torch.Tensor, data_samples: Sequence[TextRecogDataSample]
+    ) -> List[Tuple[Sequence[int], Sequence[float]]]:
+        """Convert the output probabilities of a batch of images to indexes
+        and scores. It calls :meth:`get_single_prediction` on each image by
+        default, and can be overridden by postprocessors that decode a whole
+        batch at once.
+
+        Args:
+            probs (torch.Tensor): Batched character probabilities with shape
+                :math:`(N, T, C)`.
+            data_samples (list[TextRecogDataSample]): The list of
+                TextRecogDataSample.
+
+        Returns:
+            list[tuple(list[int], list[float])]: Index and scores
+            per-character of each image.
+        """
+        return [
+            self.get_single_prediction(probs[idx, :, :], data_samples[idx])
+            for idx in range(probs.size(0))
+        ]
+
     def __call__(
         self, probs: torch.Tensor, data_samples: Sequence[TextRecogDataSample]
     ) -> Sequence[TextRecogDataSample]:
@@ -97,14 +187,14 @@ class BaseTextRecogPostprocessor:
             list(TextRecogDataSample): The list of TextRecogDataSample. It
             usually contain ``pred_text`` information.
         """
-        batch_size = probs.size(0)
-
-        for idx in range(batch_size):
-            index, score = self.get_single_prediction(probs[idx, :, :],
-                                                      data_samples[idx])
+        predictions = self.get_batch_prediction(probs, data_samples)
+        for (index, score), data_sample in zip(predictions, data_samples):
+            if self.max_text_len is not None:
+                index = index[:self.max_text_len]
+                score = score[:self.max_text_len]
             text = self.dictionary.idx2str(index)
             pred_text = LabelData()
             pred_text.score = score
             pred_text.item = text
-            data_samples[idx].pred_text = pred_text
+            data_sample.pred_text = pred_text
         return data_samples
@@ -1,6 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import math
-from typing import Sequence, Tuple
+from typing import List, Sequence, Tuple
 
 import torch
 
@@ -28,25 +28,52 @@ class CTCPostProcessor(BaseTextRecogPostprocessor):
         Returns:
             tuple(list[int], list[float]): index and score.
         """
-        feat_len = probs.size(0)
-        max_value, max_idx = torch.max(probs, -1)
-        valid_ratio = data_sample.get('valid_ratio', 1)
-        decode_len = min(feat_len, math.ceil(feat_len * valid_ratio))
-        index = []
-        score = []
-
-        prev_idx = self.dictionary.padding_idx
-        for t in range(decode_len):
-            tmp_value = max_idx[t].item()
-            if tmp_value not in (prev_idx, *self.ignore_indexes):
-                index.append(tmp_value)
-                score.append(max_value[t].item())
-            prev_idx = tmp_value
-        return index, score
-
-    def __call__(
-        self, outputs: torch.Tensor,
-        data_samples: Sequence[TextRecogDataSample]
-    ) -> Sequence[TextRecogDataSample]:
-        outputs = outputs.cpu().detach()
-        return super().__call__(outputs, data_samples)
+        return self.get_batch_prediction(probs[None], [data_sample])[0]
+
+    def get_batch_prediction(
+        self, probs: torch.Tensor, data_samples: Sequence[TextRecogDataSample]
+    ) -> List[Tuple[Sequence[int], Sequence[float]]]:
+        """Greedy CTC decoding of a batch of images. The argmax, the removal
+        of repeats and blanks and the valid length cut are all done with
+        tensor ops on the device of ``probs``, followed by a single transfer
+        to the host.
+
+        Args:
+            probs (torch.Tensor): Batched character probabilities with shape
+                :math:`(N, T, C)`.
+            data_samples (list[TextRecogDataSample]): The list of
+                TextRecogDataSample.
+
+        Returns:
+            list[tuple(list[int], list[float])]: Index and scores
+            per-character of each image.
+        """
+        batch_size, feat_len = probs.shape[:2]
+        max_value, max_idx = torch.max(self.mask_classes(probs.detach()), -1)
+
+        decode_lens = [
+            min(feat_len,
+                math.ceil(feat_len * data_sample.get('valid_ratio', 1)))
+            for data_sample in data_samples
+        ]
+        decode_lens = torch.tensor(decode_lens, device=probs.device)
+        # The first step is compared against the padding (blank) index
+        padding_idx = self.dictionary.padding_idx
+        if padding_idx is None:
+            padding_idx = -1
+        prev_idx = torch.cat(
+            (max_idx.new_full((batch_size, 1), padding_idx), max_idx[:, :-1]),
+            dim=1)
+        keep = max_idx != prev_idx
+        for ignore_index in self.ignore_indexes:
+            keep &= max_idx != ignore_index
+        keep &= torch.arange(
+            feat_len, device=probs.device)[None, :] < decode_lens[:, None]
+
+        # Pack everything into one tensor to transfer it at once
+        dtype = torch.promote_types(max_value.dtype, torch.float32)
+        packed = torch.stack(
+            (max_idx.to(dtype), max_value.to(dtype), keep.to(dtype))).cpu()
+        max_idx, max_value, keep = packed[0].long(), packed[1], packed[2] > 0
+        return [(max_idx[i][keep[i]].tolist(), max_value[i][keep[i]].tolist())
+                for i in range(batch_size)]
@@ -13,15 +13,17 @@ from .img_utils import crop_img, warp_img
 from .mask_utils import fill_hole
 from .parsers import LineJsonParser, LineStrParser
 from .point_utils import point_distance, points_center
-from .polygon_utils import (boundary_iou, crop_polygon, is_poly_inside_rect,
-                            offset_polygon, poly2bbox, poly2shapely,
-                            poly_intersection, poly_iou, poly_make_valid,
-                            poly_union, polys2shapely, rescale_polygon,
-                            rescale_polygons, shapely2poly, sort_points,
-                            sort_vertex, sort_vertex8)
+from .polygon_utils import (boundary_iou, boundary_iou_matrix,
+                            boundary_overlap_areas, crop_polygon,
+                            is_poly_inside_rect, offset_polygon, poly2bbox,
+                            poly2shapely, poly_intersection, poly_iou,
+                            poly_iou_matrix, poly_make_valid, poly_union,
+                            polys2shapely, rescale_polygon, rescale_polygons,
+                            shapely2poly, sort_points, sort_vertex,
+                            sort_vertex8)
 from .processing import track_parallel_progress_multi_args
 from .setup_env import register_all_modules
-from .string_utils import StringStripper
+from .string_utils import StringStripper, batch_edit_distance
 from .transform_utils import remove_pipeline_elements
 from .typing_utils import (ColorType, ConfigType, DetSampleList,
                            InitConfigType, InstanceList, KIESampleList,
@@ -41,7 +43,9 @@ __all__ = [
     'poly_intersection', 'poly_iou', 'poly_make_valid', 'poly_union',
     'poly2shapely', 'polys2shapely', 'register_all_modules', 'offset_polygon',
     'sort_vertex8', 'sort_vertex', 'bbox_center_distance',
-    'bbox_diag_distance', 'boundary_iou', 'point_distance', 'points_center',
+    'bbox_diag_distance', 'boundary_iou', 'boundary_iou_matrix',
+    'boundary_overlap_areas', 'poly_iou_matrix', 'point_distance',
+    'points_center',
     'fill_hole', 'LineJsonParser', 'LineStrParser', 'shapely2poly', 'crop_img',
     'warp_img', 'ConfigType', 'DetSampleList', 'RecForwardResults',
     'InitConfigType', 'OptConfigType', 'OptDetSampleList', 'OptInitConfigType',
@@ -50,5 +54,5 @@ __all__ = [
     'is_archive', 'check_integrity', 'list_files', 'get_md5', 'InstanceList',
     'LabelList', 'OptInstanceList', 'OptLabelList', 'RangeType',
     'remove_pipeline_elements', 'bezier2poly', 'poly2bezier',
-    'track_parallel_progress_multi_args'
+    'track_parallel_progress_multi_args', 'batch_edit_distance'
 ]
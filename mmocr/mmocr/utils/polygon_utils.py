@@ -298,6 +298,62 @@ def poly_iou(poly_a: Polygon,
     return area_inters / area_union if area_union != 0 else zero_division
 
 
+def poly_iou_matrix(polys_a: Sequence[Polygon],
+                    polys_b: Sequence[Polygon],
+                    zero_division: float = 0.) -> np.ndarray:
+    """Calculate the IOUs between every pair of polygons from two sets.
+
+    It gives the same results as calling :func:`poly_iou` on every pair, but
+    runs the geometry operations as vectorized shapely calls, and only
+    intersects the pairs whose bounding boxes overlap.
+
+    Args:
+        polys_a (Sequence[Polygon]): N polygons.
+        polys_b (Sequence[Polygon]): M polygons.
+        zero_division (float): The return value when the union of a pair is
+            empty.
+
+    Returns:
+        np.ndarray: The IoU matrix in shape (N, M).
+    """
+    inters, areas_a, areas_b = _poly_overlap_areas(polys_a, polys_b)
+    return _overlap_areas2iou(inters, areas_a, areas_b, zero_division)
+
+
+def _poly_overlap_areas(
+        polys_a: Sequence[Polygon], polys_b: Sequence[Polygon]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compute the intersection areas between every pair of polygons from
+    two sets, and the areas of the polygons, after making them valid."""
+    polys_a = _make_valid(polys_a)
+    polys_b = _make_valid(polys_b)
+    areas_a = shapely.area(polys_a)
+    areas_b = shapely.area(polys_b)
+    # Empty polygons have nan bounds, which never pass the overlap test
+    bounds_a = shapely.bounds(polys_a).reshape(-1, 1, 4)
+    bounds_b = shapely.bounds(polys_b).reshape(1, -1, 4)
+    overlap = ((bounds_a[..., 0] <= bounds_b[..., 2])
+               & (bounds_b[..., 0] <= bounds_a[..., 2])
+               & (bounds_a[..., 1] <= bounds_b[..., 3])
+               & (bounds_b[..., 1] <= bounds_a[..., 3]))
+    inters = np.zeros(overlap.shape)
+    rows, cols = np.nonzero(overlap)
+    if len(rows) > 0:
+        inters[rows, cols] = shapely.area(
+            shapely.intersection(polys_a[rows], polys_b[cols]))
+    return inters, areas_a, areas_b
+
+
+def _overlap_areas2iou(inters: np.ndarray, areas_a: np.ndarray,
+                       areas_b: np.ndarray,
+                       zero_division: Union[int, float]) -> np.ndarray:
+    """Compute IoUs from intersection areas and the areas of both sets."""
+    unions = areas_a[:, None] + areas_b[None, :] - inters
+    ious = np.full(inters.shape, zero_division, dtype=np.float64)
+    np.divide(inters, unions, out=ious, where=unions != 0)
+    return ious
+
+
 def is_poly_inside_rect(poly: ArrayLike, rect: np.ndarray) -> bool:
     """Check if the polygon is inside the target region.
         Args:
@@ -372,6 +428,91 @@ def boundary_iou(src: List,
     return poly_iou(src_poly, target_poly, zero_division=zero_division)
 
 
+def _make_valid(polys: Sequence[Polygon]) -> np.ndarray:
+    """Vectorized :func:`poly_make_valid` returning an object array."""
+    polys = np.array(polys, dtype=object).reshape(-1)
+    invalid = ~shapely.is_valid(polys)
+    polys[invalid] = shapely.buffer(polys[invalid], 0)
+    not_polygon = shapely.get_type_id(polys) != shapely.GeometryType.POLYGON
+    polys[not_polygon] = shapely.convex_hull(polys[not_polygon])
+    return polys
+
+
+def boundary_iou_matrix(src: Sequence[ArrayLike],
+                        target: Sequence[ArrayLike],
+                        zero_division: Union[int, float] = 0) -> np.ndarray:
+    """Calculate the IOUs between every pair of boundaries from two sets.
+
+    It gives the same results as calling :func:`boundary_iou` on every pair.
+    When all the boundaries are axis-aligned rectangles, the IoUs are
+    computed in closed form with numpy; otherwise :func:`poly_iou_matrix` is
+    used.
+
+    Args:
+       src (Sequence[ArrayLike]): N source boundaries.
+       target (Sequence[ArrayLike]): M target boundaries.
+       zero_division (int or float): The return value when invalid
+                                    boundary exists.
+
+    Returns:
+       np.ndarray: The IoU matrix in shape (N, M).
+    """
+    return _overlap_areas2iou(*boundary_overlap_areas(src, target),
+                              zero_division)
+
+
+def boundary_overlap_areas(
+        src: Sequence[ArrayLike], target: Sequence[ArrayLike]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Calculate the intersection areas between every pair of boundaries from
+    two sets, along with the area of each boundary.
+
+    Invalid boundaries are made valid with the same rules as
+    :func:`poly_make_valid`. When all the boundaries are axis-aligned
+    rectangles, the areas are computed in closed form with numpy.
+
+    Args:
+       src (Sequence[ArrayLike]): N source boundaries.
+       target (Sequence[ArrayLike]): M target boundaries.
+
+    Returns:
+       tuple(np.ndarray, np.ndarray, np.ndarray): The intersection areas in
+       shape (N, M), and the areas of the source and target boundaries in
+       shape (N, ) and (M, ).
+    """
+    src_boxes = _axis_aligned_boxes(src)
+    target_boxes = _axis_aligned_boxes(target)
+    if src_boxes is None or target_boxes is None:
+        return _poly_overlap_areas(polys2shapely(src), polys2shapely(target))
+
+    areas_src = (src_boxes[:, 2] - src_boxes[:, 0]) * (
+        src_boxes[:, 3] - src_boxes[:, 1])
+    areas_target = (target_boxes[:, 2] - target_boxes[:, 0]) * (
+        target_boxes[:, 3] - target_boxes[:, 1])
+    lt = np.maximum(src_boxes[:, None, :2], target_boxes[None, :, :2])
+    rb = np.minimum(src_boxes[:, None, 2:], target_boxes[None, :, 2:])
+    wh = np.clip(rb - lt, 0, None)
+    inters = wh[..., 0] * wh[..., 1]
+    return inters, areas_src, areas_target
+
+
+def _axis_aligned_boxes(
+        boundaries: Sequence[ArrayLike]) -> Optional[np.ndarray]:
+    """Convert boundaries to [x1, y1, x2, y2] boxes if all of them are
+    quadrangles with axis-parallel edges, otherwise return None."""
+    if len(boundaries) == 0:
+        return np.zeros((0, 4), dtype=np.float64)
+    if any(len(boundary) != 8 for boundary in boundaries):
+        return None
+    # Follow poly2shapely and compute on float32 coordinates
+    points = np.array(boundaries, dtype=np.float32).reshape(-1, 4, 2)
+    edges = np.roll(points, -1, axis=1) - points
+    if not np.all((edges[..., 0] == 0) | (edges[..., 1] == 0)):
+        return None
+    points = points.astype(np.float64)
+    return np.concatenate([points.min(axis=1), points.max(axis=1)], axis=1)
+
+
 def sort_points(points):
     # TODO Add typehints & test & docstring
     """Sort arbitrary points in clockwise order in Cartesian coordinate, you
@@ -1,4 +1,9 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+from typing import Sequence
+
+import numpy as np
+
+
 class StringStripper:
     """Removing the leading and/or the trailing characters based on the string
     argument passed.
@@ -34,3 +39,48 @@ class StringStripper:
             return in_str.rstrip(self.strip_str)
         else:
             return in_str.strip(self.strip_str)
+
+
+def batch_edit_distance(preds: Sequence[str],
+                        gts: Sequence[str]) -> np.ndarray:
+    """Compute the Levenshtein distances between pairs of strings at once.
+
+    The dynamic programming table is filled one row per character of the
+    predictions for the whole batch. Within a row, the insertion chain is
+    resolved with a running minimum, so there is no loop over the characters
+    of the ground truths.
+
+    Args:
+        preds (Sequence[str]): Predicted strings.
+        gts (Sequence[str]): Ground truth strings, aligned with ``preds``.
+
+    Returns:
+        np.ndarray: Edit distance of each pair, of shape (N, ).
+    """
+    assert len(preds) == len(gts)
+    num = len(preds)
+    pred_lens = np.array([len(pred) for pred in preds], dtype=np.int64)
+    gt_lens = np.array([len(gt) for gt in gts], dtype=np.int64)
+    if num == 0:
+        return np.zeros(0, dtype=np.int64)
+    # Pad with different values so that padding never matches
+    pred_codes = np.full((num, pred_lens.max()), -1, dtype=np.int64)
+    gt_codes = np.full((num, gt_lens.max()), -2, dtype=np.int64)
+    for i, (pred, gt) in enumerate(zip(preds, gts)):
+        pred_codes[i, :len(pred)] = [ord(c) for c in pred]
+        gt_codes[i, :len(gt)] = [ord(c) for c in gt]
+
+    cols = np.arange(gt_codes.shape[1] + 1)
+    rows = np.arange(num)
+    dist = np.broadcast_to(cols, (num, len(cols)))
+    result = dist[rows, gt_lens]
+    for i in range(pred_codes.shape[1]):
+        cost = pred_codes[:, i:i + 1] != gt_codes
+        # deletion or substitution, then insertion via running minimum
+        cur = np.empty_like(dist)
+        cur[:, 0] = i + 1
+        cur[:, 1:] = np.minimum(dist[:, 1:] + 1, dist[:, :-1] + cost)
+        dist = np.minimum.accumulate(cur - cols, axis=1) + cols
+        ended = pred_lens == i + 1
+        result = np.where(ended, dist[rows, gt_lens], result)
+    return result
@@ -0,0 +1,45 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os.path as osp
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from mmocr.apis.inferencers.detection_cache import DetectionCache
+
+
+class TestDetectionCache(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = osp.join(self.tmp_dir.name, 'det_cache.sqlite')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_put_get(self):
+        cache = DetectionCache(self.path)
+        polygons = [
+            np.array([0, 0, 10, 0, 10, 5, 0, 5], dtype=np.float32),
+            np.arange(12, dtype=np.float32)
+        ]
+        scores = np.array([0.9, 0.5], dtype=np.float32)
+        cache.put(['a', 'b'], [(polygons, scores), ([], np.zeros(0))])
+        self.assertEqual(len(cache), 2)
+
+        entry_a, entry_b, entry_c = cache.get(['a', 'b', 'c'])
+        self.assertIsNone(entry_c)
+        self.assertEqual(len(entry_a[0]), 2)
+        for polygon, expected in zip(entry_a[0], polygons):
+            np.testing.assert_array_equal(polygon, expected)
+        np.testing.assert_array_equal(entry_a[1], scores)
+        self.assertEqual(entry_b[0], [])
+        self.assertEqual(len(entry_b[1]), 0)
+
+        # entries persist across connections and can be replaced
+        cache.close()
+        cache = DetectionCache(self.path)
+        cache.put(['a'], [([], np.zeros(0))])
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get(['a'])[0][0], [])
+        cache.close()
@@ -85,6 +85,47 @@ class TestTextDetinferencer(TestCase):
         self.assertTrue(
             np.array_equal(res_bs1['visualization'], res_bs3['visualization']))
 
+    @mock.patch('mmengine.infer.infer._load_checkpoint')
+    def test_cache(self, mock_load):
+        mock_load.side_effect = lambda *x, **y: None
+        imgs = [
+            np.random.randint(0, 256, (64, 96, 3), dtype=np.uint8)
+            for _ in range(3)
+        ]
+        expected = self.inferencer(imgs, batch_size=2)['predictions']
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = osp.join(tmp_dir, 'det_cache.sqlite')
+            inferencer = TextDetInferencer('DB_r18', cache_path=cache_path)
+            inferencer.model.load_state_dict(
+                self.inferencer.model.state_dict())
+            res = inferencer(imgs[:2], batch_size=2)['predictions']
+            self.assertEqual(len(inferencer.cache), 2)
+            # the cached images are not run through the model again
+            with mock.patch.object(
+                    inferencer, 'forward',
+                    wraps=inferencer.forward) as mock_forward:
+                res += inferencer(imgs[2:], batch_size=2)['predictions']
+                res_cached = inferencer(imgs, batch_size=2)['predictions']
+                self.assertEqual(mock_forward.call_count, 1)
+            self.assertEqual(len(inferencer.cache), 3)
+            for preds in [res, res_cached]:
+                self.assertEqual(len(preds), len(imgs))
+                for pred, exp in zip(preds, expected):
+                    self.assertEqual(len(pred['scores']), len(exp['scores']))
+                    if exp['scores']:
+                        self.assert_prediction_equal(pred, exp)
+
+            # a different postprocessor setting misses the cache
+            inferencer.model.det_head.postprocessor.mask_thr += 0.1
+            inferencer._fingerprint = None
+            with mock.patch.object(
+                    inferencer, 'forward',
+                    wraps=inferencer.forward) as mock_forward:
+                inferencer(imgs, batch_size=3)
+                self.assertEqual(mock_forward.call_count, 1)
+            self.assertEqual(len(inferencer.cache), 6)
+            inferencer.cache.close()
+
     def test_visualize(self):
         img_paths = [
             'tests/data/det_toy_dataset/imgs/test/img_1.jpg',
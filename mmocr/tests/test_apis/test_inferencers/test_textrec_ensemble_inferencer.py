@@ -0,0 +1,61 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import random
+from unittest import TestCase, mock
+
+import numpy as np
+import torch
+
+from mmocr.apis.inferencers import TextRecEnsembleInferencer
+
+
+class TestTextRecEnsembleInferencer(TestCase):
+
+    @mock.patch('mmengine.infer.infer._load_checkpoint')
+    def setUp(self, mock_load):
+        mock_load.side_effect = lambda *x, **y: None
+        seed = 1
+        random.seed(seed)
+        np.random.seed(seed)
+        torch.manual_seed(seed)
+        self.inferencer = TextRecEnsembleInferencer(['CRNN', 'CRNN', 'SAR'])
+
+    @mock.patch('mmengine.infer.infer._load_checkpoint')
+    def test_init(self, mock_load):
+        mock_load.side_effect = lambda *x, **y: None
+        with self.assertRaises(ValueError):
+            TextRecEnsembleInferencer([])
+        with self.assertRaises(ValueError):
+            TextRecEnsembleInferencer(['CRNN', 'SAR'], weights=[None])
+        # identical pipelines are grouped together
+        self.assertEqual(len(self.inferencer.groups), 2)
+
+    def test_call(self):
+        imgs = [
+            np.random.randint(0, 256, (h, w, 3), dtype=np.uint8)
+            for h, w in [(32, 100), (48, 60), (20, 80)]
+        ]
+        res = self.inferencer(imgs, batch_size=2)['predictions']
+        self.assertEqual(list(res.keys()), ['CRNN', 'CRNN_1', 'SAR'])
+        for inferencer, name in zip(self.inferencer.inferencers,
+                                    self.inferencer.names):
+            # same results as running the model on its own
+            expected = inferencer(
+                imgs, batch_size=2, progress_bar=False)['predictions']
+            self.assertEqual(len(res[name]), len(imgs))
+            for pred, exp in zip(res[name], expected):
+                self.assertEqual(pred['text'], exp['text'])
+                self.assertAlmostEqual(pred['scores'], exp['scores'])
+
+        # each model only runs on its number of leading inputs
+        res = self.inferencer(
+            imgs, batch_size=2, num_inputs=[1, None, 2])['predictions']
+        self.assertEqual([len(res[name]) for name in self.inferencer.names],
+                         [1, 3, 2])
+        for inferencer, name in zip(self.inferencer.inferencers,
+                                    self.inferencer.names):
+            expected = inferencer(
+                imgs, batch_size=2, progress_bar=False)['predictions']
+            for pred, exp in zip(res[name], expected):
+                self.assertEqual(pred['text'], exp['text'])
+        with self.assertRaises(ValueError):
+            self.inferencer(imgs, num_inputs=[1])
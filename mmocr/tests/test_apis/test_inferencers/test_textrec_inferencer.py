@@ -81,6 +81,31 @@ class TestTextRecinferencer(TestCase):
         self.assertIn('visualization', res_bs3)
         self.assertIn('predictions', res_bs3)
 
+    def test_stream(self):
+        imgs = [
+            np.random.randint(0, 256, (32, 20 * (i + 1), 3), dtype=np.uint8)
+            for i in range(5)
+        ]
+        expected = self.inferencer(imgs, batch_size=2)['predictions']
+
+        # the inputs can be a generator, consumed one batch at a time
+        consumed = []
+
+        def gen_inputs():
+            for img in imgs:
+                consumed.append(img)
+                yield img
+
+        stream = self.inferencer.stream(gen_inputs(), batch_size=2)
+        batch_res = next(stream)
+        self.assertEqual(len(batch_res['predictions']), 2)
+        self.assertEqual(len(consumed), 2)
+        preds = batch_res['predictions']
+        for batch_res in stream:
+            preds.extend(batch_res['predictions'])
+        self.assertEqual(len(consumed), 5)
+        self.assert_predictions_equal(preds, expected)
+
     def test_visualize(self):
         img_paths = [
             'tests/data/rec_toy_dataset/imgs/1036169.jpg',
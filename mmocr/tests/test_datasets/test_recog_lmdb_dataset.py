@@ -1,7 +1,14 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import os.path as osp
+import pickle
+import tempfile
 from unittest import TestCase
 
+import mmcv
+import numpy as np
+
 from mmocr.datasets import RecogLMDBDataset
+from mmocr.datasets.preparers.dumpers import TextRecogLMDBDumper
 
 
 class TestRecogLMDBDataset(TestCase):
@@ -18,3 +25,52 @@ class TestRecogLMDBDataset(TestCase):
         self.assertEqual(dataset[0]['instances'][0]['text'], 'GRAND')
         self.assertEqual(dataset[1]['img'].shape, (17, 37, 3))
         self.assertEqual(dataset[1]['instances'][0]['text'], 'HOTEL')
+
+    def test_index_only(self):
+        with tempfile.TemporaryDirectory() as root:
+            data_list = []
+            for i in range(5):
+                img = np.full((10 + i, 20, 3), i, dtype=np.uint8)
+                mmcv.imwrite(img, osp.join(root, f'{i}.png'))
+                data_list.append(
+                    dict(img_path=f'{i}.png', instances=[dict(text=str(i))]))
+            TextRecogLMDBDumper('textrecog', 'train', root)(
+                dict(data_list=data_list))
+            ann_file = osp.join(root, 'textrecog_train.lmdb')
+
+            # lmdb only allows one open environment per path and process
+            dataset = RecogLMDBDataset(ann_file=ann_file, pipeline=[])
+            data_infos = [dataset.get_data_info(i) for i in range(5)]
+            dataset.close()
+
+            lazy_dataset = RecogLMDBDataset(
+                ann_file=ann_file, pipeline=[], index_only=True)
+            self.assertEqual(len(lazy_dataset.data_list), 0)
+            self.assertEqual(len(lazy_dataset), 5)
+            for i in range(5):
+                self.assertEqual(lazy_dataset[i]['img'].shape, (10 + i, 20, 3))
+                self.assertEqual(lazy_dataset[i]['instances'][0]['text'],
+                                 str(i))
+                self.assertEqual(lazy_dataset.get_data_info(i), data_infos[i])
+            self.assertEqual(lazy_dataset.get_data_info(-1)['sample_idx'], 4)
+
+            lazy_dataset.close()
+
+            # subsets
+            lazy_dataset = RecogLMDBDataset(
+                ann_file=ann_file, pipeline=[], index_only=True, indices=2)
+            self.assertEqual(len(lazy_dataset), 2)
+            lazy_dataset.close()
+            lazy_dataset = RecogLMDBDataset(
+                ann_file=ann_file,
+                pipeline=[],
+                index_only=True,
+                indices=[4, 1])
+            self.assertEqual(lazy_dataset[0]['instances'][0]['text'], '4')
+
+            # the environment is reopened after unpickling
+            state = pickle.dumps(lazy_dataset)
+            lazy_dataset.close()
+            lazy_dataset = pickle.loads(state)
+            self.assertEqual(lazy_dataset[1]['instances'][0]['text'], '1')
+            lazy_dataset.close()
@@ -0,0 +1,81 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os.path as osp
+import pickle
+import tempfile
+from unittest import TestCase
+
+import mmcv
+import numpy as np
+
+from mmocr.datasets import RecogShardDataset
+from mmocr.datasets.preparers.dumpers import TextRecogShardDumper
+
+
+class TestRecogShardDataset(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = self.tmp_dir.name
+        rng = np.random.RandomState(0)
+        self.imgs, data_list = [], []
+        for i, (h, w) in enumerate([(26, 67), (17, 37), (40, 20)]):
+            img = rng.randint(0, 256, (h, w, 3), dtype=np.uint8)
+            mmcv.imwrite(img, osp.join(self.root, f'{i}.png'))
+            self.imgs.append(img)
+            data_list.append(
+                dict(img_path=f'{i}.png', instances=[dict(text=str(i))]))
+        self.data = dict(data_list=data_list)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_encoded(self):
+        # a small shard size spreads the images over several shards
+        TextRecogShardDumper(
+            'textrecog', 'train', self.root, shard_size=6000)(
+                self.data)
+        ann_file = osp.join(self.root, 'textrecog_train.shards')
+        dataset = RecogShardDataset(ann_file=ann_file, pipeline=[])
+        self.assertGreater(len(dataset.shard_files), 1)
+        self.assertEqual(len(dataset), 3)
+        for i, img in enumerate(self.imgs):
+            np.testing.assert_array_equal(dataset[i]['img'], img)
+            self.assertEqual(dataset[i]['instances'][0]['text'], str(i))
+
+        dataset = RecogShardDataset(
+            ann_file=ann_file, img_color_type='grayscale', pipeline=[])
+        self.assertEqual(dataset[0]['img'].shape, (26, 67))
+
+    def test_raw(self):
+        TextRecogShardDumper('textrecog', 'test', self.root, storage='raw')(
+            self.data)
+        dataset = RecogShardDataset(
+            ann_file=osp.join(self.root, 'textrecog_test.shards'),
+            pipeline=[])
+        for i, img in enumerate(self.imgs):
+            np.testing.assert_array_equal(dataset[i]['img'], img)
+        # the images are copied out of the read-only map
+        dataset[0]['img'][0, 0] = 0
+
+        # the mapped shards are not pickled
+        dataset = pickle.loads(pickle.dumps(dataset))
+        self.assertEqual(dataset._shards, {})
+        np.testing.assert_array_equal(dataset[1]['img'], self.imgs[1])
+
+        TextRecogShardDumper(
+            'textrecog',
+            'val',
+            self.root,
+            storage='raw',
+            img_scale=(32, 16))(
+                self.data)
+        dataset = RecogShardDataset(
+            ann_file=osp.join(self.root, 'textrecog_val.shards'),
+            pipeline=[])
+        for i, img in enumerate(self.imgs):
+            np.testing.assert_array_equal(dataset[i]['img'],
+                                          mmcv.imresize(img, (32, 16)))
+
+        with self.assertRaises(AssertionError):
+            TextRecogShardDumper(
+                'textrecog', 'val', self.root, img_scale=(32, 16))
@@ -143,6 +143,29 @@ class TestTextRecogGeneralAug(unittest.TestCase):
         results = self.transform(copy.deepcopy(data_info))
         self.assertEqual(results['img'].shape[:2], results['img_shape'])
 
+    def test_warp_mls(self):
+        img = np.random.randint(0, 256, (64, 256, 3), dtype=np.uint8)
+        src_pts = [[0, 0], [256, 0], [256, 64], [0, 64], [128, 0],
+                   [128, 64]]
+        # identical control points leave the image unchanged, up to rounding
+        warped = self.transform.warp_mls(img, src_pts, src_pts, 256, 64)
+        np.testing.assert_allclose(warped, img, atol=1)
+
+        # the control points on the grid are moved exactly
+        dst_pts = [[0, 0], [255, 0], [255, 63], [0, 63], [100, 0], [130, 63]]
+        rdx, rdy = self.transform._calc_delta(256, 64, src_pts, dst_pts, 100)
+        for (sx, sy), (dx, dy) in zip(src_pts, dst_pts):
+            if dx in (0, 100, 200, 255) and dy in (0, 63):
+                self.assertEqual(rdx[dy, dx], sx - dx)
+                self.assertEqual(rdy[dy, dx], sy - dy)
+        # between the grid points, the deltas are interpolated
+        self.assertEqual(rdx[0, 50], 0)
+        shift = np.zeros((64, 256))
+        shift[[0, 0, 63, 63], [0, 100, 0, 100]] = 10
+        warped = self.transform._gen_img(img, shift, np.zeros_like(shift),
+                                         256, 64, 100, 1.)
+        np.testing.assert_allclose(warped[:, :100], img[:, 10:110], atol=1)
+
     def test_repr(self):
         repr_str = self.transform.__repr__()
         self.assertEqual(repr_str, 'TextRecogGeneralAug()')
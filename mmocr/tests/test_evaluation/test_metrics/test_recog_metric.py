@@ -1,9 +1,12 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import unittest
 
+import numpy as np
 from mmengine.structures import LabelData
 
-from mmocr.evaluation import CharMetric, OneMinusNEDMetric, WordMetric
+from mmocr.evaluation import (CharMetric, JerseyNumberMetric,
+                              MultiDatasetsEvaluator, OneMinusNEDMetric,
+                              WordMetric)
 from mmocr.structures import TextRecogDataSample
 
 
@@ -122,3 +125,102 @@ class TestOneMinusNED(unittest.TestCase):
         metric.process(None, self.pred)
         eval_res = metric.evaluate(size=2)
         self.assertEqual(eval_res['recog/1-N.E.D'], 0.4875)
+
+    def test_multiple_batches(self):
+        metric = OneMinusNEDMetric()
+        metric.process(None, self.pred[:1])
+        metric.process(None, self.pred[1:])
+        # one result per sample
+        self.assertEqual(len(metric.results), 2)
+        eval_res = metric.evaluate(size=2)
+        self.assertEqual(eval_res['recog/1-N.E.D'], 0.4875)
+
+
+class TestJerseyNumberMetric(unittest.TestCase):
+
+    def setUp(self):
+        self.pred = []
+        for pred, gt in [('10', '10'), ('7', '7'), ('1', '10'), ('', '-1'),
+                         ('23', '-1')]:
+            data_sample = TextRecogDataSample()
+            pred_text = LabelData()
+            pred_text.item = pred
+            data_sample.pred_text = pred_text
+            gt_text = LabelData()
+            gt_text.item = gt
+            data_sample.gt_text = gt_text
+            self.pred.append(data_sample)
+
+    def test_text2label(self):
+        self.assertEqual(JerseyNumberMetric.text2label('7'), 7)
+        self.assertEqual(JerseyNumberMetric.text2label('99'), 99)
+        self.assertEqual(JerseyNumberMetric.text2label('100'), -1)
+        self.assertEqual(JerseyNumberMetric.text2label('-1'), -1)
+        self.assertEqual(JerseyNumberMetric.text2label(''), -1)
+        self.assertEqual(JerseyNumberMetric.text2label('\u00b2'), -1)
+
+    def test_jersey_number_metric(self):
+        metric = JerseyNumberMetric()
+        metric.process(None, self.pred[:2])
+        metric.process(None, self.pred[2:])
+        eval_res = metric.evaluate(size=5)
+        self.assertEqual(eval_res['recog/jersey_acc'], 0.6)
+        # classes 10, 7 and -1 are right half, all and half of the time
+        self.assertEqual(eval_res['recog/jersey_mean_class_acc'], 0.6667)
+        confusion_matrix = metric.confusion_matrix
+        self.assertEqual(confusion_matrix.shape, (101, 101))
+        self.assertEqual(confusion_matrix.sum(), 5)
+        self.assertEqual(confusion_matrix[11, 2], 1)
+        self.assertEqual(confusion_matrix[0, 24], 1)
+        self.assertTrue(np.array_equal(confusion_matrix.sum(1)[[0, 8, 11]],
+                                       [2, 1, 2]))
+
+
+class TestRecogMetricsMultiDatasets(unittest.TestCase):
+
+    def setUp(self):
+        self.pred = []
+        for pred, gt in [('10', '10'), ('7', '7'), ('1', '10'), ('ab', 'ac')]:
+            data_sample = TextRecogDataSample()
+            pred_text = LabelData()
+            pred_text.item = pred
+            data_sample.pred_text = pred_text
+            gt_text = LabelData()
+            gt_text.item = gt
+            data_sample.gt_text = gt_text
+            self.pred.append(data_sample)
+
+    def test_multi_datasets_evaluator(self):
+        cfg = [
+            dict(type='WordMetric', mode='exact'),
+            dict(type='CharMetric'),
+            dict(type='OneMinusNEDMetric'),
+            dict(type='JerseyNumberMetric')
+        ]
+        evaluator = MultiDatasetsEvaluator(cfg, dataset_prefixes=['A', 'B'])
+        evaluator.dataset_meta = dict(cumulative_sizes=[2, 4])
+        evaluator.process(self.pred[:3])
+        evaluator.process(self.pred[3:])
+        # the last batch was padded by the sampler
+        evaluator.process(self.pred[:1])
+        eval_res = evaluator.evaluate(size=4)
+        self.assertEqual(eval_res['A/recog/word_acc'], 1.0)
+        self.assertEqual(eval_res['B/recog/word_acc'], 0.0)
+        self.assertEqual(eval_res['A/recog/char_recall'], 1.0)
+        self.assertEqual(eval_res['B/recog/char_recall'], 0.5)
+        self.assertEqual(eval_res['A/recog/1-N.E.D'], 1.0)
+        self.assertEqual(eval_res['B/recog/1-N.E.D'], 0.5)
+        self.assertEqual(eval_res['A/recog/jersey_acc'], 1.0)
+        self.assertEqual(eval_res['B/recog/jersey_acc'], 0.5)
+
+    def test_empty_results(self):
+        self.assertEqual(
+            WordMetric().compute_metrics([]),
+            dict(word_acc_ignore_case_symbol=0.0))
+        self.assertEqual(
+            CharMetric().compute_metrics([]),
+            dict(char_recall=0.0, char_precision=0.0))
+        self.assertEqual(OneMinusNEDMetric().compute_metrics([]),
+                         {'1-N.E.D': 1.0})
+        self.assertEqual(JerseyNumberMetric().compute_metrics([]),
+                         dict(jersey_acc=0.0, jersey_mean_class_acc=0.0))
@@ -119,3 +119,16 @@ class TestBaseTextDetPostProcessor(unittest.TestCase):
         keep = base_postprocessor.poly_nms(polygons, scores, 0.2)
         self.assertEqual(len(keep[0]), 1)
         self.assertTrue(np.allclose(keep[0][0], polygons[0]))
+
+        # rotated rectangles, the lower-scored duplicate is suppressed
+        polygons = [
+            np.array([0., 5., 5., 0., 10., 5., 5., 10.]),
+            np.array([20., 5., 25., 0., 30., 5., 25., 10.]),
+            np.array([0., 5., 5., 0., 10., 5., 5., 10.])
+        ]
+        scores = [0.5, 0.8, 0.9]
+        keep = base_postprocessor.poly_nms(polygons, scores, 0.5)
+        self.assertEqual(keep[0], [polygons[2].tolist(), polygons[1].tolist()])
+        self.assertEqual(keep[1], [0.9, 0.8])
+
+        self.assertEqual(base_postprocessor.poly_nms([], [], 0.5), ([], []))
@@ -8,6 +8,7 @@ from parameterized import parameterized
 
 from mmocr.models.textdet.postprocessors import DBPostprocessor
 from mmocr.structures import TextDetDataSample
+from mmocr.utils import poly2bbox
 
 
 class TestDBPostProcessor(unittest.TestCase):
@@ -54,3 +55,45 @@ class TestDBPostProcessor(unittest.TestCase):
         self.assertTrue(
             isinstance(results.pred_instances['scores'], torch.FloatTensor))
         self.assertEqual(len(results.pred_instances.scores), 0)
+
+    @parameterized.expand([('poly'), ('quad')])
+    def test_fast_mode(self, text_repr_type):
+        preds = torch.zeros(40, 60)
+        preds[5:15, 5:25] = 0.8
+        preds[20:35, 30:55] = 0.6
+        preds[20:30, 5:15] = 0.4
+        data_sample = TextDetDataSample(metainfo=dict(scale_factor=(1, 1)))
+        postprocessor = DBPostprocessor(
+            text_repr_type=text_repr_type, min_text_score=0.5)
+        fast_postprocessor = DBPostprocessor(
+            text_repr_type=text_repr_type, min_text_score=0.5, fast_mode=True)
+        results = postprocessor.get_text_instances(
+            preds, data_sample.clone()).pred_instances
+        fast_results = fast_postprocessor.get_text_instances(
+            preds, data_sample.clone()).pred_instances
+        self.assertEqual(len(fast_results.polygons), 2)
+        self.assertTrue(torch.allclose(results.scores, fast_results.scores))
+        for poly, fast_poly in zip(results.polygons, fast_results.polygons):
+            # Rectangles expand to the same boxes up to the rounding of
+            # PyClipper
+            self.assertTrue(
+                np.allclose(
+                    poly2bbox(poly), poly2bbox(fast_poly), atol=1))
+
+    def test_unclip_batch(self):
+        postprocessor = DBPostprocessor()
+        candidates = [
+            np.array([[0, 0], [10, 0], [10, 10], [0, 10]]),
+            # concave polygon falls back to PyClipper
+            np.array([[0, 0], [10, 0], [10, 10], [5, 2], [0, 10]]),
+            np.array([[0, 0], [20, 0], [20, 10], [10, 12], [0, 10]])
+        ]
+        results = postprocessor._unclip_batch(candidates)
+        self.assertEqual(len(results), 3)
+        self.assertTrue(
+            np.array_equal(results[1], postprocessor._unclip(candidates[1])))
+        for poly, expected in zip(results, map(postprocessor._unclip,
+                                                 candidates)):
+            self.assertTrue(
+                np.allclose(poly2bbox(poly), poly2bbox(expected), atol=1))
+
@@ -68,3 +68,30 @@ class TestFCEPostProcessor(unittest.TestCase):
             else:
                 self.assertEqual(results.pred_instances.polygons[0].shape,
                                  (8, ))
+
+    def test_get_text_instances_single(self):
+        postprocessor = FCEPostprocessor(
+            fourier_degree=5, num_reconstr_points=20, score_thr=0.3)
+        # two separate text regions whose pixels all predict a circle of
+        # radius 6 around themselves
+        cls_res = torch.full((4, 30, 30), -10.)
+        cls_res[[1, 3], 2:6, 2:6] = 10.
+        cls_res[[1, 3], 20:24, 18:26] = 10.
+        reg_res = torch.zeros(22, 30, 30)
+        reg_res[6] = 6.
+        polygons, scores = postprocessor._get_text_instances_single(
+            dict(cls_res=cls_res, reg_res=reg_res), scale=1)
+        self.assertEqual(len(polygons), 2)
+        self.assertEqual(len(scores), 2)
+        centers = sorted(
+            np.array(poly).reshape(-1, 2).mean(axis=0).tolist()
+            for poly in polygons)
+        self.assertTrue(2 <= centers[0][0] < 6 and 2 <= centers[0][1] < 6)
+        self.assertTrue(18 <= centers[1][0] < 26 and 20 <= centers[1][1] < 24)
+
+        # no text at all
+        polygons, scores = postprocessor._get_text_instances_single(
+            dict(cls_res=torch.full((4, 30, 30), -10.), reg_res=reg_res),
+            scale=1)
+        self.assertEqual(polygons, [])
+        self.assertEqual(scores, [])
@@ -0,0 +1,74 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from unittest import TestCase
+
+import torch
+
+from mmocr.models.textrecog.data_preprocessors import (
+    BatchColorJitter, BatchCropHeight, BatchGaussianBlur, BatchGaussianNoise,
+    BatchImageContentJitter, BatchReversePixels, BatchTextRecogGeneralAug)
+
+
+class TestBatchAugments(TestCase):
+
+    def setUp(self):
+        torch.manual_seed(0)
+        self.inputs = torch.randint(0, 256, (4, 3, 32, 100)).float()
+        self.augs = [
+            BatchTextRecogGeneralAug(prob=1),
+            BatchCropHeight(prob=1),
+            BatchImageContentJitter(prob=1, jitter_ratio=0.1),
+            BatchGaussianBlur(prob=1),
+            BatchColorJitter(prob=1),
+            BatchGaussianNoise(prob=1),
+            BatchReversePixels(prob=1)
+        ]
+
+    def test_forward(self):
+        data_samples = [object()] * len(self.inputs)
+        for aug in self.augs:
+            outputs, samples = aug(self.inputs, data_samples)
+            self.assertEqual(outputs.shape, self.inputs.shape)
+            self.assertEqual(outputs.dtype, torch.float32)
+            self.assertGreaterEqual(outputs.min(), 0)
+            self.assertLessEqual(outputs.max(), 255)
+            self.assertIs(samples, data_samples)
+            # the inputs are not modified in place
+            self.assertFalse(torch.equal(outputs, self.inputs))
+
+        # grayscale images
+        for aug in self.augs:
+            outputs, _ = aug(self.inputs[:, :1], None)
+            self.assertEqual(outputs.shape, (4, 1, 32, 100))
+
+    def test_prob(self):
+        for aug in self.augs:
+            aug.prob = 0
+            outputs, _ = aug(self.inputs, None)
+            self.assertTrue(torch.equal(outputs, self.inputs))
+
+        # each image is augmented independently
+        aug = BatchReversePixels(prob=0.5)
+        outputs, _ = aug(self.inputs.repeat(16, 1, 1, 1), None)
+        reversed = (outputs != self.inputs.repeat(16, 1, 1, 1)).flatten(1)
+        self.assertTrue(0 < reversed.any(dim=1).sum() < 64)
+
+    def test_reverse_pixels(self):
+        outputs, _ = BatchReversePixels(prob=1)(self.inputs, None)
+        self.assertTrue(torch.equal(outputs, 255 - self.inputs))
+
+    def test_color_jitter(self):
+        # identical channels stay gray without changing the brightness
+        aug = BatchColorJitter(
+            prob=1, brightness=0, contrast=0, saturation=0.5, hue=0.5)
+        gray = self.inputs[:, :1].repeat(1, 3, 1, 1)
+        outputs, _ = aug(gray, None)
+        self.assertTrue(torch.allclose(outputs, gray, atol=1e-2))
+
+    def test_small_images(self):
+        inputs = torch.rand(2, 3, 8, 8) * 255
+        for aug in [
+                BatchImageContentJitter(prob=1),
+                BatchGaussianBlur(prob=1)
+        ]:
+            outputs, _ = aug(inputs, None)
+            self.assertTrue(torch.equal(outputs, inputs))
@@ -43,6 +43,11 @@ class TestTextRecogDataPreprocessor(TestCase):
         processor = TextRecogDataPreprocessor(batch_augments=aug_cfg)
         self.assertIsInstance(processor.batch_augments, torch.nn.ModuleList)
         self.assertIsInstance(processor.batch_augments[0], Augment)
+        self.assertIsNone(processor.pixel_batch_augments)
+        processor = TextRecogDataPreprocessor(
+            pixel_batch_augments=[dict(type='BatchReversePixels', prob=1)])
+        self.assertIsInstance(processor.pixel_batch_augments,
+                              torch.nn.ModuleList)
 
     def test_forward(self):
         processor = TextRecogDataPreprocessor(mean=[0, 0, 0], std=[1, 1, 1])
@@ -111,3 +116,40 @@ class TestTextRecogDataPreprocessor(TestCase):
                 data_samples, [(10, 25), (10, 25)], [11 / 25., 24 / 25.]):
             self.assertEqual(data_sample.batch_input_shape, expected_shape)
             self.assertEqual(data_sample.valid_ratio, expected_ratio)
+
+    def test_pixel_batch_augments(self):
+        data = {
+            'inputs': [
+                torch.randint(0, 256, (3, 10, 11), dtype=torch.uint8),
+                torch.randint(0, 256, (3, 9, 14), dtype=torch.uint8)
+            ],
+            'data_samples': [
+                TextRecogDataSample(
+                    metainfo=dict(img_shape=(10, 11), valid_ratio=1.0)),
+                TextRecogDataSample(
+                    metainfo=dict(img_shape=(9, 14), valid_ratio=1.0))
+            ]
+        }
+        processor = TextRecogDataPreprocessor(
+            mean=[127.5, 127.5, 127.5],
+            std=[127.5, 127.5, 127.5],
+            bgr_to_rgb=True,
+            pad_size_divisor=4,
+            pixel_batch_augments=[dict(type='BatchReversePixels', prob=1)])
+        expected = processor(data)['inputs']
+        # the augmentations only run during training, before normalization
+        out = processor(data, training=True)
+        inputs, data_samples = out['inputs'], out['data_samples']
+        self.assertEqual(inputs.shape, (2, 3, 12, 16))
+        self.assertEqual(len(data_samples), 2)
+        for i, (h, w) in enumerate([(10, 11), (9, 14)]):
+            self.assertTrue(
+                torch.allclose(inputs[i, :, :h, :w], -expected[i, :, :h, :w]))
+        self.assertEqual(data_samples[0].batch_input_shape, (12, 16))
+
+        # the batch augmentations are applied to the returned data
+        processor = TextRecogDataPreprocessor(
+            pixel_batch_augments=[dict(type='BatchGaussianNoise', prob=1)],
+            batch_augments=[dict(type='Augment')])
+        out = processor(data, training=True)
+        self.assertEqual(out['inputs'].dtype, torch.float32)
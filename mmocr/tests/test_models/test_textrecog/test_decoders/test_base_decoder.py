@@ -3,6 +3,8 @@ import os.path as osp
 import tempfile
 from unittest import TestCase, mock
 
+import torch
+
 from mmocr.models.common.dictionary import Dictionary
 from mmocr.models.textrecog.decoders import BaseDecoder
 from mmocr.registry import MODELS, TASK_UTILS
@@ -56,6 +58,40 @@ class TestBaseDecoder(TestCase):
         self.assertIsInstance(decoder.dictionary, Dictionary)
         tmp_dir.cleanup()
 
+    def test_num_decode_steps(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        dict_file = osp.join(tmp_dir.name, 'fake_chars.txt')
+        create_dummy_dict_file(dict_file)
+        dict_cfg = dict(
+            type='Dictionary',
+            dict_file=dict_file,
+            with_start=True,
+            with_end=True,
+            same_start_end=False,
+            with_padding=True,
+            with_unknown=True)
+        decoder = BaseDecoder(dictionary=dict_cfg, max_seq_len=25)
+        self.assertEqual(decoder.num_decode_steps, 25)
+        logits = torch.rand(2, 3, decoder.dictionary.num_classes)
+        self.assertIs(decoder.mask_classes(logits), logits)
+
+        decoder = BaseDecoder(
+            dictionary=dict_cfg,
+            postprocessor=dict(
+                type='AttentionPostprocessor',
+                allowed_chars=list('0123456789'),
+                max_text_len=2),
+            max_seq_len=25)
+        self.assertEqual(decoder.num_decode_steps, 3)
+        _, max_idx = decoder.mask_classes(logits).max(-1)
+        self.assertTrue(
+            torch.all((max_idx < 10)
+                      | (max_idx == decoder.dictionary.end_idx)
+                      | (max_idx == decoder.dictionary.padding_idx)))
+        decoder.postprocessor.set_constraint()
+        self.assertEqual(decoder.num_decode_steps, 25)
+        tmp_dir.cleanup()
+
     def test_forward_train(self):
         tmp_dir = tempfile.TemporaryDirectory()
         dict_file = osp.join(tmp_dir.name, 'fake_chars.txt')
@@ -85,3 +85,24 @@ class TestMasterDecoder(TestCase):
         output = decoder.forward_test(
             feat=encoder_out, data_samples=self.data_info)
         self.assertTupleEqual(tuple(output.shape), (2, 30, 39))
+
+        # the cached decoding matches decoding the whole sequence at once
+        decoder.eval()
+        decoder.cls.bias.data[decoder.PAD] = -1e4
+        with torch.no_grad():
+            output = decoder.forward_test(
+                feat=encoder_out, data_samples=self.data_info)
+            trg_seq = torch.cat((torch.full(
+                (2, 1), decoder.SOS), output.argmax(-1)[:, :-1]), 1)
+            feat = decoder.feat_positional_encoding(
+                encoder_out.flatten(2).permute(0, 2, 1))
+            expected = decoder.softmax(
+                decoder.decode(trg_seq, feat, None,
+                               decoder.make_target_mask(trg_seq, 'cpu')))
+        end_idx = decoder.dictionary.end_idx
+        for i in range(2):
+            ends = (output[i].argmax(-1) == end_idx).nonzero()
+            length = ends[0].item() + 1 if len(ends) else 30
+            self.assertTrue(
+                torch.allclose(
+                    output[i, :length], expected[i, :length], atol=1e-5))
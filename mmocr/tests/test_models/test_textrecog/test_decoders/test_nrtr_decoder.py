@@ -88,3 +88,53 @@ class TestNRTRDecoder(TestCase):
         output = decoder.forward_test(
             out_enc=encoder_out, data_samples=self.data_info)
         self.assertTupleEqual(tuple(output.shape), (2, 40, 39))
+
+        # digits only, at most two characters and the end token
+        decoder = NRTRDecoder(
+            dictionary=dict_cfg,
+            postprocessor=dict(
+                type='AttentionPostprocessor',
+                allowed_chars=list('0123456789'),
+                max_text_len=2),
+            max_seq_len=40)
+        decoder.eval()
+        output = decoder.forward_test(
+            out_enc=encoder_out, data_samples=self.data_info)
+        self.assertTupleEqual(tuple(output.shape), (2, 3, 39))
+        data_samples = decoder.predict(
+            out_enc=encoder_out, data_samples=self.data_info)
+        for data_sample in data_samples:
+            text = data_sample.pred_text.item
+            self.assertLessEqual(len(text), 2)
+            self.assertTrue(text == '' or text.isdigit())
+
+        # the cached decoding matches decoding the whole sequence at once
+        decoder = NRTRDecoder(dictionary=dict_cfg, max_seq_len=40)
+        decoder.eval()
+        with torch.no_grad():
+            output = decoder.forward_test(
+                out_enc=encoder_out, data_samples=self.data_info)
+            self.assertTupleEqual(tuple(output.shape), (2, 40, 39))
+            trg_seq = torch.cat((torch.full(
+                (2, 1), decoder.start_idx), output.argmax(-1)), 1)
+            src_mask = decoder._get_source_mask(encoder_out, [0.9, 1.0])
+            expected = decoder.softmax(
+                decoder.classifier(
+                    decoder._attention(trg_seq, encoder_out, src_mask)))
+            end_idx = decoder.dictionary.end_idx
+            for i in range(2):
+                ends = (output[i].argmax(-1) == end_idx).nonzero()
+                length = ends[0].item() + 1 if len(ends) else 40
+                self.assertTrue(
+                    torch.allclose(
+                        output[i, :length], expected[i, :length], atol=1e-5))
+
+        # decoding stops once every sequence has ended, and the remaining
+        # steps are filled with the end token
+        decoder.classifier.bias.data[end_idx] = 1e4
+        with torch.no_grad():
+            output = decoder.forward_test(
+                out_enc=encoder_out, data_samples=self.data_info)
+        self.assertTupleEqual(tuple(output.shape), (2, 40, 39))
+        self.assertTrue((output.argmax(-1) == end_idx).all())
+        self.assertTrue(torch.equal(output[:, 1:].sum(-1), torch.ones(2, 39)))
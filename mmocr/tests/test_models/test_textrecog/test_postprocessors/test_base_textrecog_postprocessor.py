@@ -117,6 +117,45 @@ class TestBaseTextRecogPostprocessor(TestCase):
 
         tmp_dir.cleanup()
 
+    def test_mask_classes(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        dict_file = osp.join(tmp_dir.name, 'fake_chars.txt')
+        create_dummy_dict_file(dict_file)
+        dict_cfg = dict(
+            type='Dictionary',
+            dict_file=dict_file,
+            with_start=True,
+            with_end=True,
+            same_start_end=False,
+            with_padding=True,
+            with_unknown=True)
+        postprocessor = BaseTextRecogPostprocessor(dict_cfg)
+        self.assertIsNone(postprocessor.class_mask)
+        probs = torch.rand(2, 3, postprocessor.dictionary.num_classes)
+        self.assertIs(postprocessor.mask_classes(probs), probs)
+
+        with self.assertRaisesRegex(TypeError,
+                                    'allowed_chars must be list of str'):
+            BaseTextRecogPostprocessor(dict_cfg, allowed_chars=[1, 2])
+        with self.assertWarnsRegex(Warning,
+                                   'M does not exist in the dictionary'):
+            BaseTextRecogPostprocessor(dict_cfg, allowed_chars=['M'])
+
+        postprocessor = BaseTextRecogPostprocessor(
+            dict_cfg, allowed_chars=list('0123456789'))
+        dictionary = postprocessor.dictionary
+        allowed = list(range(10)) + [
+            dictionary.end_idx, dictionary.padding_idx
+        ]
+        self.assertListEqual(
+            postprocessor.class_mask.nonzero().flatten().tolist(),
+            sorted(allowed))
+        masked = postprocessor.mask_classes(probs)
+        self.assertTrue(torch.equal(masked[..., allowed], probs[...,
+                                                                allowed]))
+        self.assertTrue(torch.all(masked[..., 10:36] == float('-inf')))
+        tmp_dir.cleanup()
+
     @mock.patch(f'{__name__}.BaseTextRecogPostprocessor.get_single_prediction')
     def test_call(self, mock_get_single_prediction):
 
@@ -143,4 +182,13 @@ class TestBaseTextRecogPostprocessor(TestCase):
         dummy_output = torch.Tensor([[[1, 100, 3, 4, 5, 6, 7, 8]]])
         data_samples = postprocessor(dummy_output, data_samples)
         self.assertEqual(data_samples[0].pred_text.item, '012')
+
+        # test max_text_len
+        postprocessor = BaseTextRecogPostprocessor(
+            max_seq_len=None, dictionary=dict_cfg, max_text_len=2)
+        data_samples = postprocessor(dummy_output, data_samples)
+        self.assertEqual(data_samples[0].pred_text.item, '01')
+        self.assertEqual(data_samples[0].pred_text.score, [0.8, 0.7])
+        with self.assertRaises(ValueError):
+            postprocessor.set_constraint(max_text_len=-1)
         tmp_dir.cleanup()
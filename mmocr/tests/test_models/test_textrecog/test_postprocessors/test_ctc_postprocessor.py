@@ -1,5 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 
+import math
 import os.path as osp
 import tempfile
 from unittest import TestCase
@@ -51,6 +52,77 @@ class TestCTCPostProcessor(TestCase):
         self.assertListEqual(score, [100.0, 100.0, 100.0, 100.0])
         tmp_dir.cleanup()
 
+    def test_get_batch_prediction(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        dict_file = osp.join(tmp_dir.name, 'fake_chars.txt')
+        create_dummy_dict_file(dict_file, list('0123ab'))
+        dict_gen = Dictionary(
+            dict_file=dict_file,
+            with_start=False,
+            with_end=False,
+            with_padding=True,
+            with_unknown=False)
+        postprocessor = CTCPostProcessor(max_seq_len=None, dictionary=dict_gen)
+
+        # classes: 0, 1, 2, 3, a, b, padding
+        dummy_output = torch.Tensor([[[1, 100, 3, 4, 5, 6, 7],
+                                      [100, 2, 3, 4, 5, 6, 7],
+                                      [1, 2, 3, 4, 100, 6, 7],
+                                      [1, 2, 3, 4, 100, 6, 7],
+                                      [1, 2, 3, 4, 5, 6, 100],
+                                      [1, 2, 3, 100, 5, 6, 7]],
+                                     [[1, 2, 3, 4, 5, 6, 100],
+                                      [1, 2, 3, 4, 5, 100, 7],
+                                      [1, 2, 3, 4, 5, 6, 100],
+                                      [1, 2, 3, 4, 5, 100, 7],
+                                      [1, 2, 3, 4, 5, 100, 7],
+                                      [1, 100, 3, 4, 5, 6, 7]]])
+        data_samples = [
+            TextRecogDataSample(),
+            TextRecogDataSample(metainfo=dict(valid_ratio=0.8))
+        ]
+        results = postprocessor.get_batch_prediction(dummy_output,
+                                                     data_samples)
+        # same as the per-timestep greedy decoding
+        for probs, data_sample, result in zip(dummy_output, data_samples,
+                                              results):
+            max_value, max_idx = torch.max(probs, -1)
+            decode_len = math.ceil(
+                probs.size(0) * data_sample.get('valid_ratio', 1))
+            index, score = [], []
+            prev_idx = dict_gen.padding_idx
+            for t in range(decode_len):
+                if max_idx[t].item() not in (prev_idx,
+                                             *postprocessor.ignore_indexes):
+                    index.append(max_idx[t].item())
+                    score.append(max_value[t].item())
+                prev_idx = max_idx[t].item()
+            self.assertEqual(result, (index, score))
+        # repeats are merged, the padding is dropped and separates the
+        # repeats around it, and the steps past the valid ratio are cut
+        self.assertEqual(results[0], ([1, 0, 4, 3], [100.0] * 4))
+        self.assertEqual(results[1], ([5, 5], [100.0] * 2))
+
+        # ignored indexes are dropped
+        postprocessor = CTCPostProcessor(
+            max_seq_len=None,
+            dictionary=dict_gen,
+            ignore_chars=['padding', '0', 'a'])
+        results = postprocessor.get_batch_prediction(dummy_output,
+                                                     data_samples)
+        self.assertEqual(results[0], ([1, 3], [100.0] * 2))
+        self.assertEqual(results[1], ([5, 5], [100.0] * 2))
+
+        # constrained to digits, the letters fall back to the blank
+        postprocessor = CTCPostProcessor(
+            max_seq_len=None, dictionary=dict_gen, allowed_chars=list('0123'))
+        results = postprocessor.get_batch_prediction(dummy_output,
+                                                     data_samples)
+        self.assertListEqual(results[0][0], [1, 0, 3])
+        self.assertListEqual(results[0][1], [100.0, 100.0, 100.0])
+        self.assertEqual(results[1], ([], []))
+        tmp_dir.cleanup()
+
     def test_call(self):
         tmp_dir = tempfile.TemporaryDirectory()
         dict_file = osp.join(tmp_dir.name, 'fake_chars.txt')
@@ -6,11 +6,12 @@ import numpy as np
 import torch
 from shapely.geometry import MultiPolygon, Polygon
 
-from mmocr.utils import (boundary_iou, crop_polygon, offset_polygon, poly2bbox,
-                         poly2shapely, poly_intersection, poly_iou,
-                         poly_make_valid, poly_union, polys2shapely,
-                         rescale_polygon, rescale_polygons, shapely2poly,
-                         sort_points, sort_vertex, sort_vertex8)
+from mmocr.utils import (boundary_iou, boundary_iou_matrix,
+                         boundary_overlap_areas, crop_polygon, offset_polygon,
+                         poly2bbox, poly2shapely, poly_intersection, poly_iou,
+                         poly_iou_matrix, poly_make_valid, poly_union,
+                         polys2shapely, rescale_polygon, rescale_polygons,
+                         shapely2poly, sort_points, sort_vertex, sort_vertex8)
 
 
 class TestPolygonUtils(unittest.TestCase):
@@ -291,6 +292,22 @@ class TestPolygonUtils(unittest.TestCase):
         self.assertEqual(poly_iou(poly3, poly3, zero_division=1), 1)
         self.assertEqual(poly_iou(poly2, poly3), 0)
 
+    def test_poly_iou_matrix(self):
+        points = [0, 0, 0, 1, 1, 1, 1, 0]
+        points1 = [10, 20, 30, 40, 50, 60, 70, 80]
+        points2 = [0, 0, 0, 0, 0, 0, 0, 0]  # Invalid polygon
+        points3 = [0, 0, 0, 1, 1, 0, 1, 1]  # Self-intersected polygon
+        points4 = [0.5, 0, 1.5, 0, 1.5, 1, 0.5, 1.2, 0.4, 0.5]
+        polys = polys2shapely([points, points1, points2, points3, points4])
+
+        for zero_division in [0, 1]:
+            ious = poly_iou_matrix(polys, polys[:3], zero_division)
+            self.assertEqual(ious.shape, (5, 3))
+            for i, j in np.ndindex(ious.shape):
+                self.assertAlmostEqual(
+                    ious[i, j], poly_iou(polys[i], polys[j], zero_division))
+        self.assertEqual(poly_iou_matrix([], polys).shape, (0, 5))
+
     def test_offset_polygon(self):
         # usual case
         polygons = np.array([0, 0, 0, 1, 1, 1, 1, 0], dtype=np.float32)
@@ -329,6 +346,41 @@ class TestPolygonUtils(unittest.TestCase):
         self.assertEqual(boundary_iou(points3, points3, zero_division=1), 1)
         self.assertEqual(boundary_iou(points2, points3), 0)
 
+    def test_boundary_iou_matrix(self):
+        # axis-aligned rectangles
+        rects = [[0, 0, 2, 0, 2, 2, 0, 2], [1, 1, 1, 3, 3, 3, 3, 1],
+                 [5, 5, 6, 5, 6, 5, 5, 5], [5, 5, 6, 5, 6, 5, 5, 5]]
+        # general polygons
+        polys = [[0, 0, 2, 1, 1, 3, 0.5, 2], [0, 0, 0, 1, 1, 0, 1, 1],
+                 [1, 0, 2, 1, 1, 2, 0, 1]]
+        for src, target in [(rects, rects), (rects, polys), (polys, rects)]:
+            for zero_division in [0, 1]:
+                ious = boundary_iou_matrix(src, target, zero_division)
+                self.assertEqual(ious.shape, (len(src), len(target)))
+                for i, j in np.ndindex(ious.shape):
+                    self.assertAlmostEqual(
+                        ious[i, j],
+                        boundary_iou(src[i], target[j], zero_division))
+        self.assertEqual(boundary_iou_matrix(rects, []).shape, (4, 0))
+
+    def test_boundary_overlap_areas(self):
+        rects = [[0, 0, 2, 0, 2, 2, 0, 2], [1, 1, 1, 3, 3, 3, 3, 1]]
+        polys = [[0, 0, 2, 1, 1, 3, 0.5, 2], [1, 0, 2, 1, 1, 2, 0, 1]]
+        for src, target in [(rects, rects), (rects, polys)]:
+            inters, src_areas, target_areas = boundary_overlap_areas(
+                src, target)
+            self.assertEqual(inters.shape, (len(src), len(target)))
+            for i, j in np.ndindex(inters.shape):
+                self.assertAlmostEqual(
+                    inters[i, j],
+                    poly_intersection(
+                        poly2shapely(src[i]), poly2shapely(target[j])))
+            self.assertTrue(
+                np.allclose(src_areas, [poly2shapely(p).area for p in src]))
+            self.assertTrue(
+                np.allclose(target_areas,
+                            [poly2shapely(p).area for p in target]))
+
     def test_sort_points(self):
         points = np.array([[1, 1], [0, 0], [1, -1], [2, -2], [0, 2], [1, 1],
                            [0, 1], [-1, 1], [-1, -1]])
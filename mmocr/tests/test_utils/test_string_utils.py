@@ -1,7 +1,8 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import numpy as np
 import pytest
 
-from mmocr.utils import StringStripper
+from mmocr.utils import StringStripper, batch_edit_distance
 
 
 def test_string_strip():
@@ -33,3 +34,11 @@ def test_string_strip():
         StringStripper(strip='strip')
         StringStripper(strip_pos='head')
         StringStripper(strip_str=['\n', '\t'])
+
+
+def test_batch_edit_distance():
+    preds = ['', 'abc', 'kitten', 'hello', '', '10']
+    gts = ['', '', 'sitting', 'hello', 'abc', '1']
+    assert np.array_equal(
+        batch_edit_distance(preds, gts), np.array([0, 3, 3, 0, 3, 1]))
+    assert batch_edit_distance([], []).shape == (0, )
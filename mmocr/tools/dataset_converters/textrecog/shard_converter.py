@@ -0,0 +1,55 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import os.path as osp
+
+import mmengine
+
+from mmocr.datasets.preparers.dumpers import TextRecogShardDumper
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Pack the images of an MMOCR textrecog annotation file '
+        'into memory-mappable shards for RecogShardDataset')
+    parser.add_argument(
+        'ann_file',
+        type=str,
+        help='Path to the MMOCR textrecog JSON annotation file, whose '
+        'img_path entries are relative to its directory')
+    parser.add_argument(
+        '--split',
+        type=str,
+        default='train',
+        help='Split name, the shards are written to '
+        'textrecog_{split}.shards next to the annotation file')
+    parser.add_argument(
+        '--storage',
+        default='encoded',
+        choices=['encoded', 'raw'],
+        help='Keep the encoded image bytes, or store decoded uint8 pixels')
+    parser.add_argument(
+        '--img-scale',
+        type=int,
+        nargs=2,
+        default=None,
+        metavar=('WIDTH', 'HEIGHT'),
+        help='Resize the images before storing them, only with raw storage')
+    parser.add_argument(
+        '--shard-size',
+        type=int,
+        default=1073741824,
+        help='Maximum number of bytes in a shard, defaults to 1 GB')
+    args = parser.parse_args()
+
+    dumper = TextRecogShardDumper(
+        task='textrecog',
+        split=args.split,
+        data_root=osp.dirname(osp.abspath(args.ann_file)),
+        storage=args.storage,
+        img_scale=args.img_scale,
+        shard_size=args.shard_size)
+    dumper(mmengine.load(args.ann_file))
+
+
+if __name__ == '__main__':
+    main()
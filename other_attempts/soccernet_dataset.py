@@ -1,5 +1,6 @@
 import os
 import json
+import struct
 import torch
 from torch.utils.data import Dataset, DataLoader
 from PIL import Image
@@ -17,6 +18,13 @@ class soccernet_dataset(Dataset):
 
         assert len(self.vid_names) == len(self.gt)
 
+        # precomputed frame sizes (see generate_all_frame_sizes), optional
+        sizes_file = os.path.join(root_dir, mode, "sizes.json")
+        self.sizes = None
+        if os.path.exists(sizes_file):
+            with open(sizes_file) as f:
+                self.sizes = json.load(f)
+
     def __len__(self):
         return len(self.vid_names)
 
@@ -33,12 +41,18 @@ class soccernet_dataset(Dataset):
             # frame = read_image(frame_path)
             # frames.append(frame)
         return frame_paths, self.gt[vid_name]
-<<<<<<< HEAD
 
     def get_dataset_dir(self):
         return self.vid_dir
-=======
->>>>>>> b11a05adc516705c385bfdfd9080020049f79c4a
+
+    # (H, W) of every frame in the video, in the same order as __getitem__
+    # uses the precomputed sizes.json if it exists, otherwise only reads the image headers
+    def get_frame_sizes(self, idx):
+        vid_name = self.vid_names[idx]
+        if self.sizes is not None and vid_name in self.sizes:
+            return [tuple(size) for size in self.sizes[vid_name]]
+        frame_paths, _ = self[idx]
+        return [get_image_size(path) for path in frame_paths]
 
 
 # images will not be in order
@@ -108,4 +122,52 @@ def generate_all_file_names(data_dir, output_file):
         frame_paths_per_vid[vid_name] = frame_names
     
     with open(output_file, 'w') as f:
-        json.dump(frame_paths_per_vid, f)
\ No newline at end of file
+        json.dump(frame_paths_per_vid, f)
+
+# reads the (H, W) of a jpg or png from the file header without decoding any pixels
+def get_image_size(path):
+    with open(path, 'rb') as f:
+        head = f.read(24)
+        if head.startswith(b'\x89PNG\r\n\x1a\n'):
+            # the IHDR chunk always comes first: width, height as big endian uint32
+            w, h = struct.unpack('>II', head[16:24])
+            return h, w
+        if head.startswith(b'\xff\xd8'):
+            f.seek(2)
+            while True:
+                byte = f.read(1)
+                while byte and byte != b'\xff':
+                    byte = f.read(1)
+                while byte == b'\xff':     # markers can be padded with 0xff fill bytes
+                    byte = f.read(1)
+                if not byte:
+                    break
+                marker = byte[0]
+                if marker == 0xd8 or 0xd0 <= marker <= 0xd7 or marker == 0x01:
+                    continue    # standalone markers, no length field
+                length = struct.unpack('>H', f.read(2))[0]
+                # start of frame markers hold the image size, except DHT, JPG and DAC
+                if 0xc0 <= marker <= 0xcf and marker not in (0xc4, 0xc8, 0xcc):
+                    _, h, w = struct.unpack('>BHH', f.read(5))
+                    return h, w
+                f.seek(length - 2, os.SEEK_CUR)
+    # other formats, PIL also only parses the header until the pixels are accessed
+    with Image.open(path) as img:
+        w, h = img.size
+    return h, w
+
+
+# generate_all_frame_sizes('./data/test/images', './data/test/sizes.json')
+# the keys and frame order match frames.json from generate_all_file_names
+def generate_all_frame_sizes(data_dir, output_file):
+    frame_sizes_per_vid = {}
+    vid_names = [f for f in os.listdir(data_dir) if not f.startswith(".") and not f.endswith(".json")]
+    vid_names = sorted(vid_names, key=lambda x: int(x))
+    for vid_name in vid_names:
+        vid_dir = os.path.join(data_dir, vid_name)
+        frame_names = [f for f in os.listdir(vid_dir) if not f.startswith(".")]
+        frame_names = sorted(frame_names, key=lambda x: int(x.split('.')[0].split('_')[1]))
+        frame_sizes_per_vid[vid_name] = [get_image_size(os.path.join(vid_dir, f)) for f in frame_names]
+
+    with open(output_file, 'w') as f:
+        json.dump(frame_sizes_per_vid, f)
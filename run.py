@@ -11,15 +11,19 @@ import torch
 import matplotlib.pyplot as plt
 import torch.nn as nn
 import torch.optim as optim
-from mmocr.apis import MMOCRInferencer, TextDetInferencer, TextRecInferencer
+from mmocr.apis import MMOCRInferencer, TextDetInferencer, TextRecInferencer, TextRecEnsembleInferencer
 from torch.utils.data import DataLoader
 import cv2
 import scipy
 import numpy as np
 import os, shutil
 import json
+import queue
+import threading
+import time
 from tqdm import tqdm
-from collections import defaultdict
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from soccernet_dataset import soccernet_dataset, soccernet_dataset_flat, generate_all_file_names
 
 #%% heuristic rules
@@ -59,6 +63,207 @@ def get_weighted_most_frequent_number(numbers):
     most_frequent_num = max(weights, key=weights.get)
     return most_frequent_num
 
+class StreamingVote:
+    """
+    collects the recognized numbers of a tracklet chunk by chunk, so we can stop
+    processing frames once more of them are unlikely to change the vote
+    min_votes: the weighted rule needs this many votes, otherwise it predicts -1
+    z_bound: how many standard deviations the leader must be ahead of the runner up
+    max_empty_chunks: give up (-1) after this many chunks without a single legible number
+    """
+    def __init__(self, min_votes, z_bound, max_empty_chunks):
+        self.min_votes = min_votes
+        self.z_bound = z_bound
+        self.max_empty_chunks = max_empty_chunks
+        self.numbers = []
+        self.num_chunks = 0
+
+    def update(self, numbers):
+        self.numbers.extend(numbers)
+        self.num_chunks += 1
+
+    def is_settled(self):
+        if len(self.numbers) < self.min_votes:
+            return False
+        counts = Counter(self.numbers).most_common(2)
+        n1 = counts[0][1]
+        n2 = counts[1][1] if len(counts) > 1 else 0
+        # sign test between the two most frequent numbers, and the weighted rule has to agree
+        z = (n1 - n2) / np.sqrt(n1 + n2)
+        return z > self.z_bound and get_weighted_most_frequent_number(self.numbers) == counts[0][0]
+
+    def is_illegible(self):
+        return not self.numbers and self.num_chunks >= self.max_empty_chunks
+
+    def result(self):
+        predictions = np.array(self.numbers)
+        
+        final_prediction = scipy.stats.mode(predictions, axis=None, keepdims=False)[0]
+        if np.isnan(final_prediction):
+            final_prediction = -1
+
+        if len(predictions) < self.min_votes:
+            final_prediction_wt = -1
+        else:
+            final_prediction_wt = get_weighted_most_frequent_number(predictions)
+        return final_prediction, final_prediction_wt, predictions
+
+
+#%% frame decoding
+def load_frames(frame_paths):
+    # decode every frame of a video exactly once, the decoded frames are shared by
+    # the detector, the soccer ball shortcut and the cropping below.
+    # same flags as the detector's LoadImageFromFile(color_type='color_ignore_orientation')
+    return [cv2.imread(path, cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION) for path in frame_paths]
+
+
+#%% keyframe selection
+def load_thumbnail(path):
+    # jpeg can decode straight to 1/4 scale, much cheaper than a full decode
+    return cv2.imread(path, cv2.IMREAD_REDUCED_GRAYSCALE_4 | cv2.IMREAD_IGNORE_ORIENTATION)
+
+def select_keyframes(thumbnails, hash_threshold, frame_budget=0, by_sharpness=False):
+    """
+    thumbnails: small grayscale frames of a video, in order
+    hash_threshold: keep a frame once the difference hash has changed by this many bits
+        (summed over consecutive frames) since the last kept frame, 0 keeps every frame
+    frame_budget: max number of frames to keep, 0 for no limit
+    by_sharpness: fill the budget with the sharpest frames instead of evenly spaced ones
+    returns: sorted indices of the frames to keep
+    """
+    # 64 bit difference hash of every frame, (N, 8, 9) -> (N, 64)
+    small = np.stack([cv2.resize(t, (9, 8), interpolation=cv2.INTER_AREA) for t in thumbnails]).astype(np.int16)
+    hashes = (small[:, :, 1:] > small[:, :, :-1]).reshape(len(thumbnails), -1)
+    # hamming distance between consecutive frames, a new keyframe every hash_threshold bits of change
+    dists = np.concatenate([[0], np.count_nonzero(hashes[1:] != hashes[:-1], axis=1)])
+    if hash_threshold > 0:
+        segment = np.cumsum(dists) // hash_threshold
+        keep = np.flatnonzero(np.concatenate([[True], segment[1:] != segment[:-1]]))
+    else:
+        keep = np.arange(len(thumbnails))
+
+    if frame_budget and len(keep) > frame_budget:
+        if by_sharpness:
+            sharpness = np.array([cv2.Laplacian(thumbnails[i], cv2.CV_32F).var() for i in keep])
+            keep = np.sort(keep[np.argsort(-sharpness, kind='stable')[:frame_budget]])
+        else:
+            keep = keep[np.linspace(0, len(keep) - 1, frame_budget).round().astype(int)]
+    return keep
+
+
+#%% crop ranking
+# weights of the sharpness, contrast, size, aspect ratio and detection score cues
+CROP_QUALITY_WEIGHTS = np.array([1.0, 0.5, 0.5, 0.5, 1.0])
+
+def crop_quality(crops, det_scores):
+    """
+    crops: BGR crops of a tracklet
+    det_scores: detection score of each crop
+    returns: quality of each crop, higher is better. every cue is replaced by its rank
+        within the tracklet, so the cues are comparable whatever their scale
+    """
+    grays = [cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) for crop in crops]
+    sharpness = [cv2.Laplacian(gray, cv2.CV_32F).var() for gray in grays]
+    contrast = [gray.std() for gray in grays]
+    size = [min(crop.shape[:2]) for crop in crops]
+    # the numbers are about as wide as tall, flat or thin crops are usually partial detections
+    aspect = [-abs(np.log(crop.shape[1] / crop.shape[0])) for crop in crops]
+    cues = np.array([sharpness, contrast, size, aspect, det_scores], dtype=np.float64)
+    ranks = scipy.stats.rankdata(cues, axis=1) / len(crops)
+    return CROP_QUALITY_WEIGHTS @ ranks
+
+def rank_crops(crops, det_scores, top_k):
+    # sort the crops by quality and keep the top_k best, 0 keeps all of them
+    order = np.argsort(-crop_quality(crops, det_scores), kind='stable')
+    if top_k:
+        order = order[:top_k]
+    return [crops[i] for i in order], [det_scores[i] for i in order]
+
+
+#%% batched detection
+def get_aspect_bucket(shape, bucket_width):
+    # the detector resizes with keep_ratio, so frames with a similar aspect ratio
+    # end up with a similar padded shape and can share a batch without much padding
+    h, w = shape[:2]
+    return int(round(np.log(w / h) / bucket_width))
+
+def batched_detection(det_infer, videos, batch_size, bucket_width):
+    """
+    videos: list of decoded frame lists (BGR ndarrays), one per video
+    returns: list of detection predictions per video, aligned with the frames
+    """
+    buckets = defaultdict(list)     # bucket -> [(video idx, frame idx)]
+    for vid_i, frames in enumerate(videos):
+        for frame_i, frame in enumerate(frames):
+            buckets[get_aspect_bucket(frame.shape, bucket_width)].append((vid_i, frame_i))
+
+    results = [[None] * len(frames) for frames in videos]
+    for bucket in sorted(buckets.keys()):
+        entries = iter(buckets[bucket])
+        # ndarray inputs go through LoadImageFromNDArray, so nothing is decoded again.
+        # the frames are fed lazily and the predictions scattered back to their videos
+        # batch by batch, so the detector never holds more than a batch of them
+        frames = (videos[vid_i][frame_i] for vid_i, frame_i in buckets[bucket])
+        for batch_res in det_infer.stream(frames, batch_size=batch_size):
+            for pred, (vid_i, frame_i) in zip(batch_res['predictions'], entries):
+                results[vid_i][frame_i] = pred
+    return results
+
+
+#%% checkpointing
+# every finished video is appended to preds.jsonl and fsync'd right away, so a crash
+# loses at most the videos in flight. preds.json (the submission) is compacted from it
+def load_results_log(log_path):
+    records = {}
+    if os.path.exists(log_path):
+        with open(log_path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue    # line cut off by a crash, that video simply reruns
+                records[record['video']] = record
+    return records
+
+def open_results_log(log_path):
+    log_file = open(log_path, 'a+')
+    # a crash can leave a partial last line, start the next record on a fresh line
+    if log_file.tell() > 0:
+        log_file.seek(log_file.tell() - 1)
+        if log_file.read(1) != '\n':
+            log_file.write('\n')
+    return log_file
+
+def append_result(log_file, record):
+    log_file.write(json.dumps(record) + '\n')
+    log_file.flush()
+    os.fsync(log_file.fileno())
+
+def compact_results(records, checkpoint_path):
+    output_json = {video: record['pred'] for video, record in sorted(records.items(), key=lambda x: int(x[0]))}
+    tmp_path = checkpoint_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(output_json, f)
+    os.replace(tmp_path, checkpoint_path)   # never leave a half written submission behind
+
+
+
+#%% sharding
+def get_shard_paths(output_dir, shard_index, num_shards):
+    # each shard writes its own log and submission so that shards never touch the same file
+    if num_shards == 1:
+        return os.path.join(output_dir, "preds.json"), os.path.join(output_dir, "preds.jsonl")
+    name = f"preds-shard{shard_index}of{num_shards}"
+    return os.path.join(output_dir, f"{name}.json"), os.path.join(output_dir, f"{name}.jsonl")
+
+def merge_shards(output_dir, num_shards):
+    records = {}
+    for shard_index in range(num_shards):
+        _, shard_log_path = get_shard_paths(output_dir, shard_index, num_shards)
+        records.update(load_results_log(shard_log_path))
+    compact_results(records, os.path.join(output_dir, "preds.json"))
+    return records
+
 
 #%%
 
@@ -73,11 +278,42 @@ parser.add_argument('--det_config_path', default='mmocr/configs/textdet/fcenet/f
 parser.add_argument('--det_weights_path', default='mmocr/jocelyn-output/fce_epoch_10.pth', type=str, help='weights for the finetuned detector')
 parser.add_argument('--rec_config_path', default='mmocr/soccernet-svtr-genL-combined/svtr-small_20e_soccernet_gen.py', type=str, help='python file which defines architecture and training configurations')
 parser.add_argument('--rec_weights_path', default='mmocr/soccernet-svtr-genL-combined/epoch_10.pth', type=str, help='weights for the finetuned recognitor')
+parser.add_argument('--digits_only', action='store_true', help='constrain every recognizer to decode numbers of at most two digits. decoding stops after the first two, so a read of "123" votes 12, unlike the unconstrained vote which keeps the last two digits (23)')
+parser.add_argument('--det_batch_size', default=16, type=int, help='number of frames in each detection batch')
+parser.add_argument('--det_videos_per_batch', default=8, type=int, help='number of videos whose frames are packed together for detection')
+parser.add_argument('--det_bucket_width', default=0.25, type=float, help='width of the log aspect ratio buckets used to group frames of similar shape')
+parser.add_argument('--det_fast_postprocess', action='store_true', help='score and unclip all DBNet candidates of a frame in a batch (fast_mode of DBPostprocessor)')
+parser.add_argument('--rec_batch_size', default=32, type=int, help='number of crops in each recognition batch')
+parser.add_argument('--rec_top_k', default=[0], type=int, nargs='+', help='max crops per chunk sent to recognition, ranked by crop quality. a chunk is the whole tracklet unless --early_exit or --max_chunk_frames split it, in which case k applies to every chunk and the crops per tracklet are not capped. one value for all recognizers or one per recognizer, 0 for no limit')
+parser.add_argument('--num_loader_workers', default=4, type=int, help='number of threads decoding frames ahead of the detector')
+parser.add_argument('--queue_size', default=16, type=int, help='max number of videos waiting between two pipeline stages')
+parser.add_argument('--early_exit', action='store_true', help='stop processing a video once its vote is settled')
+parser.add_argument('--chunk_size', default=20, type=int, help='frames per chunk when voting with --early_exit')
+parser.add_argument('--early_exit_videos', default=16, type=int, help='with --early_exit, number of videos whose chunks are interleaved, each video has one chunk in flight at a time')
+parser.add_argument('--early_exit_z', default=3.0, type=float, help='a vote is settled once the leading number is this many standard deviations ahead')
+parser.add_argument('--max_empty_chunks', default=5, type=int, help='predict -1 after this many chunks without any legible number')
+parser.add_argument('--max_chunk_frames', default=0, type=int, help='without --early_exit, split long videos into chunks of at most this many frames to bound memory, 0 for whole videos')
+parser.add_argument('--det_cache', default=None, type=str, help='sqlite file caching detections by frame content and detector, reused across runs and shards')
+parser.add_argument('--keyframes', action='store_true', help='skip near duplicate frames before detection')
+parser.add_argument('--keyframe_threshold', default=8, type=int, help='bits of difference hash change between two kept frames')
+parser.add_argument('--frame_budget', default=0, type=int, help='max frames per video sent to the detector, 0 for no limit')
+parser.add_argument('--select_by_sharpness', action='store_true', help='fill the frame budget with the sharpest frames')
+parser.add_argument('--shard_index', default=0, type=int, help='which shard of the videos this process runs')
+parser.add_argument('--num_shards', default=1, type=int, help='number of shards the videos are split into, see run_sharded.py')
+parser.add_argument('--merge_shards', action='store_true', help='merge the outputs of all shards into preds.json and exit')
 
 args = parser.parse_args()
+assert 0 <= args.shard_index < args.num_shards
+
+if args.merge_shards:
+    records = merge_shards(args.output_dir, args.num_shards)
+    print(f"Merged {len(records)} videos from {args.num_shards} shards into {os.path.join(args.output_dir, 'preds.json')}")
+    exit()
 
 # toggle between INFO, DEBUG
 logfile = f"logs/soccernet-{os.getenv('SLURM_JOB_ID')}-info.log"
+if args.num_shards > 1:
+    logfile = f"logs/soccernet-{os.getenv('SLURM_JOB_ID')}-shard{args.shard_index}of{args.num_shards}-info.log"
 logging.basicConfig(filename=logfile,
     format='%(asctime)s %(message)s', 
     level=logging.DEBUG)
@@ -96,7 +332,12 @@ logger.info(f"Num videos in test dataset: {len(test_dataset)}")
 
 #%%
 
-det_infer = TextDetInferencer(model=args.det_config_path, weights=args.det_weights_path, device=device)
+det_infer = TextDetInferencer(model=args.det_config_path, weights=args.det_weights_path, device=device, cache_path=args.det_cache)
+if args.det_fast_postprocess:
+    # only the DBNet / DBNet++ postprocessor has a batched mode
+    postprocessor = det_infer.model.det_head.postprocessor
+    assert hasattr(postprocessor, 'fast_mode'), f"{type(postprocessor).__name__} has no fast_mode"
+    postprocessor.fast_mode = True
 
 # one single recognizer
 # rec_infer = TextRecInferencer(model=args.rec_config_path, weights=args.rec_weights_path, device=device)
@@ -104,99 +345,325 @@ det_infer = TextDetInferencer(model=args.det_config_path, weights=args.det_weigh
 
 # emsemble learning
 recognizer_names = ['svtr-small', 'NRTR', 'SATRN_sm', 'SAR', 'ABINet']
-recognizers = [TextRecInferencer(model=name) for name in recognizer_names]
-
-correct = []
-weighted_correct = []
-
-checkpoint_path = os.path.join(args.output_dir, "preds.json")
-if not args.restart_inference and os.path.exists(checkpoint_path):
-    with open(checkpoint_path, 'r') as f:
-        output_json = json.load(f)
+# crops are preprocessed once per distinct pipeline and the recognizers run concurrently
+recognizers = TextRecEnsembleInferencer(recognizer_names)
+assert len(args.rec_top_k) in (1, len(recognizer_names)), f"--rec_top_k takes 1 or {len(recognizer_names)} values"
+rec_top_k = args.rec_top_k * len(recognizer_names) if len(args.rec_top_k) == 1 else args.rec_top_k
+if args.digits_only:
+    # jersey numbers are 0-99: mask out the letters and stop decoding after two digits.
+    # the constraint keeps the leading digits on purpose, autoregressive decoders can't
+    # know the last two before they stop, so this intentionally differs from [-2:] in get_numbers
+    for rec_infer in recognizers.inferencers:
+        rec_infer.model.decoder.postprocessor.set_constraint(list('0123456789'), max_text_len=2)
+
+checkpoint_path, log_path = get_shard_paths(args.output_dir, args.shard_index, args.num_shards)
+if args.restart_inference:
+    records = {}
+    open(log_path, 'w').close()
 else:
-    output_json = {}
-already_ran = len(output_json.keys())
-idx_to_use = range(already_ran, len(test_dataset))
-subset = torch.utils.data.Subset(test_dataset, idx_to_use)
-
-for video_idx, (frame_paths, gt) in enumerate(subset, start=already_ran):
-    predictions = []
-    result = det_infer(frame_paths, out_dir=args.output_dir, save_vis=False, return_vis=False)
-    idx_to_rec = []
-    cropped_imgs = []
-
-    shapes = []
-    for path in frame_paths:
-        img = cv2.imread(path)
-        shapes.append(img.shape[0])
-        shapes.append(img.shape[1])
-
-    print("Video", video_idx, "average shape:", sum(shapes)/len(shapes))
-    if sum(shapes) / len(shapes) < 50: # if the frame is very small, it's likely to be the soccer ball, so we output 1
-        final_prediction = 1
-        final_prediction_wt = 1
-        logger.info(f"Video: {video_idx}, soccer ball shortcut prediction as 1")
-    else:
+    records = load_results_log(log_path)
+    if not records and os.path.exists(checkpoint_path):
+        # resuming from a preds.json written before the results log existed
+        with open(checkpoint_path, 'r') as f:
+            for video, pred in json.load(f).items():
+                records[video] = dict(video=video, pred=pred)
+        with open_results_log(log_path) as f:
+            for record in records.values():
+                append_result(f, record)
+
+# the accuracy also counts the videos from the previous runs
+correct = [r['pred_mode'] == r['gt'] for r in records.values() if 'gt' in r]
+weighted_correct = [r['pred'] == r['gt'] for r in records.values() if 'gt' in r]
+
+# resume by set difference, the order in which videos finished doesn't matter.
+# videos are dealt round robin to the shards, which balances long and short videos
+idx_to_use = [idx for idx in range(len(test_dataset)) if idx % args.num_shards == args.shard_index and str(idx) not in records]
+logger.info(f"Resuming with {len(records)} videos done, {len(idx_to_use)} to go")
+
+def is_soccer_ball(frame_sizes):
+    # if the frame is very small, it's likely to be the soccer ball
+    shapes = [side for size in frame_sizes for side in size]
+    return sum(shapes) / len(shapes) < 50
+
+
+#%% pipeline stages
+# loader workers -> detector -> cropper -> recognizer -> aggregator, connected by bounded
+# queues so that decoding the next videos overlaps with inference on the current ones.
+# every stage is a generator over the items of the previous stage. the items are chunks
+# of a video (the whole video unless --early_exit), tagged with whether they are the last one
+STOP = object()
+FLUSH = object()    # sent by the loader when it waits for votes, the detector runs what it has
+queue_sizes = defaultdict(list)     # queue name -> sampled depths
+stage_times = defaultdict(float)    # stage name -> seconds spent working
+finished_videos = set()             # videos the aggregator is done with, their chunks are dropped
+voted_chunks = defaultdict(int)     # video idx -> number of chunks the aggregator voted on
+vote_cond = threading.Condition()   # guards the two above, notified on every vote
+num_video_chunks = {}               # video idx -> number of chunks the loader made
+frame_counts = defaultdict(int)     # 'total' / 'kept' / 'to_detect' / 'detected' frames of the non soccer ball videos
+
+def plan_video(dataset, video_idx, executor, chunk_size):
+    # returns the gt and the frame paths of every chunk, or None for the chunks of a soccer ball
+    frame_paths, gt = dataset[video_idx]
+    # the frame sizes come from the image headers (or sizes.json), so soccer balls
+    # are caught before anything is decoded or sent to the detector
+    frame_sizes = dataset.get_frame_sizes(video_idx)
+    print("Video", video_idx, "average shape:", np.mean(frame_sizes))
+    if is_soccer_ball(frame_sizes):
+        return gt, None
+    if args.keyframes or args.frame_budget:
+        thumbnails = list(executor.map(load_thumbnail, frame_paths))
+        keep = select_keyframes(thumbnails, args.keyframe_threshold if args.keyframes else 0, args.frame_budget, args.select_by_sharpness)
+        logger.info(f"Video: {video_idx}, kept {len(keep)}/{len(frame_paths)} frames, skipped {len(frame_paths) - len(keep)}")
+        frame_counts['total'] += len(frame_paths)
+        frame_paths = [frame_paths[i] for i in keep]
+        frame_counts['kept'] += len(frame_paths)
+    frame_counts['to_detect'] += len(frame_paths)
+    chunk_size = chunk_size or len(frame_paths)
+    chunks = [frame_paths[start:start + chunk_size] for start in range(0, len(frame_paths), chunk_size)]
+    num_video_chunks[video_idx] = len(chunks)
+    return gt, chunks
+
+def load_stage(dataset, indices):
+    # decode the videos on a pool of threads (cv2 releases the GIL)
+    # every chunk is decoded, detected and cropped on its own, so the chunk size bounds
+    # the frames in memory whatever the tracklet length
+    chunk_size = args.chunk_size if args.early_exit else (args.max_chunk_frames or None)
+    with ThreadPoolExecutor(max_workers=args.num_loader_workers) as executor:
+        pending = deque()
+        if not args.early_exit:
+            # the videos are kept in order, each one chunk after the other
+            for video_idx in indices:
+                gt, chunks = plan_video(dataset, video_idx, executor, chunk_size)
+                if chunks is None:
+                    pending.append((video_idx, True, None, gt))
+                for k, chunk_paths in enumerate(chunks or []):
+                    pending.append((video_idx, k == len(chunks) - 1, executor.submit(load_frames, chunk_paths), gt))
+                    while len(pending) > args.num_loader_workers:
+                        yield resolve_loaded(pending.popleft())
+                while len(pending) > args.num_loader_workers:
+                    yield resolve_loaded(pending.popleft())
+        else:
+            # a video only gets its next chunk once the aggregator has voted on the previous
+            # one, so the chunks after its vote settles are never decoded nor detected.
+            # the chunks of --early_exit_videos videos are interleaved to keep the batches full
+            videos = iter(indices)
+            active = {}     # video idx -> [gt, chunks not released yet, number of chunks released]
+            exhausted = False
+            while True:
+                while not exhausted and len(active) < args.early_exit_videos:
+                    video_idx = next(videos, None)
+                    if video_idx is None:
+                        exhausted = True
+                    else:
+                        gt, chunks = plan_video(dataset, video_idx, executor, chunk_size)
+                        if chunks is None:
+                            pending.append((video_idx, True, None, gt))
+                        else:
+                            active[video_idx] = [gt, deque(chunks), 0]
+                with vote_cond:
+                    for video_idx in [v for v in active if v in finished_videos]:
+                        del active[video_idx]
+                    ready = [v for v, (_, _, released) in active.items() if voted_chunks[v] == released]
+                for video_idx in ready:
+                    gt, chunks, released = active[video_idx]
+                    chunk_paths = chunks.popleft()
+                    pending.append((video_idx, not chunks, executor.submit(load_frames, chunk_paths), gt))
+                    active[video_idx][2] += 1
+                    if not chunks:
+                        del active[video_idx]   # the last chunk needs no vote to go on
+                while len(pending) > args.num_loader_workers:
+                    yield resolve_loaded(pending.popleft())
+                if ready:
+                    continue
+                if exhausted and not active:
+                    break
+                # every active video waits for a vote: hand over what is decoded and
+                # let the detector run on a partial batch rather than wait for a full one
+                while pending:
+                    yield resolve_loaded(pending.popleft())
+                yield FLUSH
+                with vote_cond:
+                    vote_cond.wait_for(lambda: any(v in finished_videos or voted_chunks[v] == released
+                                                   for v, (_, _, released) in active.items()))
+        while pending:
+            yield resolve_loaded(pending.popleft())
+
+def resolve_loaded(item):
+    video_idx, is_last, frames, gt = item
+    return video_idx, is_last, frames.result() if frames is not None else [], gt
+
+def detect_stage(chunks):
+    # pack the frames of several videos into the same detection batches,
+    # then hand the videos back one at a time along with their detections
+    def detect(video_chunk):
+        video_chunk = [c for c in video_chunk if c[0] not in finished_videos]
+        frame_counts['detected'] += sum(len(c[2]) for c in video_chunk)
+        return zip(video_chunk, batched_detection(det_infer, [c[2] for c in video_chunk], args.det_batch_size, args.det_bucket_width))
+    video_chunk = []
+    for chunk in chunks:
+        if chunk is not FLUSH:
+            video_chunk.append(chunk)
+        if len(video_chunk) == args.det_videos_per_batch or (chunk is FLUSH and video_chunk):
+            yield from detect(video_chunk)
+            video_chunk = []
+    if video_chunk:
+        yield from detect(video_chunk)
+
+def crop_stage(chunks):
+    for (video_idx, is_last, frames, gt), det_preds in chunks:
+        cropped_imgs = []
         det_scores_kept = []
-        for idx, pred in enumerate(result['predictions']):
+        for idx, pred in enumerate(det_preds):
             if len(pred['scores']) > 0:
                 
                 if pred['scores'][0] > args.det_threshold:
                     bounding_box = pred['polygons']
                     
-                    img = cv2.imread(frame_paths[idx])
+                    img = frames[idx]
                     bounding_box = [int(i) for i in bounding_box[0]]
                     cropped_image = img[bounding_box[3]:bounding_box[1], bounding_box[0]:bounding_box[4]]
                     if cropped_image.shape[0] > 10 and cropped_image.shape[1] > 10:
-                        cropped_imgs.append(cropped_image)
+                        # copy so the decoded frames can be freed
+                        cropped_imgs.append(cropped_image.copy())
                         det_scores_kept.append(pred['scores'][0])
-
-        for i, rec_infer in enumerate(recognizers):
-            print(recognizer_names[i])
-            rec_result = rec_infer(cropped_imgs, out_dir=args.output_dir, save_vis=False, return_vis=False)
-            rec_result = rec_result['predictions']
-
-            for i, pred_rec in enumerate(rec_result):
-                text = pred_rec['text']
-                rec_score = pred_rec['scores']
-                # print("det score", det_scores_kept[i], "rec score", rec_score, text)
-                if rec_score > args.rec_threshold and text.isnumeric():
-                    if len(str(text)) > 2:
-                        predictions.append(int(str(text)[-2:]))
-                    else:
-                        predictions.append(int(text))
-                
-        predictions = np.array(predictions)
-        
-        final_prediction = scipy.stats.mode(predictions, axis=None, keepdims=False)[0]
-        if np.isnan(final_prediction):
-            final_prediction = -1
-
-        if len(predictions) < 5 * len(recognizers):
-            final_prediction_wt = -1
-        else:
-            final_prediction_wt = get_weighted_most_frequent_number(predictions)
-
+        if any(rec_top_k) and cropped_imgs:
+            # best crops first, so each recognizer can take the top k it needs
+            num_crops = len(cropped_imgs)
+            cropped_imgs, det_scores_kept = rank_crops(cropped_imgs, det_scores_kept, 0 if 0 in rec_top_k else max(rec_top_k))
+            logger.debug(f"Video: {video_idx}, ranked {num_crops} crops, kept {len(cropped_imgs)}")
+        # frames are empty for the soccer ball shortcut
+        yield video_idx, is_last, gt, bool(frames), cropped_imgs, det_scores_kept
+
+def recognize_stage(chunks):
+    for video_idx, is_last, gt, has_frames, cropped_imgs, det_scores_kept in chunks:
+        if video_idx in finished_videos:
+            continue
+        num_inputs = [k or None for k in rec_top_k]
+        rec_results = recognizers(cropped_imgs, batch_size=args.rec_batch_size, num_inputs=num_inputs)['predictions'] if has_frames else None
+        yield video_idx, is_last, gt, rec_results, det_scores_kept
+
+def iterate_queue(q):
+    while True:
+        item = q.get()
+        if item is STOP:
+            return
+        if isinstance(item, BaseException):
+            raise item      # forward errors from the upstream stages
+        yield item
+
+def run_stage(name, stage, items, out_q):
+    try:
+        start = time.perf_counter()
+        for item in stage(items):
+            stage_times[name] += time.perf_counter() - start
+            out_q.put(item)     # blocks while the next stage is behind
+            start = time.perf_counter()
+        out_q.put(STOP)
+    except BaseException as e:
+        out_q.put(e)
+
+def start_pipeline(dataset, indices):
+    queues = {name: queue.Queue(maxsize=args.queue_size) for name in ['loaded', 'detected', 'cropped', 'recognized']}
+    stages = [
+        ('load', lambda _: load_stage(dataset, indices), None, queues['loaded']),
+        ('detect', detect_stage, queues['loaded'], queues['detected']),
+        ('crop', crop_stage, queues['detected'], queues['cropped']),
+        ('recognize', recognize_stage, queues['cropped'], queues['recognized']),
+    ]
+    for name, stage, in_q, out_q in stages:
+        items = iterate_queue(in_q) if in_q is not None else None
+        threading.Thread(target=run_stage, args=(name, stage, items, out_q), name=name, daemon=True).start()
+    return queues
+
+def log_queue_sizes(queues, video_idx):
+    for name, q in queues.items():
+        queue_sizes[name].append(q.qsize())
+    logger.debug(f"Video: {video_idx}, queue depths: {dict((name, q.qsize()) for name, q in queues.items())}")
+
+def pipeline_summary():
+    depths = {name: f"mean {np.mean(sizes):.2f} max {max(sizes)}" for name, sizes in queue_sizes.items()}
+    times = {name: f"{t:.1f}s" for name, t in stage_times.items()}
+    return f"queue depths: {depths}, stage busy times: {times}"
+
+
+#%% aggregator
+def get_numbers(rec_results):
+    numbers = []
+    for name in recognizer_names:
+        rec_result = rec_results[name]
+
+        for i, pred_rec in enumerate(rec_result):
+            text = pred_rec['text']
+            rec_score = pred_rec['scores']
+            # print("det score", det_scores_kept[i], "rec score", rec_score, text)
+            if rec_score > args.rec_threshold and text.isnumeric():
+                if len(str(text)) > 2:
+                    numbers.append(int(str(text)[-2:]))
+                else:
+                    numbers.append(int(text))
+    return numbers
+
+log_file = open_results_log(log_path)
+queues = start_pipeline(test_dataset, idx_to_use)
+votes = {}      # video idx -> StreamingVote, for the videos still in progress
+num_chunks_skipped = 0
+for video_idx, is_last, gt, rec_results, det_scores_kept in iterate_queue(queues['recognized']):
+    if video_idx in finished_videos:
+        continue    # chunk was already in flight when the video got settled
+    start = time.perf_counter()
+
+    if rec_results is None: # soccer ball shortcut, so we output 1
+        final_prediction = 1
+        final_prediction_wt = 1
+        predictions = []
+        logger.info(f"Video: {video_idx}, soccer ball shortcut prediction as 1")
+    else:
+        vote = votes.setdefault(video_idx, StreamingVote(5 * len(recognizer_names), args.early_exit_z, args.max_empty_chunks))
+        vote.update(get_numbers(rec_results))
+        if not is_last:
+            if not args.early_exit or not (vote.is_settled() or vote.is_illegible()):
+                with vote_cond:
+                    voted_chunks[video_idx] += 1
+                    vote_cond.notify()      # the loader can release the next chunk of the video
+                stage_times['aggregate'] += time.perf_counter() - start
+                continue
+            num_chunks_skipped += num_video_chunks[video_idx] - vote.num_chunks
+            logger.info(f"Video: {video_idx}, early exit after {vote.num_chunks} chunks, {'settled' if vote.numbers else 'illegible'}")
+        final_prediction, final_prediction_wt, predictions = votes.pop(video_idx).result()
+
+    with vote_cond:
+        finished_videos.add(video_idx)
+        vote_cond.notify()
+    log_queue_sizes(queues, video_idx)
     correct.append(final_prediction == gt)
     weighted_correct.append(final_prediction_wt == gt)
 
     # use the weighted prediction for submission
-    output_json[str(video_idx)] = int(final_prediction_wt)
+    record = dict(video=str(video_idx), pred=int(final_prediction_wt), pred_mode=int(final_prediction), gt=gt)
+    append_result(log_file, record)
+    records[record['video']] = record
 
     print(f"Video: {video_idx}, Pred: {final_prediction, final_prediction_wt}, GT: {gt} Correct?: {final_prediction == gt, final_prediction_wt == gt}, {predictions}")
     logger.info(f"Video: {video_idx}, Pred: {final_prediction, final_prediction_wt}, GT: {gt} Correct?: {final_prediction == gt, final_prediction_wt == gt}, {predictions}")
     
     # shutil.rmtree(cropped_path)
+    stage_times['aggregate'] += time.perf_counter() - start
 
     # log the results every 50 videos
     if video_idx % 50 == 0:
         print(f"Video{video_idx} ACC: {sum(correct)}/{len(correct)}, {sum(weighted_correct)}/{len(weighted_correct)}")
         logger.info(f"Video{video_idx} ACC: {sum(correct)}/{len(correct)}, {sum(weighted_correct)}/{len(weighted_correct)}")
+        logger.info(f"Video{video_idx} {pipeline_summary()}")
 
-        with open(checkpoint_path, 'w') as f:
-            json.dump(output_json, f)
-    
+log_file.close()
+compact_results(records, checkpoint_path)
 
+if args.early_exit:
+    logger.info(f"Early exit skipped {num_chunks_skipped} chunks of {args.chunk_size} frames")
+logger.info(f"Detection ran on {frame_counts['detected']}/{frame_counts['to_detect']} frames")
+if args.keyframes or args.frame_budget:
+    logger.info(f"Keyframe selection kept {frame_counts['kept']}/{frame_counts['total']} frames, skipped {frame_counts['total'] - frame_counts['kept']}")
+logger.info(f"Pipeline {pipeline_summary()}")
 logger.info(f"Final Accuracy: {sum(correct)}/{len(correct)}")
 logger.info(f"Final Accuracy weighted: {sum(weighted_correct)}/{len(weighted_correct)}")
 
@@ -0,0 +1,52 @@
+"""
+launch run.py as several CPU worker processes, each on its own shard of the videos,
+then merge the shard outputs into a single preds.json
+
+python run_sharded.py --num_workers 4 --threads_per_worker 2 --data_path data --output_dir outputs
+any argument not listed below is passed through to every run.py worker
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+parser = argparse.ArgumentParser(description='EECS 545 SoccerNet Jersey Number Recognition, sharded over local CPU workers')
+parser.add_argument('--num_workers', default=4, type=int, help='number of run.py processes (= number of shards)')
+parser.add_argument('--threads_per_worker', default=None, type=int, help='torch/OpenMP threads per worker, defaults to splitting the cores evenly')
+parser.add_argument('--output_dir', default='./outputs', type=str, help='directory to store outputs')
+args, run_args = parser.parse_known_args()
+
+# the cpus this script may run on, which under slurm or cgroup cpusets need not be 0..n-1
+allowed_cores = sorted(os.sched_getaffinity(0))
+num_cores = len(allowed_cores)
+threads_per_worker = args.threads_per_worker or max(1, num_cores // args.num_workers)
+os.makedirs(args.output_dir, exist_ok=True)
+os.makedirs('logs', exist_ok=True)
+run_py = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'run.py')
+
+def pin_to_cores(shard_index):
+    # give every worker its own block of cores so the workers don't fight over them
+    cores = [allowed_cores[(shard_index * threads_per_worker + i) % num_cores] for i in range(threads_per_worker)]
+    return lambda: os.sched_setaffinity(0, cores)
+
+workers = []
+for shard_index in range(args.num_workers):
+    env = dict(os.environ,
+               CUDA_VISIBLE_DEVICES='',
+               OMP_NUM_THREADS=str(threads_per_worker),
+               MKL_NUM_THREADS=str(threads_per_worker),
+               OPENCV_FOR_THREADS_NUM=str(threads_per_worker))
+    cmd = [sys.executable, run_py, *run_args, '--output_dir', args.output_dir,
+           '--shard_index', str(shard_index), '--num_shards', str(args.num_workers)]
+    print(f"Shard {shard_index}: {' '.join(cmd)}")
+    workers.append(subprocess.Popen(cmd, env=env, preexec_fn=pin_to_cores(shard_index),
+                                    stdout=subprocess.DEVNULL))
+
+failed = [shard_index for shard_index, worker in enumerate(workers) if worker.wait() != 0]
+if failed:
+    # the finished shards are kept, rerunning this script only runs the missing videos
+    sys.exit(f"Shards {failed} failed, see logs/ for details")
+
+subprocess.run([sys.executable, run_py, *run_args, '--output_dir', args.output_dir,
+                '--num_shards', str(args.num_workers), '--merge_shards'], check=True)
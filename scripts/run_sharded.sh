@@ -0,0 +1,22 @@
+#!/bin/bash
+# The interpreter used to execute the script
+
+#“#SBATCH” directives that convey submission options:
+# one array task per shard, merge afterwards with:
+# python run.py --num_shards 4 --merge_shards
+
+#SBATCH --job-name=soccernet
+#SBATCH --mail-type=BEGIN,END
+#SBATCH --nodes=1
+#SBATCH --ntasks-per-node=1
+#SBATCH --time=7:59:55
+#SBATCH --account=eecs545w24_class
+#SBATCH --partition=gpu
+#SBATCH --gpus=1
+#SBATCH --mem-per-gpu=16000m 
+#SBATCH --cpus-per-gpu=3
+#SBATCH --array=0-3
+#SBATCH --output=./logs/%x-%A_%a.log
+
+# The application(s) to execute along with its input arguments and options:
+time python run.py --shard_index $SLURM_ARRAY_TASK_ID --num_shards 4